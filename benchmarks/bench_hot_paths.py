@@ -0,0 +1,215 @@
+"""
+Wall time and peak memory of the data and analytics hot paths, with regression checks.
+
+Runs each path against recorded fixture data read through the replay
+provider: constituent price-table parsing (the body of fetch_nifty_50_data)
+and heatmap figure construction over 50/500/5000 symbols, and
+get_sentiment_signal, compute_seasonality and calculate_ad_line over
+1/5/15 years of daily bars. Fixtures are synthesized once, deterministically,
+into the replay layout (see data/providers/replay.py) and reused.
+
+Results can be saved as a baseline; later runs compare against it and exit
+with status 1 if any path got slower or used more memory than the baseline
+by more than the threshold.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--symbols 50 500] [--years 1 5]
+        [--save-baseline] [--baseline benchmarks/baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.heatmap import build_heatmap_figure
+from config.settings import DATA_DIR
+from data.fetchers.constituents import estimate_market_cap, fetch_price_table
+from data.providers import MarketDataProvider, NoDataError, set_provider
+from data.providers.replay import ReplayProvider
+from utils.seasonality import compute_seasonality
+from utils.technical_indicators import calculate_ad_line, get_sentiment_signal
+
+
+SYMBOL_COUNTS = (50, 500, 5000)
+HISTORY_YEARS = (1, 5, 15)
+TRADING_DAYS = 252
+UNIVERSE_BARS = 10  # bars recorded per universe symbol (price tables use "5d")
+INDEX_SYMBOL = "^BENCH"
+SECTORS = ['Financials', 'Information Technology', 'Energy', 'Consumer Staples', 'Health Care',
+           'Industrials', 'Materials', 'Utilities', 'Real Estate', 'Communication Services',
+           'Consumer Discretionary']
+
+# Time regressions smaller than this are treated as noise
+MIN_REGRESSION_SECONDS = 0.001
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def universe_symbol(i):
+    return f'BENCH{i:05d}'
+
+
+def make_bars(bars, seed):
+    """Deterministic random-walk daily OHLCV bars ending on a fixed date."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end='2024-12-31', periods=bars, tz='America/New_York', name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.005,
+        'Low': np.minimum(open_, close) * 0.995,
+        'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, bars).astype(float),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    }, index=index)
+
+
+def write_fixtures(root, symbol_count, years):
+    """Records any fixture files missing under `root` in the replay layout."""
+    os.makedirs(root, exist_ok=True)
+    wanted = {INDEX_SYMBOL: (years * TRADING_DAYS, 0)}
+    wanted.update({universe_symbol(i): (UNIVERSE_BARS, i + 1) for i in range(symbol_count)})
+    for symbol, (bars, seed) in wanted.items():
+        path = os.path.join(root, quote(symbol, safe='') + '.parquet')
+        if os.path.exists(path) and (symbol != INDEX_SYMBOL or len(pd.read_parquet(path, columns=['Close'])) >= bars):
+            continue
+        make_bars(bars, seed).to_parquet(path)
+
+
+class RecordedBatch(MarketDataProvider):
+    """Serves one pre-built batch frame, so timings cover parsing, not file reads."""
+
+    name = "recorded"
+
+    def __init__(self, data):
+        self.data = data
+
+    def history(self, symbol, period=None, start=None, end=None):
+        raise NoDataError(f"{self.name} provider only serves batch history")
+
+    def batch_history(self, symbols, period):
+        return self.data
+
+    def fundamentals(self, symbol):
+        raise NoDataError(f"{self.name} provider only serves batch history")
+
+
+def measure(func, repeat):
+    """Best-of-`repeat` seconds per call, and peak traced memory of one call in MB."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def cross_section_cases(replay, symbol_counts):
+    """(path, size, callable) for the per-universe paths."""
+    for count in symbol_counts:
+        symbols = [universe_symbol(i) for i in range(count)]
+        batch = replay.batch_history(symbols, '5d')
+
+        def price_table(symbols=symbols, batch=batch):
+            set_provider(RecordedBatch(batch))
+            quotes, _ = fetch_price_table(symbols)
+            quotes['Market Cap'] = estimate_market_cap(quotes, pd.Series(1e9, index=quotes.index))
+            return quotes
+
+        table = price_table().reset_index()
+        table['Sector'] = [SECTORS[i % len(SECTORS)] for i in range(len(table))]
+
+        yield 'price_table', f'{count} symbols', price_table
+        yield 'heatmap_figure', f'{count} symbols', lambda table=table: build_heatmap_figure(table)
+
+
+def time_series_cases(replay, history_years):
+    """(path, size, callable) for the per-symbol history paths."""
+    for years in history_years:
+        history = replay.history(INDEX_SYMBOL, period=f'{years}y')
+        price = float(history['Close'].iloc[-1])
+        size = f'{years}Y ({len(history)} bars)'
+
+        yield 'sentiment_signal', size, lambda history=history, price=price: get_sentiment_signal(history, price)
+        yield 'seasonality', size, lambda history=history: compute_seasonality(history)
+        yield 'ad_line', size, lambda history=history: calculate_ad_line(history)
+
+
+def compare(results, baseline, threshold):
+    """Returns (case key, message) for every result worse than baseline beyond `threshold`."""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        slower = result['seconds'] - before['seconds']
+        if slower > MIN_REGRESSION_SECONDS and result['seconds'] > before['seconds'] * (1 + threshold):
+            regressions.append((key, f"time {before['seconds'] * 1e3:.2f} -> {result['seconds'] * 1e3:.2f} ms"))
+        if result['peak_mb'] > before['peak_mb'] * (1 + threshold) + 0.1:
+            regressions.append((key, f"peak {before['peak_mb']:.1f} -> {result['peak_mb']:.1f} MB"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--symbols', type=int, nargs='+', default=list(SYMBOL_COUNTS),
+                        help='universe sizes for the cross-sectional paths')
+    parser.add_argument('--years', type=int, nargs='+', default=list(HISTORY_YEARS),
+                        help='history lengths for the time-series paths')
+    parser.add_argument('--repeat', type=int, default=5, help='timing samples per case (best is kept)')
+    parser.add_argument('--fixtures', default=os.path.join(DATA_DIR, 'bench_fixtures'),
+                        help='replay recording directory for the fixture data')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline results JSON')
+    parser.add_argument('--save-baseline', action='store_true', help='write these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown / memory growth over the baseline (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    write_fixtures(args.fixtures, max(args.symbols), max(args.years))
+    replay = ReplayProvider(args.fixtures)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'Path':<18} {'Size':<18} {'Time (ms)':>10} {'Peak (MB)':>10} {'vs baseline':>12}")
+    cases = [*cross_section_cases(replay, args.symbols), *time_series_cases(replay, args.years)]
+    for path, size, func in cases:
+        seconds, peak_mb = measure(func, args.repeat)
+        key = f'{path}[{size.split(" (")[0]}]'
+        results[key] = {'seconds': seconds, 'peak_mb': peak_mb}
+        change = f"{seconds / baseline[key]['seconds'] - 1:+.0%}" if key in baseline else ''
+        print(f"{path:<18} {size:<18} {seconds * 1e3:>10.2f} {peak_mb:>10.1f} {change:>12}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for key, message in regressions:
+        print(f"REGRESSION {key}: {message}")
+    if regressions:
+        return 1
+    if baseline:
+        print(f"\nNo regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
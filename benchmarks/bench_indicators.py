@@ -0,0 +1,105 @@
+"""
+Per-symbol indicator cost: legacy `ta` path vs the single-pass bundle.
+
+The legacy path mirrors the old calculate_all_indicators, which built a
+separate `ta` indicator object per call and recomputed RSI/MACD/SMAs again
+inside get_sentiment_signal. A second table compares a per-symbol loop
+over a constituent universe with one calculate_indicators_matrix call.
+
+Usage:
+    python benchmarks/bench_indicators.py [--repeat 50] [--symbols 500]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.technical_indicators import (
+    calculate_rsi, calculate_macd, calculate_moving_averages, calculate_bollinger_bands,
+    calculate_volatility, calculate_all_indicators, calculate_indicators_matrix, score_signals,
+    classify_sentiment
+)
+
+
+HISTORY_YEARS = (1, 5, 15)
+TRADING_DAYS = 252
+
+
+def legacy_all_indicators(df):
+    """The pre-bundle calculate_all_indicators: one `ta` object per indicator, RSI/MACD/SMAs twice."""
+    current_price = df['Close'].iloc[-1]
+
+    def legacy_sentiment():
+        rsi = calculate_rsi(df)
+        macd = calculate_macd(df)
+        moving_averages = calculate_moving_averages(df)
+        price_5d_ago = df['Close'].iloc[-5] if len(df) >= 5 else None
+        score = score_signals(current_price, rsi, macd['histogram'], moving_averages, len(df), price_5d_ago)
+        return classify_sentiment(score, {'rsi': rsi, 'macd': macd, 'moving_averages': moving_averages})
+
+    return {
+        'rsi': calculate_rsi(df),
+        'macd': calculate_macd(df),
+        'moving_averages': calculate_moving_averages(df),
+        'bollinger_bands': calculate_bollinger_bands(df),
+        'volatility': calculate_volatility(df),
+        'sentiment': legacy_sentiment()
+    }
+
+
+def make_history(years, seed=7):
+    """Deterministic random-walk daily closes."""
+    rng = np.random.default_rng(seed)
+    bars = years * TRADING_DAYS
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return pd.DataFrame({'Close': closes}, index=pd.bdate_range('2000-01-03', periods=bars))
+
+
+def make_matrix(years, symbols, seed=7):
+    """Deterministic random-walk closes for a (dates x symbols) universe."""
+    rng = np.random.default_rng(seed)
+    bars = years * TRADING_DAYS
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (bars, symbols)), axis=0))
+    return pd.DataFrame(closes, index=pd.bdate_range('2000-01-03', periods=bars),
+                        columns=[f'SYM{i}' for i in range(symbols)])
+
+
+def loop_all_indicators(prices):
+    """One calculate_all_indicators call per column, as a per-symbol scan would do."""
+    return {symbol: calculate_all_indicators(prices[[symbol]].rename(columns={symbol: 'Close'}))
+            for symbol in prices.columns}
+
+
+def time_per_call(func, df, repeat):
+    """Best-of-5 mean seconds per call."""
+    return min(timeit.repeat(lambda: func(df), number=repeat, repeat=5)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50, help='calls per timing sample')
+    parser.add_argument('--symbols', type=int, default=500, help='universe size for the matrix table')
+    args = parser.parse_args()
+
+    print(f"{'History':>8} {'Bars':>6} {'Before (ms)':>12} {'After (ms)':>11} {'Speedup':>8}")
+    for years in HISTORY_YEARS:
+        df = make_history(years)
+        before = time_per_call(legacy_all_indicators, df, args.repeat)
+        after = time_per_call(calculate_all_indicators, df, args.repeat)
+        print(f"{years:>7}Y {len(df):>6} {before * 1e3:>12.3f} {after * 1e3:>11.3f} {before / after:>7.1f}x")
+
+    print(f"\n{'History':>8} {'Symbols':>8} {'Loop (ms)':>10} {'Matrix (ms)':>12} {'Speedup':>8}")
+    for years in HISTORY_YEARS:
+        prices = make_matrix(years, args.symbols)
+        before = time_per_call(loop_all_indicators, prices, 1)
+        after = time_per_call(calculate_indicators_matrix, prices, 1)
+        print(f"{years:>7}Y {args.symbols:>8} {before * 1e3:>10.1f} {after * 1e3:>12.1f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,45 +1,28 @@
+import time
+from datetime import datetime
+
 import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils.formatters import format_age
 
-def render_heatmap(data=None, currency="₹", index_name="NIFTY 50"):
+def build_heatmap_figure(df, currency="₹", index_name="NIFTY 50"):
     """
-    Renders a market heatmap using Plotly Treemap.
+    Builds the market heatmap treemap figure.
 
     Args:
-        data: DataFrame with market data
-        currency: Currency symbol (default: ₹)
-        index_name: Name of the index (default: NIFTY 50)
-    """
-    if data is None or (isinstance(data, pd.DataFrame) and data.empty):
-        st.warning(f"⚠️ No data available for {index_name} heatmap. Market may be closed or data is updating.")
-        st.info("💡 Tip: Try refreshing the page or check back when the market is open.")
-        return
-
-    # Data passed from app is already a DataFrame
-    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
-
-    # Validate required columns
-    required_cols = ['Symbol', 'Change %', 'Market Cap', 'Sector', 'Price']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-
-    if missing_cols:
-        st.error(f"❌ Heatmap data is missing required columns: {', '.join(missing_cols)}")
-        st.info("This usually happens when market data fetch fails. Please try refreshing.")
-        return
-
-    # Safety: Ensure Market Cap is positive
-    if 'Market Cap' in df.columns:
-        df = df[df['Market Cap'] > 0]
-
-    if df.empty:
-        st.warning(f"⚠️ No valid stocks with positive market cap for {index_name}")
-        return
+        df: DataFrame with Symbol, Change %, Market Cap (positive), Sector
+            and Price columns
+        currency: Currency symbol for the hover text
+        index_name: Name of the index (root of the treemap)
 
+    Returns:
+        plotly.graph_objects.Figure: Treemap sized by market cap and
+        colored by change
+    """
     # Round the Change % to 2 decimal places (force proper rounding)
-    if 'Change %' in df.columns:
-        df['Change %'] = np.round(df['Change %'].astype(float), 2)
+    df = df.assign(**{'Change %': np.round(df['Change %'].astype(float), 2)})
 
     # Premium White Theme Color Scale
     text_color = '#1a1a1a'  # Dark text for light background
@@ -97,5 +80,54 @@ def render_heatmap(data=None, currency="₹", index_name="NIFTY 50"):
             outlinewidth=0
         )
     )
-    
+
+    return fig
+
+
+def render_heatmap(data=None, currency="₹", index_name="NIFTY 50", as_of=None, stale=False):
+    """
+    Renders a market heatmap using Plotly Treemap.
+
+    Args:
+        data: DataFrame with market data
+        currency: Currency symbol (default: ₹)
+        index_name: Name of the index (default: NIFTY 50)
+        as_of: Epoch seconds the data was fetched (shown above the chart)
+        stale: True if the data is a last known good snapshot served
+            because the provider is unavailable
+    """
+    if data is None or (isinstance(data, pd.DataFrame) and data.empty):
+        st.warning(f"⚠️ No data available for {index_name} heatmap. Market may be closed or data is updating.")
+        st.info("💡 Tip: Try refreshing the page or check back when the market is open.")
+        return
+
+    # Data passed from app is already a DataFrame
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+    # Validate required columns
+    required_cols = ['Symbol', 'Change %', 'Market Cap', 'Sector', 'Price']
+    missing_cols = [col for col in required_cols if col not in df.columns]
+
+    if missing_cols:
+        st.error(f"❌ Heatmap data is missing required columns: {', '.join(missing_cols)}")
+        st.info("This usually happens when market data fetch fails. Please try refreshing.")
+        return
+
+    # Safety: Ensure Market Cap is positive
+    if 'Market Cap' in df.columns:
+        df = df[df['Market Cap'] > 0]
+
+    if df.empty:
+        st.warning(f"⚠️ No valid stocks with positive market cap for {index_name}")
+        return
+
+    fig = build_heatmap_figure(df, currency, index_name)
+
+    if as_of:
+        time_format = '%H:%M:%S' if time.time() - as_of < 86400 else '%Y-%m-%d %H:%M'
+        fetched = f"{datetime.fromtimestamp(as_of).strftime(time_format)} ({format_age(time.time() - as_of)})"
+        if stale:
+            st.caption(f"⚠️ Data provider unavailable, showing last known data from {fetched}")
+        else:
+            st.caption(f"⏱ Data as of {fetched}")
     st.plotly_chart(fig, use_container_width=True)
@@ -2,9 +2,11 @@
 Market card component for displaying individual market data.
 """
 
+import time
+
 import streamlit as st
 import plotly.graph_objects as go
-from utils.formatters import format_currency, format_percentage
+from utils.formatters import format_age, format_currency, format_percentage
 
 # Color constants
 COLOR_POSITIVE = "#00d48a"
@@ -47,6 +49,8 @@ def render_market_card(data):
               - change: Price change
               - change_pct: Percentage change
               - sparkline_data: List of historical prices (optional)
+              - as_of: Epoch seconds the quote was fetched (optional)
+              - stale: True if served from the last known good snapshot (optional)
 
     Returns:
         None: Renders directly to Streamlit
@@ -68,6 +72,15 @@ def render_market_card(data):
     rsi = data.get('rsi', None)
     volatility = data.get('volatility', None)
 
+    # Data age, so a quote served from a stale snapshot is recognisable
+    as_of = data.get('as_of')
+    age_html = ""
+    if as_of:
+        if data.get('stale'):
+            age_html = f"<span style='float: right; color: #ffa502; font-weight: 400;' title='Provider unavailable, showing last known data'>⚠️ {format_age(time.time() - as_of)}</span>"
+        else:
+            age_html = f"<span style='float: right; color: #adb5bd; font-weight: 400;' title='Data age'>⏱ {format_age(time.time() - as_of)}</span>"
+
     # Custom CSS for ultra-compact card
     card_style = f"""
     <div class="market-card" style="border-left: 3px solid {border_color};">
@@ -77,7 +90,7 @@ def render_market_card(data):
         </div>
         <h2 style="margin:0 0 2px 0; font-size: 1rem; font-weight: 700; color: #1a1a1a;">{format_currency(data['price'], currency_symbol)}</h2>
         <p style="margin:0; color: {border_color}; font-size: 0.7rem; font-weight: 600;">
-            {format_percentage(data['change_pct'])} ({data['change']:+.2f})
+            {format_percentage(data['change_pct'])} ({data['change']:+.2f}){age_html}
         </p>
     </div>
     """
@@ -60,6 +60,24 @@ ALL_MARKETS = {
     **INDICES["CRYPTO"]
 }
 
+# Trading session (utils.market_time.MarketSchedule key) for each region
+REGION_SESSIONS = {
+    "INDIA": "India (NSE)",
+    "US": "USA (NYSE)",
+    "EUROPE": "Europe (LSE)",
+    "ASIA_PACIFIC": "Japan (Tokyo)",
+    "COMMODITIES": "Gold/Commodities",
+    "FOREX": "Gold/Commodities",
+    "CRYPTO": "Crypto"
+}
+
+# Symbols that trade on a different session than the rest of their region
+SYMBOL_SESSIONS = {
+    "^HSI": "Hong Kong (HKEX)",
+    "000001.SS": "China (SSE)",
+    "^KS11": "Korea (KRX)"
+}
+
 # Colors
 COLORS = {
     "background": "#0e1117",
@@ -75,41 +93,6 @@ COLORS = {
 # Timeframes
 TIMEFRAMES = ["1D", "5D", "1M", "3M", "6M", "1Y", "5Y", "Max"]
 
-# NIFTY 50 Symbols (Yahoo Finance format)
-NIFTY_50_SYMBOLS = [
-    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
-    "BAJAJ-AUTO.NS", "BAJFINANCE.NS", "BAJAJFINSV.NS", "BPCL.NS", "BHARTIARTL.NS",
-    "BRITANNIA.NS", "CIPLA.NS", "COALINDIA.NS", "DIVISLAB.NS", "DRREDDY.NS",
-    "EICHERMOT.NS", "GRASIM.NS", "HCLTECH.NS", "HDFCBANK.NS", "HDFCLIFE.NS",
-    "HEROMOTOCO.NS", "HINDALCO.NS", "HINDUNILVR.NS", "ICICIBANK.NS", "ITC.NS",
-    "INDUSINDBK.NS", "INFY.NS", "JSWSTEEL.NS", "KOTAKBANK.NS", "LTIM.NS",
-    "LT.NS", "M&M.NS", "MARUTI.NS", "NTPC.NS", "NESTLEIND.NS",
-    "ONGC.NS", "POWERGRID.NS", "RELIANCE.NS", "SBILIFE.NS", "SBIN.NS",
-    "SUNPHARMA.NS", "TCS.NS", "TATACONSUM.NS", "TATAMOTORS.NS", "TATASTEEL.NS",
-    "TECHM.NS", "TITAN.NS", "ULTRACEMCO.NS", "UPL.NS", "WIPRO.NS"
-]
-
-# NIFTY 50 Sector Mapping (Static to avoid API calls)
-NIFTY_50_SECTORS = {
-    "ADANIENT.NS": "Metals & Mining", "ADANIPORTS.NS": "Infrastructure", "APOLLOHOSP.NS": "Healthcare",
-    "ASIANPAINT.NS": "Consumer Durables", "AXISBANK.NS": "Financial Services", "BAJAJ-AUTO.NS": "Automobile",
-    "BAJFINANCE.NS": "Financial Services", "BAJAJFINSV.NS": "Financial Services", "BPCL.NS": "Oil, Gas & Consumable Fuels",
-    "BHARTIARTL.NS": "Telecommunication", "BRITANNIA.NS": "Fast Moving Consumer Goods", "CIPLA.NS": "Healthcare",
-    "COALINDIA.NS": "Oil, Gas & Consumable Fuels", "DIVISLAB.NS": "Healthcare", "DRREDDY.NS": "Healthcare",
-    "EICHERMOT.NS": "Automobile", "GRASIM.NS": "Construction Materials", "HCLTECH.NS": "Information Technology",
-    "HDFCBANK.NS": "Financial Services", "HDFCLIFE.NS": "Financial Services", "HEROMOTOCO.NS": "Automobile",
-    "HINDALCO.NS": "Metals & Mining", "HINDUNILVR.NS": "Fast Moving Consumer Goods", "ICICIBANK.NS": "Financial Services",
-    "ITC.NS": "Fast Moving Consumer Goods", "INDUSINDBK.NS": "Financial Services", "INFY.NS": "Information Technology",
-    "JSWSTEEL.NS": "Metals & Mining", "KOTAKBANK.NS": "Financial Services", "LTIM.NS": "Information Technology",
-    "LT.NS": "Construction", "M&M.NS": "Automobile", "MARUTI.NS": "Automobile",
-    "NTPC.NS": "Power", "NESTLEIND.NS": "Fast Moving Consumer Goods", "ONGC.NS": "Oil, Gas & Consumable Fuels",
-    "POWERGRID.NS": "Power", "RELIANCE.NS": "Oil, Gas & Consumable Fuels", "SBILIFE.NS": "Financial Services",
-    "SBIN.NS": "Financial Services", "SUNPHARMA.NS": "Healthcare", "TCS.NS": "Information Technology",
-    "TATACONSUM.NS": "Fast Moving Consumer Goods", "TATAMOTORS.NS": "Automobile", "TATASTEEL.NS": "Metals & Mining",
-    "TECHM.NS": "Information Technology", "TITAN.NS": "Consumer Durables", "ULTRACEMCO.NS": "Construction Materials",
-    "UPL.NS": "Chemicals", "WIPRO.NS": "Information Technology"
-}
-
 # Themes
 THEMES = {
     "dark": {
@@ -9,11 +9,17 @@ MARKETS = {
         "flag": "🇮🇳",
         "currency": "₹",
         "currency_name": "INR",
+        "session": "India (NSE)",  # utils.market_time.MarketSchedule key
         "main_index": {
             "name": "NIFTY 50",
             "symbol": "^NSEI",
             "constituents_count": 50
         },
+        # Constituent universes for breadth and heatmap (display name -> data.universe key)
+        "universes": {
+            "NIFTY 50": "NIFTY50",
+            "NIFTY 500": "NIFTY500"
+        },
         "alternative_indices": {
             "SENSEX": "^BSESN",
             "NIFTY Bank": "^NSEBANK"
@@ -39,11 +45,15 @@ MARKETS = {
         "flag": "🇺🇸",
         "currency": "$",
         "currency_name": "USD",
+        "session": "USA (NYSE)",
         "main_index": {
             "name": "S&P 500",
             "symbol": "^GSPC",
             "constituents_count": 500
         },
+        "universes": {
+            "S&P 500": "SP500"
+        },
         "alternative_indices": {
             "NASDAQ": "^IXIC",
             "DOW": "^DJI",
@@ -13,3 +13,45 @@ FRED_API_KEY = os.getenv("FRED_API_KEY")
 
 # Caching
 CACHE_TTL = 60  # seconds
+CACHE_BACKEND = os.getenv("MARKETPULSE_CACHE_BACKEND", "sqlite")  # "memory", "sqlite" or "redis"
+CACHE_REDIS_URL = os.getenv("MARKETPULSE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = 512  # entries kept in each process's LRU
+CACHE_LOCAL_TTL = 30  # seconds a shared-cache hit is reused in-process before re-reading
+MAX_STALENESS = 15 * 60  # seconds past its TTL stale data is served while refreshing in the background
+SINGLEFLIGHT_WAIT_TIMEOUT = 60  # seconds before an in-flight fetch is presumed hung and one waiter starts a new one
+SNAPSHOT_RETRY_AFTER = 60  # seconds to serve last-known-good data before retrying a failed provider
+
+# Local Data Store
+DATA_DIR = os.getenv(
+    "MARKETPULSE_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data")
+)
+HISTORY_SYNC_INTERVAL = 600  # seconds between tail syncs for a stored symbol
+
+# Market Data Provider
+MARKET_DATA_PROVIDER = os.getenv("MARKETPULSE_PROVIDER", "yfinance")  # "yfinance" or "replay"
+REPLAY_DIR = os.getenv("MARKETPULSE_REPLAY_DIR", os.path.join(DATA_DIR, "replay"))  # recorded Parquet/JSON for "replay"
+
+# Provider Throttling
+FETCH_MAX_WORKERS = 8  # threads for per-symbol fetches
+PROVIDER_RATE_LIMIT = 5  # requests per second per provider host
+PROVIDER_MAX_CONCURRENCY = 8  # provider requests in flight at once, across all hosts
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before an endpoint's circuit opens
+BREAKER_RESET_TIMEOUT = 30  # seconds before the first probe of an open circuit (doubles per trip)
+BREAKER_MAX_RESET_TIMEOUT = 600  # upper bound on the open period
+FUNDAMENTALS_TTL = 86400  # seconds to reuse a symbol's market cap/sector
+UNIVERSE_REFRESH_INTERVAL = 7 * 86400  # seconds before re-downloading an index constituent list
+ANALYTICS_MAX_AGE = 86400  # seconds precomputed analytics stay current for symbols without session closes
+
+# Metrics
+METRICS_PORT = int(os.getenv("MARKETPULSE_METRICS_PORT", "0"))  # serve Prometheus /metrics on this port (0 disables)
+METRICS_DUMP_INTERVAL = 60  # seconds between JSON dumps to DATA_DIR/metrics.json (0 disables)
+PROFILE_RENDER = os.getenv("MARKETPULSE_PROFILE", "")  # "timing", "cprofile" or "pyinstrument" to profile page reruns ("" disables)
+PROFILE_KEEP = 50  # reruns to keep render profile reports for in DATA_DIR/profiles
+
+# Background Refresh (seconds between scheduled fetches)
+QUOTES_REFRESH_INTERVAL = 60
+CONSTITUENTS_REFRESH_INTERVAL = 300
+SECTORS_REFRESH_INTERVAL = 300
+LIVE_PANELS_REFRESH_INTERVAL = 30  # seconds between partial reruns of the quote cards, risk meter and market timings
+SETTLEMENT_DELAY = 15 * 60  # seconds after a market's close for its one settlement refresh
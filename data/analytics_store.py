@@ -0,0 +1,119 @@
+"""
+Precomputed analytics store.
+Seasonality tables and historical performance analytics only change when a
+session closes, so the precompute job (data/precompute.py) derives them once
+per close for every configured market and sector and saves them here. The
+dashboard then reads a result with one file read instead of recomputing it
+from daily bars for every user on every rerun.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import quote
+
+from config.settings import ANALYTICS_MAX_AGE, DATA_DIR, SETTLEMENT_DELAY
+from data.cache import pack_entry, unpack_entry
+from data.refresh_policy import last_close, session_for_symbol
+from utils.fileio import atomic_write
+from utils.logger import logger
+
+
+class AnalyticsStore:
+    """
+    One file per (kind, symbol, period in years) holding a precomputed result
+    and the time it was computed.
+
+    Decoded results are memoized per file modification time, so repeat
+    reads of an unchanged result don't touch the disk beyond a stat.
+    """
+
+    def __init__(self, root=None, max_age=ANALYTICS_MAX_AGE):
+        self.root = root or os.path.join(DATA_DIR, "analytics")
+        self.max_age = max_age
+        self._memo = {}  # path -> (mtime, CacheEntry)
+        self._lock = threading.Lock()
+
+    def _path(self, kind, symbol, years):
+        return os.path.join(self.root, kind, f"{quote(symbol, safe='')}-{years}y.bin")
+
+    def save(self, kind, symbol, years, value):
+        """
+        Persists a precomputed result.
+
+        Args:
+            kind: Analytics kind (e.g., "seasonality", "history")
+            symbol: Ticker symbol the result was computed for
+            years: Period in years the result covers
+            value: Result to store
+
+        Raises:
+            OSError: If the result can't be written (the previous one is kept)
+        """
+        atomic_write(self._path(kind, symbol, years), pack_entry(value, time.time()))
+
+    def load(self, kind, symbol, years):
+        """
+        Loads a precomputed result.
+
+        Returns:
+            CacheEntry: value and computation time, or None if there is none
+        """
+        path = self._path(kind, symbol, years)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+
+        with self._lock:
+            memo = self._memo.get(path)
+        if memo is not None and memo[0] == mtime:
+            return memo[1]
+
+        try:
+            with open(path, "rb") as f:
+                entry = unpack_entry(f.read())
+        except Exception as e:
+            logger.warning(f"Could not read {kind} analytics for {symbol}: {e}")
+            return None
+        with self._lock:
+            self._memo[path] = (mtime, entry)
+        return entry
+
+    def is_current(self, symbol, computed_at, now=None):
+        """
+        True if a result computed at `computed_at` includes the latest close.
+
+        Results computed at least SETTLEMENT_DELAY after the symbol's latest
+        close (when the history store has synced the settled bar) are
+        current until the session closes again; symbols without a known
+        session (or without closes) use `max_age`.
+        """
+        now = now or time.time()
+        session = session_for_symbol(symbol)
+        closed_at = last_close(session, now) if session is not None else None
+        if closed_at is None:
+            return now - computed_at < self.max_age
+        return computed_at >= closed_at + SETTLEMENT_DELAY
+
+    def read(self, kind, symbol, years):
+        """
+        Returns a current precomputed result.
+
+        Args:
+            kind: Analytics kind
+            symbol: Ticker symbol
+            years: Period in years
+
+        Returns:
+            The stored result, or None if it is missing or predates the
+            latest close (compute it live instead)
+        """
+        entry = self.load(kind, symbol, years)
+        if entry is None or not self.is_current(symbol, entry.stored_at):
+            return None
+        return entry.value
+
+
+# Default store shared by the precompute job and the dashboard
+analytics_store = AnalyticsStore()
@@ -0,0 +1,165 @@
+"""
+Asyncio fetch layer.
+Gathers quotes, histories and fundamentals for a page concurrently on one
+process-wide event loop. Provider calls block, so they run on a fixed pool of
+long-lived worker threads; the provider's shared HTTP session keeps a
+connection cache per thread, so those workers reuse keep-alive connections
+instead of reconnecting per request. `fetch_page_data()` is the sync facade
+for Streamlit scripts, which have no event loop of their own.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+from dataclasses import dataclass, field
+
+from config.settings import PROVIDER_MAX_CONCURRENCY
+from data.cache import is_empty
+from data.fetchers.market_data import fetch_market_data_batch, get_symbol_info
+from data.fetchers.multi_market_data import fetch_symbol_history
+from utils.logger import logger
+
+
+# Sized to the global provider cap: more workers would only queue on it
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=PROVIDER_MAX_CONCURRENCY, thread_name_prefix="fetch"
+)
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _event_loop():
+    # Started on first use so importing the module doesn't spawn threads
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop.set_default_executor(_executor)
+            threading.Thread(target=_loop.run_forever, name="fetch-loop", daemon=True).start()
+        return _loop
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Awaits a blocking call on the shared fetch worker pool.
+
+    Args:
+        func: Callable to run (e.g., a fetcher or provider method)
+
+    Returns:
+        The return value of `func`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def run_sync(coro, timeout=None):
+    """
+    Runs a coroutine on the shared event loop and waits for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling it (None waits forever)
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        TimeoutError: If the coroutine doesn't finish within `timeout`
+        RuntimeError: If called from the event loop itself (await instead)
+    """
+    loop = _event_loop()
+    if threading.current_thread().name == "fetch-loop":
+        coro.close()
+        raise RuntimeError("run_sync called on the fetch event loop; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"fetch did not finish within {timeout}s")
+
+
+@dataclass
+class PageData:
+    """Results of a page fetch; symbols that failed are listed in `errors`."""
+    quotes: dict = field(default_factory=dict)
+    histories: dict = field(default_factory=dict)
+    fundamentals: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)  # (kind, symbol) -> message
+
+
+async def gather_page_data(quotes=(), histories=(), fundamentals=(), period="7d", period_years=5):
+    """
+    Fetches everything a page needs concurrently.
+
+    Goes through the regular fetchers, so results land in (and are served
+    from) the shared cache and last-known-good snapshots; a page that calls
+    the same fetchers afterwards gets cache hits. Calls that raise or come
+    back empty are listed in `errors`.
+
+    Args:
+        quotes: Symbols to quote (one batch download)
+        histories: Symbols to load `period_years` of daily history for
+        fundamentals: Symbols to fetch symbol info for
+        period: History window behind the quotes
+        period_years: Years of history per symbol
+
+    Returns:
+        PageData
+    """
+    calls = {}
+    if quotes:
+        calls[("quotes", None)] = run_blocking(fetch_market_data_batch, list(quotes), period)
+    for symbol in dict.fromkeys(histories):
+        calls[("history", symbol)] = run_blocking(fetch_symbol_history, symbol, period_years)
+    for symbol in dict.fromkeys(fundamentals):
+        calls[("fundamentals", symbol)] = run_blocking(get_symbol_info, symbol)
+
+    page = PageData()
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+    for (kind, symbol), result in zip(calls, results):
+        if isinstance(result, Exception):
+            page.errors[(kind, symbol)] = str(result)
+        elif is_empty(result):
+            # The fetchers log their own failures and return an empty frame or dict instead of raising
+            page.errors[(kind, symbol)] = "no data returned"
+        elif kind == "quotes":
+            page.quotes = result
+        elif kind == "history":
+            page.histories[symbol] = result
+        else:
+            page.fundamentals[symbol] = result
+
+    if page.errors:
+        logger.warning(f"Page fetch failed for {len(page.errors)}/{len(calls)} calls")
+        for (kind, symbol), message in page.errors.items():
+            logger.warning(f"Page fetch {kind} {symbol or ''}: {message}")
+    return page
+
+
+def fetch_page_data(quotes=(), histories=(), fundamentals=(), period="7d", period_years=5, timeout=60):
+    """
+    Sync facade for gather_page_data, for use from Streamlit scripts.
+
+    Args:
+        quotes: Symbols to quote
+        histories: Symbols to load history for
+        fundamentals: Symbols to fetch symbol info for
+        period: History window behind the quotes
+        period_years: Years of history per symbol
+        timeout: Seconds to wait before giving up (the fetches keep
+            running in the background and still fill the cache)
+
+    Returns:
+        PageData: Every requested call is listed in `errors` if the fetch timed out
+    """
+    try:
+        return run_sync(gather_page_data(quotes, histories, fundamentals, period, period_years), timeout)
+    except TimeoutError as e:
+        logger.warning(f"Page fetch: {e}")
+        calls = ([("quotes", None)] if quotes else []) + \
+            [("history", symbol) for symbol in dict.fromkeys(histories)] + \
+            [("fundamentals", symbol) for symbol in dict.fromkeys(fundamentals)]
+        return PageData(errors=dict.fromkeys(calls, str(e)))
@@ -0,0 +1,612 @@
+"""
+Namespaced cache for data fetchers.
+Entries are grouped by namespace ("history", "quotes", ...) and by key within
+a namespace (usually the symbol or market id), so one view can drop exactly
+the data it wants refreshed without evicting every other user's cache the
+way st.cache_data.clear() does.
+
+Storage is pluggable (CACHE_BACKEND in config/settings.py): an in-process
+LRU, a SQLite file shared by every process on the host, or a Redis server
+shared by every replica. The shared backends sit behind a small in-process
+LRU and store DataFrames as compressed Arrow IPC.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+
+from config.settings import (
+    CACHE_BACKEND, CACHE_MAX_ENTRIES, CACHE_LOCAL_TTL, CACHE_REDIS_URL, DATA_DIR,
+    SINGLEFLIGHT_WAIT_TIMEOUT
+)
+from utils.logger import logger
+from utils.metrics import CACHE_REQUESTS, metrics
+
+
+# Payload tags for serialized values
+_ARROW = b"A"
+_PICKLE = b"P"
+_STAMPED = b"T"
+_ATTRS_KEY = b"marketpulse.attrs"
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and when it was fetched."""
+    value: Any
+    stored_at: float
+
+    @property
+    def age(self):
+        """Seconds since the value was fetched."""
+        return time.time() - self.stored_at
+
+
+def serialize(value):
+    """
+    Serializes a cached value to bytes.
+
+    DataFrames are written as zstd-compressed Arrow IPC streams (with their
+    attrs kept in the schema metadata); anything Arrow can't represent, and
+    every other type, is pickled.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        bytes: Tagged payload for deserialize()
+    """
+    if isinstance(value, pd.DataFrame):
+        try:
+            table = pa.Table.from_pandas(value, preserve_index=True)
+            if value.attrs:
+                metadata = dict(table.schema.metadata or {})
+                metadata[_ATTRS_KEY] = json.dumps(value.attrs, default=str).encode()
+                table = table.replace_schema_metadata(metadata)
+            sink = pa.BufferOutputStream()
+            options = pa.ipc.IpcWriteOptions(compression="zstd")
+            with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+            return _ARROW + sink.getvalue().to_pybytes()
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"Arrow serialization failed, pickling instead: {e}")
+    return _PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(payload):
+    """Inverse of serialize()."""
+    tag, body = payload[:1], payload[1:]
+    if tag == _ARROW:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+        frame = table.to_pandas()
+        attrs = (table.schema.metadata or {}).get(_ATTRS_KEY)
+        if attrs:
+            frame.attrs = json.loads(attrs)
+        return frame
+    return pickle.loads(body)
+
+
+def pack_entry(value, stored_at):
+    """Serializes a value together with its fetch time (see unpack_entry)."""
+    return _STAMPED + struct.pack("<d", stored_at) + serialize(value)
+
+
+def unpack_entry(payload):
+    """Returns the CacheEntry in a pack_entry() payload, or None for an unstamped payload."""
+    # Payloads without a fetch time predate stale-while-revalidate; treat as misses
+    if payload[:1] != _STAMPED:
+        return None
+    return CacheEntry(deserialize(payload[9:]), struct.unpack("<d", payload[1:9])[0])
+
+
+def _digest(args):
+    return hashlib.sha1(repr(args).encode()).hexdigest()[:16]
+
+
+class LRUBackend:
+    """
+    In-process store bounded to `max_entries`, evicting the least recently used.
+
+    Values are kept as Python objects and copied on read, matching
+    st.cache_data, so callers can modify what they get back.
+    """
+
+    shared = False
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # (namespace, key, args) -> (value, stored_at, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key, args):
+        entry_id = (namespace, key, args)
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return None
+            if entry[2] <= time.time():
+                del self._entries[entry_id]
+                return None
+            self._entries.move_to_end(entry_id)
+        return CacheEntry(copy.copy(entry[0]), entry[1])
+
+    def set(self, namespace, key, args, value, ttl, stored_at=None):
+        entry_id = (namespace, key, args)
+        now = time.time()
+        with self._lock:
+            self._entries[entry_id] = (value, stored_at or now, now + ttl)
+            self._entries.move_to_end(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace=None, key=None):
+        with self._lock:
+            doomed = [entry_id for entry_id in self._entries
+                      if (namespace is None or entry_id[0] == namespace)
+                      and (key is None or entry_id[1] == key)]
+            for entry_id in doomed:
+                del self._entries[entry_id]
+        return len(doomed)
+
+    def stats(self):
+        now = time.time()
+        counts = {}
+        with self._lock:
+            for (namespace, _, _), (_, _, expires_at) in self._entries.items():
+                if expires_at > now:
+                    counts[namespace] = counts.get(namespace, 0) + 1
+        return counts
+
+
+class SQLiteBackend:
+    """
+    On-disk store in one SQLite file, shared by every process on the host.
+
+    Runs in WAL mode so readers in other processes don't block on writers.
+    Expired rows are ignored on read and purged every few hundred writes.
+    """
+
+    shared = True
+    PURGE_EVERY = 200
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, "cache.sqlite")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, args TEXT NOT NULL,"
+            " value BLOB NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key, args))"
+        )
+
+    def get(self, namespace, key, args):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? AND args = ? AND expires_at > ?",
+                (namespace, str(key), _digest(args), time.time())
+            ).fetchone()
+        return unpack_entry(row[0]) if row else None
+
+    def set(self, namespace, key, args, value, ttl, stored_at=None):
+        payload = pack_entry(value, stored_at or time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (namespace, str(key), _digest(args), payload, time.time() + ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def invalidate(self, namespace=None, key=None):
+        query, params = "DELETE FROM entries", []
+        if namespace is not None:
+            query += " WHERE namespace = ?"
+            params.append(namespace)
+            if key is not None:
+                query += " AND key = ?"
+                params.append(str(key))
+        with self._lock:
+            return self._conn.execute(query, params).rowcount
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*) FROM entries WHERE expires_at > ? GROUP BY namespace",
+                (time.time(),)
+            ).fetchall()
+        return dict(rows)
+
+
+def _glob_escape(text):
+    return "".join("\\" + char if char in "*?[]\\" else char for char in text)
+
+
+class RedisBackend:
+    """
+    Store on a Redis server (or anything speaking its protocol), shared by every replica.
+
+    Entries are plain keys "<prefix><namespace>|<key>|<args digest>" with a
+    server-side expiry, so invalidation is a SCAN over a key pattern.
+    """
+
+    shared = True
+
+    def __init__(self, client, prefix="marketpulse:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Connects with redis-py (optional dependency: pip install redis)."""
+        import redis
+        client = redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+        client.ping()
+        return cls(client, **kwargs)
+
+    def _key(self, namespace, key, args):
+        return f"{self.prefix}{namespace}|{key}|{_digest(args)}"
+
+    def get(self, namespace, key, args):
+        payload = self.client.get(self._key(namespace, key, args))
+        return unpack_entry(payload) if payload is not None else None
+
+    def set(self, namespace, key, args, value, ttl, stored_at=None):
+        self.client.set(self._key(namespace, key, args), pack_entry(value, stored_at or time.time()),
+                        px=max(1, int(ttl * 1000)))
+
+    def invalidate(self, namespace=None, key=None):
+        pattern = _glob_escape(self.prefix)
+        if namespace is not None:
+            pattern += _glob_escape(namespace) + "|"
+            if key is not None:
+                pattern += _glob_escape(str(key)) + "|"
+        doomed = list(self.client.scan_iter(match=pattern + "*"))
+        if doomed:
+            self.client.delete(*doomed)
+        return len(doomed)
+
+    def stats(self):
+        counts = {}
+        for name in self.client.scan_iter(match=_glob_escape(self.prefix) + "*"):
+            name = name.decode() if isinstance(name, bytes) else name
+            namespace = name[len(self.prefix):].split("|", 1)[0]
+            counts[namespace] = counts.get(namespace, 0) + 1
+        return counts
+
+
+class TieredBackend:
+    """
+    Shared backend fronted by an in-process LRU.
+
+    Hits in the shared store are copied into the LRU for at most
+    `local_ttl` seconds, which bounds how long another process's
+    invalidation can take to reach this one.
+    """
+
+    shared = True
+
+    def __init__(self, local, remote, local_ttl=CACHE_LOCAL_TTL):
+        self.local = local
+        self.remote = remote
+        self.local_ttl = local_ttl
+
+    def get(self, namespace, key, args):
+        entry = self.local.get(namespace, key, args)
+        if entry is not None:
+            return entry
+        try:
+            entry = self.remote.get(namespace, key, args)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {namespace}/{key}: {e}")
+            return None
+        if entry is not None:
+            self.local.set(namespace, key, args, entry.value, self.local_ttl, entry.stored_at)
+        return entry
+
+    def set(self, namespace, key, args, value, ttl, stored_at=None):
+        self.local.set(namespace, key, args, value, min(ttl, self.local_ttl), stored_at)
+        try:
+            self.remote.set(namespace, key, args, value, ttl, stored_at)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {namespace}/{key}: {e}")
+
+    def invalidate(self, namespace=None, key=None):
+        dropped = self.local.invalidate(namespace, key)
+        try:
+            dropped = max(dropped, self.remote.invalidate(namespace, key))
+        except Exception as e:
+            logger.warning(f"Shared cache invalidation failed for {namespace}/{key}: {e}")
+        return dropped
+
+    def stats(self):
+        try:
+            return self.remote.stats()
+        except Exception:
+            return self.local.stats()
+
+
+def create_backend(name=CACHE_BACKEND):
+    """
+    Builds the configured cache backend.
+
+    Args:
+        name: "memory", "sqlite" or "redis"; an unavailable Redis falls back
+            to SQLite and an unusable SQLite file to memory
+
+    Returns:
+        Backend for NamespacedCache
+    """
+    if name == "redis":
+        try:
+            return TieredBackend(LRUBackend(), RedisBackend.from_url(CACHE_REDIS_URL))
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable ({e}), using SQLite")
+            name = "sqlite"
+    if name == "sqlite":
+        try:
+            return TieredBackend(LRUBackend(), SQLiteBackend())
+        except Exception as e:
+            logger.warning(f"SQLite cache unavailable ({e}), using memory")
+    return LRUBackend()
+
+
+class NamespacedCache:
+    """
+    Thread-safe TTL cache keyed by (namespace, key, call arguments).
+
+    Shared by every session in the Streamlit process and, with a shared
+    backend, by every process using the same SQLite file or Redis server.
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        # Created on first use so importing a fetcher doesn't open files or sockets
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = create_backend()
+        return self._backend
+
+    def get(self, namespace, key, args):
+        """
+        Returns the live CacheEntry for a call, or None.
+
+        Args:
+            namespace: Cache namespace (e.g., "history")
+            key: Key within the namespace (e.g., "^NSEI")
+            args: Hashable call arguments distinguishing entries under one key
+        """
+        return self.backend.get(namespace, key, args)
+
+    def set(self, namespace, key, args, value, ttl):
+        """Stores a value, fetched now, for `ttl` seconds."""
+        self.backend.set(namespace, key, args, value, ttl)
+
+    def invalidate(self, namespace=None, key=None):
+        """
+        Drops cached entries.
+
+        Args:
+            namespace: Namespace to drop (None for every namespace)
+            key: Key within the namespace to drop (None for the whole namespace)
+
+        Returns:
+            int: Number of entries dropped
+        """
+        dropped = self.backend.invalidate(namespace, key)
+        logger.debug(f"Invalidated {dropped} cache entries ({namespace or '*'}/{key or '*'})")
+        return dropped
+
+    def stats(self):
+        """Returns {namespace: number of live entries}."""
+        return self.backend.stats()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller runs the function; callers arriving while it is in
+    flight wait for it and share its result (or exception) instead of
+    starting their own download. If the call is still running after
+    `wait_timeout` seconds, the flight is abandoned and the first waiter to
+    notice runs the function as the new leader, with the rest waiting on it,
+    so a hung call is retried once per timeout rather than by every waiter.
+    """
+
+    def __init__(self, wait_timeout=SINGLEFLIGHT_WAIT_TIMEOUT):
+        self.wait_timeout = wait_timeout
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Runs `func(*args, **kwargs)` unless a call with the same key is in flight.
+
+        Args:
+            key: Hashable identity of the call
+            func: Callable to run
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller's
+            result was reused
+        """
+        joined = False
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                elif not joined:
+                    joined = True
+                    self.coalesced += 1
+            if leader:
+                break
+
+            if flight.done.wait(self.wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value, True
+
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    logger.warning(f"In-flight call {key[:2]} still running after {self.wait_timeout}s, starting a new one")
+                    del self._flights[key]
+
+        try:
+            flight.value = func(*args, **kwargs)
+            return flight.value, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # An abandoned flight's key may belong to a newer flight by now
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def start(self, key, func, *args, **kwargs):
+        """
+        Runs `func` through do() on a background thread, unless a call with
+        the same key is already in flight.
+
+        Returns:
+            bool: True if a background call was started
+        """
+        with self._lock:
+            if key in self._flights:
+                return False
+        _background.submit(self._run_quietly, key, func, *args, **kwargs)
+        return True
+
+    def _run_quietly(self, key, func, *args, **kwargs):
+        try:
+            self.do(key, func, *args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key[:2]} failed: {e}")
+
+
+# Threads for stale-while-revalidate refreshes
+_background = ThreadPoolExecutor(max_workers=4, thread_name_prefix="revalidate")
+
+# Default cache shared by the fetchers
+data_cache = NamespacedCache()
+
+# In-flight cache misses, so concurrent sessions share one fetch per entry
+flights = SingleFlight()
+
+
+def _first_argument(*args, **kwargs):
+    return args[0] if args else None
+
+
+def is_empty(value):
+    """True for None or an empty DataFrame, Series, dict or list (what fetchers return on failure)."""
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series, dict, list)):
+        return len(value) == 0
+    return False
+
+
+def _tag_age(entry):
+    # DataFrames carry their fetch time so views can show how old they are
+    if isinstance(entry.value, pd.DataFrame):
+        entry.value.attrs["as_of"] = entry.stored_at
+    return entry.value
+
+
+def cached(namespace, ttl, key=_first_argument, max_stale=0):
+    """
+    Caches a function's results in `data_cache` under a namespace.
+
+    Concurrent misses for the same entry are coalesced: one caller runs the
+    function and the rest wait for its result. With `max_stale`, an entry
+    older than `ttl` is still returned immediately while a background call
+    refreshes it (stale-while-revalidate); only entries older than
+    ttl + max_stale make the caller wait. Empty results (see is_empty) are
+    returned but not stored, since the fetchers return them on failure; a
+    stale entry then stays in place. Returned DataFrames carry their fetch
+    time (epoch seconds) in attrs["as_of"].
+
+    Args:
+        namespace: Cache namespace for the function's results
+        ttl: Seconds an entry is fresh
+        key: Callable mapping the call arguments to the invalidation key
+            (default: the first positional argument, e.g. the symbol)
+        max_stale: Seconds past `ttl` a stale entry may still be served
+
+    Returns:
+        Decorator; the wrapped function gains an `invalidate(key=None)` helper
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            entry_key = key(*args, **kwargs)
+            call_args = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            flight_key = (namespace, entry_key, call_args)
+
+            def load():
+                # A flight that finished just before this one started may have refreshed the entry
+                entry = data_cache.get(namespace, entry_key, call_args)
+                if entry is not None and entry.age < ttl:
+                    return entry
+                value = func(*args, **kwargs)
+                if not is_empty(value):
+                    data_cache.set(namespace, entry_key, call_args, value, ttl + max_stale)
+                return CacheEntry(value, time.time())
+
+            entry = data_cache.get(namespace, entry_key, call_args)
+            if entry is not None:
+                if entry.age >= ttl:
+                    metrics.inc(CACHE_REQUESTS, namespace=namespace, result="stale")
+                    flights.start(flight_key, load)
+                else:
+                    metrics.inc(CACHE_REQUESTS, namespace=namespace, result="hit")
+                return _tag_age(entry)
+
+            metrics.inc(CACHE_REQUESTS, namespace=namespace, result="miss")
+            entry, _ = flights.do(flight_key, load)
+            return _tag_age(CacheEntry(copy.copy(entry.value), entry.stored_at))
+
+        wrapper.invalidate = lambda entry_key=None: data_cache.invalidate(namespace, entry_key)
+        return wrapper
+    return decorator
+
+
+def invalidate(namespace=None, key=None):
+    """Drops entries from the default cache (see NamespacedCache.invalidate)."""
+    return data_cache.invalidate(namespace, key)
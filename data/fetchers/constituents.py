@@ -0,0 +1,178 @@
+"""
+Index constituent fetcher.
+Prices for a whole universe come from one multi-ticker download and market
+caps are computed as price x shares outstanding from the daily fundamentals
+snapshot, so no per-symbol requests are made while rendering.
+"""
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+from data.fundamentals import FetchFailure, fundamentals_store
+from data.providers import get_provider
+from data.snapshots import last_known_good
+from data.universe import load_universe
+from utils.logger import logger
+from utils.metrics import timed
+
+
+CONSTITUENT_COLUMNS = ['Symbol', 'Price', 'Change', 'Change %', 'Volume', 'Market Cap', 'Sector', 'Industry']
+
+
+def _field_matrix(data, field, symbols):
+    """(dates x symbols) matrix of one OHLCV field from a group_by='ticker' download."""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=symbols, dtype=float)
+    if isinstance(data.columns, pd.MultiIndex):
+        if field not in data.columns.get_level_values(1):
+            return pd.DataFrame(index=data.index, columns=symbols, dtype=float)
+        matrix = data.xs(field, axis=1, level=1)
+    else:
+        matrix = data[[field]].set_axis(symbols[:1], axis=1) if field in data.columns else pd.DataFrame()
+    return matrix.reindex(columns=symbols).astype(float)
+
+
+def download_batch(symbols, period):
+    """
+    Multi-ticker download grouped by ticker from the configured market data provider.
+
+    Args:
+        symbols: List of ticker symbols
+        period: History window (e.g., "5d")
+
+    Returns:
+        pd.DataFrame: (ticker, field) column MultiIndex
+
+    Raises:
+        Exception: If the download fails, returns nothing or the circuit is open
+    """
+    return get_provider().batch_history(symbols, period)
+
+
+def estimate_market_cap(quotes, shares):
+    """
+    Market cap in crores as price x shares outstanding.
+
+    Until the first fundamentals snapshot exists (no shares known for any
+    symbol), traded value (price x volume) stands in so the heatmap still
+    has relative weights; symbols missing from an existing snapshot get 0
+    and are left out of the heatmap rather than mixing the two measures.
+
+    Args:
+        quotes: DataFrame indexed by Symbol with Price and Volume
+        shares: Series of shares outstanding aligned to quotes
+
+    Returns:
+        pd.Series: Market cap per symbol
+    """
+    if shares.notna().any():
+        return (quotes['Price'] * shares / 1e7).fillna(0)
+    logger.info("No shares outstanding available yet, sizing by traded value")
+    return (quotes['Price'] * quotes['Volume']).clip(lower=1.0) / 1e7
+
+
+@timed()
+def fetch_price_table(symbols, period="5d"):
+    """
+    Fetches last price, change and volume for many symbols with one download.
+
+    Batch downloads share one date index across symbols, so each column's
+    last two valid closes are found by packing its non-NaN values to the
+    bottom of the matrix rather than looping per symbol.
+
+    Args:
+        symbols: List of ticker symbols
+        period: History window to download (must cover two sessions)
+
+    Returns:
+        tuple: (DataFrame indexed by Symbol with Price, Change, Change %, Volume,
+        [FetchFailure, ...] for symbols without bars)
+    """
+    symbols = list(symbols)
+    try:
+        data = download_batch(symbols, period)
+    except Exception as e:
+        logger.error(f"Constituent price download failed: {e}")
+        data = pd.DataFrame()
+
+    closes = _field_matrix(data, 'Close', symbols).to_numpy()
+    volumes = _field_matrix(data, 'Volume', symbols).to_numpy()
+    if closes.size == 0:
+        closes = np.full((1, len(symbols)), np.nan)
+        volumes = closes.copy()
+
+    valid = ~np.isnan(closes)
+    order = np.argsort(valid, axis=0, kind='stable')
+    packed = np.take_along_axis(closes, order, axis=0)
+    packed_volume = np.take_along_axis(volumes, order, axis=0)
+    counts = valid.sum(axis=0)
+
+    price = packed[-1]
+    prev_close = np.where(counts > 1, packed[-2] if len(packed) > 1 else price, price)
+    change = price - prev_close
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change_pct = np.where(prev_close > 0, change / prev_close * 100, 0.0)
+
+    table = pd.DataFrame({
+        'Price': price,
+        'Change': change,
+        'Change %': change_pct,
+        'Volume': np.nan_to_num(packed_volume[-1])
+    }, index=pd.Index(symbols, name='Symbol'))
+
+    missing = table.index[counts == 0]
+    failures = [FetchFailure(symbol, 'price', 'no bars in batch download') for symbol in missing]
+    return table.drop(index=missing), failures
+
+
+@timed()
+@last_known_good("constituents")
+def fetch_universe_quotes(universe_id, limit=None):
+    """
+    Fetches price, change, volume, market cap and sector for a universe's constituents.
+
+    Args:
+        universe_id: Universe key from data.universe.UNIVERSES (e.g., "SP500")
+        limit: Keep only the largest N constituents by market cap (None for all)
+
+    Returns:
+        pd.DataFrame: Columns CONSTITUENT_COLUMNS with Market Cap in crores
+        (see estimate_market_cap). Symbols without prices or
+        shares are listed in df.attrs['failures'] as dicts with symbol, stage
+        and error. If no prices could be fetched, the last good table is
+        returned with df.attrs['stale'] set.
+    """
+    universe = load_universe(universe_id).set_index('Symbol')
+    if universe.empty:
+        return pd.DataFrame(columns=CONSTITUENT_COLUMNS)
+
+    symbols = list(universe.index)
+    quotes, failures = fetch_price_table(symbols)
+    fundamentals = fundamentals_store.get_snapshot(universe_id, symbols).reindex(quotes.index)
+
+    def first_label(column, default):
+        # Listed value first, snapshot value where the list has none
+        listed = universe[column].reindex(quotes.index).astype(str)
+        snapshot = fundamentals[column].fillna('').astype(str)
+        return listed.where(listed.str.len() > 0, snapshot).replace('', default)
+
+    quotes['Market Cap'] = estimate_market_cap(quotes, fundamentals['Shares Outstanding'])
+    quotes['Sector'] = first_label('Sector', 'Unknown')
+    quotes['Industry'] = first_label('Industry', '')
+
+    no_shares = quotes.index[fundamentals['Shares Outstanding'].isna()]
+    failures += [FetchFailure(symbol, 'fundamentals', 'no shares outstanding in snapshot') for symbol in no_shares]
+
+    df = quotes.reset_index()[CONSTITUENT_COLUMNS]
+    if limit:
+        df = df.nlargest(limit, 'Market Cap').reset_index(drop=True)
+    df.attrs['failures'] = [asdict(failure) for failure in failures]
+
+    if failures:
+        stages = pd.Series([failure.stage for failure in failures]).value_counts().to_dict()
+        logger.warning(f"{universe_id}: {len(failures)}/{len(symbols)} constituents incomplete {stages}")
+    logger.info(f"Fetched {len(df)}/{len(symbols)} {universe_id} constituents")
+
+    return df
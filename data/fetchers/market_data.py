@@ -1,20 +1,106 @@
-import yfinance as yf
 import pandas as pd
-import streamlit as st
 from datetime import datetime
-import time
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from utils.logger import logger
-from utils.technical_indicators import get_sentiment_signal, calculate_rsi, calculate_volatility
+from config.settings import MAX_STALENESS
+from data.cache import cached
+from data.snapshots import last_known_good
+from data.fetchers.constituents import download_batch, fetch_universe_quotes
+from data.providers import get_provider
+from utils.streaming_indicators import IndicatorEngine
+from utils.metrics import timed
 
-@st.cache_data(ttl=60, show_spinner=False)
+# Rolling indicator state per symbol; repeat fetches only apply new/revised bars
+indicator_engine = IndicatorEngine()
+
+
+def _extract_symbol_frame(data, symbol, symbols):
+    """
+    Extracts a single symbol's OHLCV frame from a batch download.
+
+    Args:
+        data: DataFrame returned by download_batch (grouped by ticker)
+        symbol: Ticker symbol to extract
+        symbols: Full list of symbols passed to the download
+
+    Returns:
+        pd.DataFrame: OHLCV rows for the symbol (empty if unavailable)
+    """
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        frame = data[symbol]
+    elif len(symbols) == 1 and symbols[0] == symbol:
+        frame = data
+    else:
+        return pd.DataFrame()
+
+    if 'Close' not in frame.columns:
+        return pd.DataFrame()
+
+    # Batch downloads share one date index across symbols (crypto trades on
+    # weekends, equities don't), so drop the rows this symbol has no bar for.
+    return frame.dropna(subset=['Close'])
+
+
+def _build_market_snapshot(symbol, history, name=None):
+    """
+    Builds the market card payload for a symbol from its recent history.
+
+    Args:
+        symbol: Ticker symbol
+        history: DataFrame with OHLCV data (oldest first)
+        name: Display name (defaults to the symbol)
+
+    Returns:
+        dict: Market data including price, change, sparkline and sentiment
+        None: If the history has no usable close prices
+    """
+    if history.empty or 'Close' not in history.columns:
+        logger.error(f"Invalid data structure for {symbol}")
+        return None
+
+    current_price = float(history['Close'].iloc[-1])
+    previous_close = float(history['Close'].iloc[-2]) if len(history) > 1 else current_price
+    change = current_price - previous_close
+    change_pct = (change / previous_close) * 100 if previous_close != 0 else 0
+
+    # Technical indicators and sentiment, updated incrementally per new bar
+    indicators = indicator_engine.sync(symbol, history)
+    sentiment_data = indicators.sentiment(current_price)
+    rsi = indicators.rsi()
+    volatility = indicators.volatility()
+
+    logger.debug(f"Built market snapshot for {symbol}: ${current_price:.2f}, Sentiment: {sentiment_data['sentiment']}")
+
+    return {
+        "symbol": symbol,
+        "name": name or symbol,
+        "price": current_price,
+        "change": change,
+        "change_pct": change_pct,
+        "sparkline_data": history['Close'].tolist(),
+        "history": history,
+        "sentiment": sentiment_data['sentiment'],
+        "sentiment_arrow": sentiment_data['arrow'],
+        "sentiment_score": sentiment_data['score'],
+        "rsi": rsi,
+        "volatility": volatility
+    }
+
+@timed()
+@cached("quotes", ttl=60, max_stale=MAX_STALENESS)
+@last_known_good("quote", key=lambda symbol, period="7d": symbol)
 def fetch_market_data(symbol: str, period: str = "7d"):
     """
-    Fetches market data for a given symbol using yfinance.
+    Fetches market data for a given symbol from the market data provider.
 
     Args:
         symbol: Ticker symbol (e.g., "^NSEI", "AAPL")
@@ -26,8 +112,7 @@ def fetch_market_data(symbol: str, period: str = "7d"):
     """
     try:
         logger.info(f"Fetching market data for {symbol}")
-        ticker = yf.Ticker(symbol)
-        history = ticker.history(period=period)
+        history = get_provider().history(symbol, period=period)
 
         if history.empty:
             logger.warning(f"No historical data available for {symbol}")
@@ -38,45 +123,70 @@ def fetch_market_data(symbol: str, period: str = "7d"):
             logger.error(f"Invalid data structure for {symbol}")
             return None
 
-        current_price = float(history['Close'].iloc[-1])
-        previous_close = float(history['Close'].iloc[-2]) if len(history) > 1 else current_price
-        change = current_price - previous_close
-        change_pct = (change / previous_close) * 100 if previous_close != 0 else 0
+        # Name from the (day-long cached) symbol info, falling back to the symbol
+        name = get_symbol_info(symbol).get('shortName', symbol)
 
-        # Get symbol info with fallback
-        try:
-            info = ticker.info
-            name = info.get('shortName', symbol)
-        except Exception as e:
-            logger.warning(f"Could not fetch info for {symbol}: {e}")
-            name = symbol
-
-        # Calculate technical indicators and sentiment
-        sentiment_data = get_sentiment_signal(history, current_price)
-        rsi = calculate_rsi(history)
-        volatility = calculate_volatility(history)
-
-        logger.debug(f"Successfully fetched data for {symbol}: ${current_price:.2f}, Sentiment: {sentiment_data['sentiment']}")
-
-        return {
-            "symbol": symbol,
-            "name": name,
-            "price": current_price,
-            "change": change,
-            "change_pct": change_pct,
-            "sparkline_data": history['Close'].tolist(),
-            "history": history,
-            "sentiment": sentiment_data['sentiment'],
-            "sentiment_arrow": sentiment_data['arrow'],
-            "sentiment_score": sentiment_data['score'],
-            "rsi": rsi,
-            "volatility": volatility
-        }
+        return _build_market_snapshot(symbol, history, name)
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {str(e)}", exc_info=True)
         return None
 
-@st.cache_data(ttl=300)
+
+@timed()
+@last_known_good("quote", per_symbol=True)
+def fetch_market_data_batch(symbols, period: str = "7d"):
+    """
+    Fetches market data for many symbols with a single multi-ticker download.
+
+    Produces the same per-symbol payload as fetch_market_data, but skips the
+    per-symbol ticker.info lookup, so the name defaults to the symbol and
+    callers are expected to supply their own display names.
+
+    Args:
+        symbols: Iterable of ticker symbols (e.g., ["^NSEI", "^GSPC"])
+        period: Time period for historical data (default: "7d")
+
+    Returns:
+        dict: Mapping of symbol -> market data dict. Symbols that failed
+              to download are served from their last known good snapshot
+              (marked "stale") or omitted if they have none.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    try:
+        logger.info(f"Batch fetching market data for {len(symbols)} symbols")
+        data = download_batch(symbols, period)
+    except Exception as e:
+        logger.error(f"Batch download failed: {str(e)}")
+        return {}
+
+    results = {}
+    failed_symbols = []
+
+    for symbol in symbols:
+        try:
+            history = _extract_symbol_frame(data, symbol, symbols)
+            if history.empty:
+                failed_symbols.append(symbol)
+                continue
+
+            snapshot = _build_market_snapshot(symbol, history)
+            if snapshot:
+                results[symbol] = snapshot
+            else:
+                failed_symbols.append(symbol)
+        except Exception as e:
+            logger.warning(f"Error processing {symbol} from batch download: {e}")
+            failed_symbols.append(symbol)
+
+    if failed_symbols:
+        logger.warning(f"No batch data for {len(failed_symbols)} symbols: {', '.join(failed_symbols)}")
+
+    return results
+
+@cached("market_status", ttl=300)
 def get_market_status():
     """
     Mock function to return market status. 
@@ -88,7 +198,9 @@ def get_market_status():
         "ASIA": "Closed"
     }
 
-@st.cache_data(ttl=60*60*24)  # Cache heavy info for 24 hours
+@timed()
+@cached("symbol_info", ttl=60*60*24, max_stale=MAX_STALENESS)  # Cache heavy info for 24 hours
+@last_known_good("symbol_info")
 def get_symbol_info(symbol):
     """
     Fetches detailed information for a symbol.
@@ -101,165 +213,31 @@ def get_symbol_info(symbol):
         Empty dict if fetch fails
     """
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        return info if info else {}
+        return get_provider().fundamentals(symbol)
     except Exception as e:
         logger.warning(f"Could not fetch info for {symbol}: {str(e)}")
         return {}
 
-@st.cache_data(ttl=600, show_spinner=False)
+@timed()
 def fetch_nifty_50_data():
     """
     Fetches data for all NIFTY 50 stocks.
 
-    Uses batch download for price/change (fast).
-    Uses cached individual info for Market Cap (slow first run, fast subsequent).
+    Uses one batch download for price/change and the daily shares-outstanding
+    snapshot for Market Cap (price x shares). A stale snapshot is refreshed
+    in the background, so this never waits on per-ticker requests.
 
     Returns:
         pd.DataFrame: DataFrame with columns: Symbol, Price, Change, Change %, Market Cap, Sector, Volume
         Empty DataFrame if fetch fails
     """
-    from config.constants import NIFTY_50_SYMBOLS, NIFTY_50_SECTORS
-
     logger.info("Fetching NIFTY 50 data...")
 
     try:
-        # 1. Batch download for Price/Change with retry logic
-        max_retries = 3
-        data = None
-
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Attempt {attempt + 1}/{max_retries} to fetch NIFTY 50 data...")
-                data = yf.download(
-                    NIFTY_50_SYMBOLS,
-                    period="2d",
-                    group_by='ticker',
-                    progress=False,
-                    threads=True,
-                    timeout=30  # Add timeout
-                )
-
-                if not data.empty:
-                    break  # Success, exit retry loop
-
-                logger.warning(f"Attempt {attempt + 1} returned empty data")
-                if attempt < max_retries - 1:
-                    time.sleep(2)  # Wait before retry
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                else:
-                    raise
-
-        if data is None or data.empty:
-            logger.error("No data returned from yfinance batch download after all retries")
-            return pd.DataFrame()
-
-        results = []
-        failed_symbols = []
-
-        is_multi_index = isinstance(data.columns, pd.MultiIndex)
-
-        for symbol in NIFTY_50_SYMBOLS:
-            try:
-                # Handle Data Structure
-                if is_multi_index:
-                    if symbol not in data.columns.levels[0]:
-                        # Check if it was downloaded?
-                         failed_symbols.append(symbol)
-                         continue
-                    df_price = data[symbol]
-                else:
-                     # Single symbol case (unlikely for NIFTY 50 list but possible if list has 1 item)
-                     if len(NIFTY_50_SYMBOLS) == 1 and NIFTY_50_SYMBOLS[0] == symbol:
-                         df_price = data
-                     else:
-                        continue # Should not happen
-
-                if df_price.empty or 'Close' not in df_price.columns:
-                    failed_symbols.append(symbol)
-                    continue
-
-                closes = df_price['Close'].dropna()
-                if closes.empty:
-                    failed_symbols.append(symbol)
-                    continue
-
-                current_close = float(closes.iloc[-1])
-                prev_close = float(closes.iloc[-2]) if len(closes) > 1 else current_close
-                change = current_close - prev_close
-                pct_change = (change / prev_close) * 100 if prev_close != 0 else 0
-                
-                volume = float(df_price['Volume'].iloc[-1]) if 'Volume' in df_price.columns and not df_price['Volume'].dropna().empty else 0
-
-                # 2. Market Cap Optimization
-                # Use fast_info if possible, or fallback to approximation
-                # We avoid calling .info here as it's a separate request per ticker
-                
-                # Approximate market cap for speed
-                # Or use a separate async fetch? No, streamit is synchronous.
-                # Let's use the fallback approximation primarily for Heatmap sizing, 
-                # or try to get shares outstanding from a static source if needed.
-                # For now, Price * Volume * Factor is not Market Cap.
-                # However, calling .info 50 times causes timeout.
-                # Let's try to access fast_info but inside a new Ticker object? 
-                # ticker = yf.Ticker(symbol)
-                # mkt_cap = ticker.fast_info['market_cap'] 
-                # fast_info is lazy loaded but should be faster than .info (scraping).
-                
-                # Market Cap Fallback
-                market_cap = 0
-                try:
-                    # Using fast_info is much faster than .info
-                    # But still 50 HTTP requests if not cached by yfinance internals
-                    # We will rely on approximation for now to guarantee speed
-                    # Or we can just calculate Price * Volume as 'Value Traded' for the heatmap size?
-                    # The heatmap usually expects Market Cap. 
-                    # Let's stick to approximation if we can't afford the calls.
-                    # BUT, the user wants "Market Breadth" to work.
-                    
-                    # Let's attempt fast_info ONLY if we really need it, 
-                    # but creating Ticker object is cheap.
-                    # ticker_obj = yf.Ticker(symbol)
-                    # market_cap = ticker_obj.fast_info.get('market_cap', 0)
-                    pass
-                except:
-                    pass
-                
-                if market_cap == 0:
-                     # Fallback to Price * Volume (Traded Value) as proxy for weight
-                     market_cap = max((current_close * volume), 1.0)
-
-                # Sector from static map
-                sector = NIFTY_50_SECTORS.get(symbol, 'Unknown')
-
-                results.append({
-                    "Symbol": symbol,
-                    "Price": current_close,
-                    "Change": change,
-                    "Change %": pct_change,
-                    "Market Cap": market_cap,
-                    "Sector": sector,
-                    "Volume": volume
-                })
-
-            except Exception as e:
-                # logger.error(f"Error processing {symbol}: {str(e)}")
-                failed_symbols.append(symbol)
-                continue
-
-        if failed_symbols:
-            logger.warning(f"Failed to fetch data for {len(failed_symbols)} symbols")
-
-        logger.info(f"Successfully fetched data for {len(results)}/{len(NIFTY_50_SYMBOLS)} NIFTY 50 stocks")
-
-        return pd.DataFrame(results)
+        df = fetch_universe_quotes("NIFTY50")
+        logger.info(f"Successfully fetched data for {len(df)} NIFTY 50 stocks")
+        return df
 
     except Exception as e:
         logger.error(f"Critical error fetching NIFTY data: {str(e)}", exc_info=True)
-        # st.error(f"Error fetching NIFTY data. Please try again later.")
         return pd.DataFrame()
-
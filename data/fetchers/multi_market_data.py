@@ -3,113 +3,77 @@ Multi-market data fetchers for India, USA, and other markets.
 Provides unified interface for fetching data across different markets.
 """
 
-import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
 from config.markets import get_market_config
+from config.settings import MAX_STALENESS
+from data.cache import cached
+from data.snapshots import last_known_good
+from data.history_store import load_history
+from data.fetchers.constituents import download_batch, fetch_universe_quotes
+from utils.logger import logger
+from utils.metrics import timed
 
 
-def fetch_index_constituents(market_id, limit=None):
+@timed()
+def fetch_index_constituents(market_id, limit=None, universe_id=None):
     """
     Fetch constituents data for a market's main index.
 
     Args:
         market_id: Market identifier (e.g., "INDIA", "USA")
         limit: Optional limit on number of constituents to return
+        universe_id: Constituent universe (defaults to the market's first one)
 
     Returns:
         pd.DataFrame: DataFrame with columns [Symbol, Price, Change %, Volume, Market Cap, Sector]
     """
     market_config = get_market_config(market_id)
+    universes = list(market_config.get('universes', {}).values())
+    universe_id = universe_id or (universes[0] if universes else None)
 
-    if market_id == "INDIA":
+    if universe_id == "NIFTY50":
         from data.fetchers.market_data import fetch_nifty_50_data
         return fetch_nifty_50_data()
 
-    elif market_id == "USA":
+    elif universe_id == "SP500":
         return fetch_sp500_data(limit=limit)
 
+    elif universe_id:
+        return fetch_universe_quotes(universe_id, limit=limit)
+
     else:
         # Default to empty DataFrame
         return pd.DataFrame()
 
 
-def fetch_sp500_data(limit=100):
+def fetch_sp500_data(limit=None):
     """
-    Fetch S&P 500 constituents data (top N by market cap for performance).
+    Fetch S&P 500 constituents data.
 
     Args:
-        limit: Number of top stocks to fetch (default 100 for performance)
+        limit: Keep only the largest N stocks by market cap (None for all)
 
     Returns:
-        pd.DataFrame: DataFrame with S&P 500 constituent data
+        pd.DataFrame: DataFrame with S&P 500 constituent data; symbols that
+        failed are listed in df.attrs['failures']
     """
-    import time
-
     try:
-        # Top S&P 500 stocks by market cap (for performance, fetch top 100)
-        # In production, you'd fetch from a static list of S&P 500 tickers
-        sp500_top_tickers = [
-            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'BRK-B', 'UNH', 'JNJ',
-            'JPM', 'V', 'XOM', 'PG', 'MA', 'HD', 'CVX', 'ABBV', 'MRK', 'AVGO',
-            'KO', 'PEP', 'COST', 'LLY', 'TMO', 'WMT', 'ADBE', 'ACN', 'MCD', 'CSCO',
-            'ABT', 'NFLX', 'CRM', 'DHR', 'VZ', 'NKE', 'INTC', 'TXN', 'DIS', 'PM',
-            'CMCSA', 'UPS', 'NEE', 'COP', 'RTX', 'QCOM', 'AMD', 'HON', 'INTU', 'ORCL',
-            'WFC', 'MS', 'GS', 'BA', 'CAT', 'SPGI', 'AMGN', 'IBM', 'SBUX', 'BLK',
-            'LOW', 'PLD', 'GE', 'AXP', 'BKNG', 'GILD', 'MMC', 'ADI', 'C', 'MDLZ',
-            'NOW', 'DE', 'ISRG', 'TJX', 'CVS', 'ADP', 'REGN', 'VRTX', 'SYK', 'ZTS',
-            'MO', 'CB', 'PGR', 'CI', 'SO', 'LRCX', 'DUK', 'BDX', 'EOG', 'ITW',
-            'SLB', 'BSX', 'ETN', 'APD', 'MU', 'HUM', 'NOC', 'TMUS', 'EL', 'SCHW'
-        ]
-
-        tickers = sp500_top_tickers[:limit] if limit else sp500_top_tickers
-
-        data_list = []
-        failed_count = 0
-        for ticker in tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                hist = stock.history(period='1d')
-
-                if not hist.empty and info:
-                    current_price = hist['Close'].iloc[-1]
-                    prev_close = info.get('previousClose', current_price)
-                    change = current_price - prev_close
-                    change_pct = (change / prev_close * 100) if prev_close > 0 else 0
-
-                    data_list.append({
-                        'Symbol': ticker,
-                        'Price': current_price,
-                        'Change %': change_pct,
-                        'Volume': hist['Volume'].iloc[-1] if not hist.empty else 0,
-                        'Market Cap': info.get('marketCap', 0) / 1e7,  # Convert to Cr equivalent
-                        'Sector': info.get('sector', 'Unknown')
-                    })
-            except Exception as e:
-                failed_count += 1
-                if failed_count <= 5:  # Log first 5 failures
-                    print(f"Failed to fetch {ticker}: {e}")
-                continue
-
-        df = pd.DataFrame(data_list)
-
-        if df.empty:
-            print(f"WARNING: No S&P 500 data fetched. All {limit} tickers failed.")
-        elif failed_count > 0:
-            print(f"WARNING: {failed_count}/{limit} S&P 500 tickers failed to fetch")
-
-        return df if not df.empty else pd.DataFrame()
-
+        return fetch_universe_quotes("SP500", limit=limit)
     except Exception as e:
-        print(f"Error fetching S&P 500 data: {e}")
+        logger.error(f"Error fetching S&P 500 data: {e}", exc_info=True)
         return pd.DataFrame()
 
 
+@timed()
+@cached("history", ttl=600, max_stale=MAX_STALENESS)
 def fetch_symbol_history(symbol, period_years=5):
     """
     Fetch historical data for any symbol (index or sector).
 
+    Cached per symbol in the "history" namespace, so one symbol can be
+    refreshed with invalidate("history", symbol). Expired entries are served
+    for up to MAX_STALENESS while they are refreshed in the background.
+
     Args:
         symbol: Ticker symbol (e.g., "^NSEI", "XLK", "^NSEBANK")
         period_years: Number of years of history to fetch
@@ -117,15 +81,11 @@ def fetch_symbol_history(symbol, period_years=5):
     Returns:
         pd.DataFrame: Historical price data
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=period_years * 365)
-
     try:
-        ticker = yf.Ticker(symbol)
-        hist_data = ticker.history(start=start_date, end=end_date)
-        return hist_data
+        # Served from the on-disk store; only missing bars are downloaded
+        return load_history(symbol, period_years)
     except Exception as e:
-        print(f"Error fetching historical data for {symbol}: {e}")
+        logger.error(f"Error fetching historical data for {symbol}: {e}", exc_info=True)
         return pd.DataFrame()
 
 
@@ -145,6 +105,8 @@ def fetch_market_index_history(market_id, period_years=5):
     return fetch_symbol_history(index_symbol, period_years)
 
 
+@timed()
+@last_known_good("sectors")
 def fetch_sector_performance(market_id):
     """
     Fetch sector performance data for a market using batch download.
@@ -169,7 +131,7 @@ def fetch_sector_performance(market_id):
 
     # Use batch download to avoid N calls to .info and .history
     try:
-        data = yf.download(symbols, period="5d", group_by='ticker', progress=False, threads=True)
+        data = download_batch(symbols, "5d")
         
         is_multi_index = isinstance(data.columns, pd.MultiIndex)
 
@@ -209,11 +171,11 @@ def fetch_sector_performance(market_id):
                     'prev_close': prev_close
                 }
             except Exception as e:
-                print(f"Error processing sector {sector_name} ({sector_symbol}): {e}")
+                logger.error(f"Error processing sector {sector_name} ({sector_symbol}): {e}", exc_info=True)
                 continue
 
     except Exception as e:
-        print(f"Error fetching sector data: {e}")
+        logger.error(f"Error fetching sector data: {e}", exc_info=True)
         return {}
 
     return sector_data
@@ -236,13 +198,4 @@ def get_market_vix_data(market_id, period_years=5):
     if not vix_symbol:
         return pd.DataFrame()
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=period_years * 365)
-
-    try:
-        ticker = yf.Ticker(vix_symbol)
-        vix_data = ticker.history(start=start_date, end=end_date)
-        return vix_data
-    except Exception as e:
-        print(f"Error fetching VIX data: {e}")
-        return pd.DataFrame()
+    return fetch_symbol_history(vix_symbol, period_years)
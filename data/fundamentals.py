@@ -0,0 +1,233 @@
+"""
+Daily fundamentals snapshot for index universes.
+Shares outstanding, sector and industry change rarely, so they are fetched
+per symbol at most once a day, on a background thread using a bounded and
+rate-limited pool, and persisted as one Parquet file per universe. Market
+caps are then derived from live prices without any per-symbol requests.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import pandas as pd
+
+from config.settings import DATA_DIR, FETCH_MAX_WORKERS, FUNDAMENTALS_TTL
+from data.providers import get_provider
+from utils.fileio import atomic_write
+from utils.logger import logger
+from utils.metrics import timed
+
+
+FUNDAMENTAL_COLUMNS = ["Shares Outstanding", "Sector", "Industry"]
+
+# Seconds to wait before retrying a refresh that failed for every symbol
+_RETRY_AFTER = 3600
+
+
+@dataclass
+class FetchFailure:
+    """A symbol that could not be fetched, and at which stage."""
+    symbol: str
+    stage: str   # "price" or "fundamentals"
+    error: str
+
+
+def _fetch_info(symbol):
+    info = get_provider().fundamentals(symbol)
+    shares = info.get("sharesOutstanding") or info.get("impliedSharesOutstanding")
+    if not shares and info.get("marketCap") and info.get("currentPrice"):
+        shares = info["marketCap"] / info["currentPrice"]
+    return {
+        "Shares Outstanding": float(shares) if shares else float("nan"),
+        "Sector": info.get("sector") or "",
+        "Industry": info.get("industry") or ""
+    }
+
+
+@timed()
+def fetch_fundamentals(symbols, max_workers=FETCH_MAX_WORKERS):
+    """
+    Fetches shares outstanding, sector and industry for each symbol concurrently.
+
+    Requests run on a thread pool through the market data provider; for
+    yfinance that applies call_yahoo (rate limit, circuit breaker, global
+    concurrency cap, retry with backoff), so once the breaker opens the
+    remaining symbols fail fast instead of hitting Yahoo.
+
+    Args:
+        symbols: List of ticker symbols
+        max_workers: Upper bound on concurrent requests
+
+    Returns:
+        tuple: (DataFrame indexed by Symbol with FUNDAMENTAL_COLUMNS, [FetchFailure, ...])
+    """
+    rows = {}
+    failures = []
+    if not symbols:
+        return pd.DataFrame(columns=FUNDAMENTAL_COLUMNS), failures
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+        futures = {
+            pool.submit(_fetch_info, symbol): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                rows[symbol] = future.result()
+            except Exception as e:
+                failures.append(FetchFailure(symbol, "fundamentals", str(e)))
+
+    frame = pd.DataFrame.from_dict(rows, orient="index", columns=FUNDAMENTAL_COLUMNS)
+    return frame.rename_axis("Symbol"), failures
+
+
+class FundamentalsStore:
+    """
+    Per-universe fundamentals snapshot backed by one Parquet file per universe.
+
+    A sidecar JSON file records when the snapshot was taken. Symbols that
+    fail during a refresh keep their previous values, so one bad day at the
+    provider doesn't blank out market caps.
+    """
+
+    def __init__(self, root=None, max_age=FUNDAMENTALS_TTL):
+        self.root = root or os.path.join(DATA_DIR, "fundamentals")
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._failed_at = {}
+        self._refreshing = {}
+
+    def _lock_for(self, universe_id):
+        with self._locks_guard:
+            return self._locks.setdefault(universe_id, threading.Lock())
+
+    def _paths(self, universe_id):
+        base = os.path.join(self.root, universe_id.lower())
+        return base + ".parquet", base + ".json"
+
+    def read(self, universe_id):
+        """
+        Reads the stored snapshot for a universe.
+
+        Args:
+            universe_id: Universe key (e.g., "SP500")
+
+        Returns:
+            tuple: (DataFrame indexed by Symbol, snapshot time as epoch seconds or None)
+        """
+        data_path, meta_path = self._paths(universe_id)
+        try:
+            frame = pd.read_parquet(data_path)
+            with open(meta_path) as f:
+                taken_at = json.load(f).get("taken_at")
+            return frame, taken_at
+        except (OSError, ValueError) as e:
+            if os.path.exists(data_path):
+                logger.warning(f"Could not read fundamentals snapshot for {universe_id}: {e}")
+            return pd.DataFrame(columns=FUNDAMENTAL_COLUMNS).rename_axis("Symbol"), None
+
+    def _write(self, universe_id, frame, meta):
+        data_path, meta_path = self._paths(universe_id)
+        atomic_write(data_path, frame.to_parquet())
+        atomic_write(meta_path, json.dumps(meta))
+
+    def refresh(self, universe_id, symbols):
+        """
+        Fetches fundamentals for every symbol and replaces the stored snapshot.
+
+        Args:
+            universe_id: Universe key (e.g., "SP500")
+            symbols: Constituent symbols
+
+        Returns:
+            tuple: (DataFrame indexed by Symbol, [FetchFailure, ...])
+        """
+        with self._lock_for(universe_id):
+            previous, _ = self.read(universe_id)
+            fetched, failures = fetch_fundamentals(list(symbols))
+
+            if fetched.empty and failures:
+                # Provider unreachable: keep the old snapshot and retry in an hour
+                self._failed_at[universe_id] = time.time()
+                logger.warning(f"Fundamentals refresh for {universe_id} failed for every symbol: {failures[0].error}")
+                return previous, failures
+
+            kept = previous[previous.index.isin(symbols) & ~previous.index.isin(fetched.index)]
+            frame = pd.concat([fetched, kept]) if not kept.empty else fetched
+            frame = frame.reindex(columns=FUNDAMENTAL_COLUMNS)
+
+            try:
+                self._write(universe_id, frame, {"taken_at": time.time(), "failures": len(failures)})
+            except Exception as e:
+                logger.warning(f"Could not persist fundamentals for {universe_id}: {e}")
+
+        logger.info(f"Fundamentals snapshot for {universe_id}: {len(fetched)}/{len(symbols)} refreshed")
+        return frame, failures
+
+    def refresh_async(self, universe_id, symbols):
+        """
+        Starts a background refresh for a universe unless one is already running.
+
+        Args:
+            universe_id: Universe key (e.g., "SP500")
+            symbols: Constituent symbols
+
+        Returns:
+            threading.Thread: The running refresh thread
+        """
+        with self._locks_guard:
+            thread = self._refreshing.get(universe_id)
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(
+                target=self._refresh_quietly,
+                args=(universe_id, list(symbols)),
+                name=f"fundamentals-{universe_id}",
+                daemon=True
+            )
+            self._refreshing[universe_id] = thread
+            thread.start()
+            return thread
+
+    def _refresh_quietly(self, universe_id, symbols):
+        try:
+            self.refresh(universe_id, symbols)
+        except Exception as e:
+            self._failed_at[universe_id] = time.time()
+            logger.error(f"Background fundamentals refresh for {universe_id} failed: {e}", exc_info=True)
+
+    def get_snapshot(self, universe_id, symbols, wait=False):
+        """
+        Returns fundamentals for a universe, refreshing the snapshot once it is a day old.
+
+        By default the stored snapshot is returned immediately and a stale one
+        is refreshed on a background thread, so callers never wait on the
+        per-symbol requests; the refreshed values show up on a later call.
+
+        Args:
+            universe_id: Universe key (e.g., "SP500")
+            symbols: Constituent symbols
+            wait: Refresh in the calling thread and return the new snapshot
+
+        Returns:
+            pd.DataFrame: Indexed by Symbol with FUNDAMENTAL_COLUMNS (empty
+            until the first refresh has completed)
+        """
+        frame, taken_at = self.read(universe_id)
+        stale = taken_at is None or time.time() - taken_at >= self.max_age
+        if stale and time.time() - self._failed_at.get(universe_id, 0) >= _RETRY_AFTER:
+            if wait:
+                frame, _ = self.refresh(universe_id, symbols)
+            else:
+                self.refresh_async(universe_id, symbols)
+        return frame
+
+
+# Default store instance shared by the fetchers
+fundamentals_store = FundamentalsStore()
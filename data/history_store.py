@@ -0,0 +1,187 @@
+"""
+Persistent on-disk OHLCV history store.
+Keeps full daily history per symbol in Parquet files and only downloads the
+bars the store does not already hold, so history survives process restarts
+and repeat loads are local reads instead of multi-year downloads.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import pandas as pd
+
+from config.settings import DATA_DIR, HISTORY_SYNC_INTERVAL
+from data.providers import get_provider
+from data.refresh_policy import is_refresh_due, session_for_symbol
+from utils.fileio import atomic_write
+from utils.logger import logger
+from utils.metrics import timed
+
+
+def _has_corporate_action(bars, after):
+    """Returns True if any bar after `after` carries a dividend or split."""
+    if bars.empty:
+        return False
+    new_bars = bars[bars.index > after]
+    for column in ("Dividends", "Stock Splits"):
+        if column in new_bars.columns and (new_bars[column].fillna(0) != 0).any():
+            return True
+    return False
+
+
+class HistoryStore:
+    """
+    Symbol-keyed daily bar store backed by one Parquet file per symbol.
+
+    Each symbol has a sidecar JSON file recording the earliest start date
+    already requested from the provider and the time of the last tail sync,
+    so holidays before the first stored bar don't trigger repeat downloads.
+    """
+
+    def __init__(self, root=None, sync_interval=HISTORY_SYNC_INTERVAL):
+        self.root = root or os.path.join(DATA_DIR, "history")
+        self.sync_interval = sync_interval
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _paths(self, symbol):
+        base = os.path.join(self.root, quote(symbol, safe=""))
+        return base + ".parquet", base + ".json"
+
+    def read(self, symbol):
+        """
+        Reads the stored history for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            pd.DataFrame: Stored daily bars (empty if the symbol isn't stored)
+        """
+        data_path, _ = self._paths(symbol)
+        if not os.path.exists(data_path):
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(data_path)
+        except Exception as e:
+            logger.warning(f"Could not read stored history for {symbol}: {e}")
+            return pd.DataFrame()
+
+    def _read_meta(self, symbol):
+        _, meta_path = self._paths(symbol)
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, symbol, history, meta):
+        data_path, meta_path = self._paths(symbol)
+        atomic_write(data_path, history.to_parquet())
+        atomic_write(meta_path, json.dumps(meta))
+
+    def _download(self, symbol, start, end=None):
+        # Providers raise rather than return nothing, so a failed download
+        # isn't mistaken for "no bars exist"
+        return get_provider().history(symbol, start=start, end=end)
+
+    def get_history(self, symbol, start):
+        """
+        Returns daily bars for a symbol from `start` to the latest bar.
+
+        Serves from disk and downloads only what is missing: the head before
+        the earliest stored bar if `start` is older than anything requested
+        so far, and the tail since the last stored bar once the sync
+        interval has elapsed while the symbol's market is open (or for the
+        settlement sync after its close). The last stored bar is re-fetched
+        with the tail because it may have been captured intraday.
+
+        Args:
+            symbol: Ticker symbol (e.g., "^NSEI", "XLK")
+            start: datetime of the earliest bar wanted
+
+        Returns:
+            pd.DataFrame: Historical price data (empty if nothing is available)
+        """
+        start = pd.Timestamp(start).normalize()
+
+        with self._lock_for(symbol):
+            stored = self.read(symbol)
+            meta = self._read_meta(symbol)
+            parts = [stored]
+            changed = False
+
+            try:
+                if stored.empty:
+                    parts = [self._download(symbol, start)]
+                    meta["covered_from"] = start.strftime("%Y-%m-%d")
+                    meta["synced_at"] = time.time()
+                    changed = True
+                else:
+                    meta.setdefault("covered_from", stored.index[0].strftime("%Y-%m-%d"))
+                    covered_from = pd.Timestamp(meta["covered_from"])
+                    if start < covered_from:
+                        head = self._download(symbol, start, end=covered_from)
+                        parts.insert(0, head)
+                        meta["covered_from"] = start.strftime("%Y-%m-%d")
+                        changed = True
+
+                    if is_refresh_due(session_for_symbol(symbol), meta.get("synced_at", 0), self.sync_interval):
+                        last_date = stored.index[-1].to_pydatetime().replace(tzinfo=None)
+                        tail = self._download(symbol, last_date)
+                        if _has_corporate_action(tail, after=stored.index[-1]):
+                            # Adjusted prices shift on dividends/splits, so the
+                            # stored bars no longer line up with the new tail
+                            logger.info(f"Corporate action in {symbol} tail, reloading full history")
+                            parts = [self._download(symbol, pd.Timestamp(meta["covered_from"]))]
+                        else:
+                            parts.append(tail)
+                        meta["synced_at"] = time.time()
+                        changed = True
+            except Exception as e:
+                # Keep serving what's on disk if the provider is unavailable
+                logger.warning(f"History sync failed for {symbol}: {e}")
+
+            parts = [part for part in parts if not part.empty]
+            if not parts:
+                return pd.DataFrame()
+
+            history = pd.concat(parts) if len(parts) > 1 else parts[0]
+            history = history[~history.index.duplicated(keep="last")].sort_index()
+
+            if changed:
+                try:
+                    self._write(symbol, history, meta)
+                except Exception as e:
+                    logger.warning(f"Could not persist history for {symbol}: {e}")
+
+        start_bound = start.tz_localize(history.index.tz) if history.index.tz is not None else start
+        return history[history.index >= start_bound]
+
+
+# Default store instance shared by the fetchers
+history_store = HistoryStore()
+
+
+@timed()
+def load_history(symbol, period_years=5):
+    """
+    Loads `period_years` of daily history for a symbol through the default store.
+
+    Args:
+        symbol: Ticker symbol
+        period_years: Number of years of history
+
+    Returns:
+        pd.DataFrame: Historical price data
+    """
+    start_date = datetime.now() - timedelta(days=period_years * 365)
+    return history_store.get_history(symbol, start_date)
@@ -0,0 +1,123 @@
+"""
+Precomputed analytics job.
+Derives seasonality tables (main index and every sector) and historical
+performance analytics (main index) for every market in config/markets.MARKETS,
+for each period the dashboard's year sliders offer, and saves them to the
+analytics store. Daily bars only change when a session closes, so running
+this once per close lets every dashboard rerun read results instead of
+recomputing them.
+
+Run it at least SETTLEMENT_DELAY after each market's close, e.g. from cron
+(times in UTC):
+    0 11 * * 1-5   cd /path/to/marketpulse && python -m data.precompute --markets INDIA
+    30 21 * * 1-5  cd /path/to/marketpulse && python -m data.precompute --markets USA
+
+Usage:
+    python -m data.precompute [--markets INDIA USA]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from config.markets import MARKETS
+from data.analytics_store import analytics_store
+from data.history_store import load_history
+from utils.history_analytics import compute_history_analytics
+from utils.logger import logger
+from utils.seasonality import compute_seasonality
+
+
+SEASONALITY_YEARS = range(5, 16)  # the Seasonality tab's year slider
+HISTORY_YEARS = range(1, 11)  # the Historical Analysis tab's year slider
+
+
+def _window(history, years, now):
+    """Bars from `years` before `now`, matching what load_history(symbol, years) returns."""
+    start = pd.Timestamp(now - timedelta(days=years * 365)).normalize()
+    if history.index.tz is not None:
+        start = start.tz_localize(history.index.tz)
+    return history[history.index >= start]
+
+
+def precompute_symbol(symbol, seasonality_years=(), history_years=(), store=analytics_store):
+    """
+    Precomputes and stores one symbol's analytics for each requested period.
+
+    The longest period's history is loaded once (through the history store,
+    so only missing bars are downloaded) and sliced for the shorter ones.
+
+    Args:
+        symbol: Ticker symbol
+        seasonality_years: Periods (years) to store seasonality tables for
+        history_years: Periods (years) to store historical analytics for
+        store: AnalyticsStore to save to
+
+    Returns:
+        int: Number of results stored
+
+    Raises:
+        LookupError: If no history is available for the symbol
+    """
+    now = datetime.now()
+    history = load_history(symbol, max([*seasonality_years, *history_years]))
+    if history.empty:
+        raise LookupError(f"no history for {symbol}")
+
+    stored = 0
+    for kind, periods, compute in (("seasonality", seasonality_years, compute_seasonality),
+                                   ("history", history_years, compute_history_analytics)):
+        for years in periods:
+            result = compute(_window(history, years, now))
+            if result is not None:
+                store.save(kind, symbol, years, result)
+                stored += 1
+    return stored
+
+
+def precompute(markets=None, store=analytics_store):
+    """
+    Precomputes analytics for every configured market and sector.
+
+    Args:
+        markets: Market ids to precompute (default: all of MARKETS)
+        store: AnalyticsStore to save to
+
+    Returns:
+        tuple: (number of results stored, list of symbols that failed)
+    """
+    stored, failed = 0, []
+    for market_id in markets or MARKETS:
+        market_config = MARKETS[market_id]
+        targets = {market_config['main_index']['symbol']: True}
+        targets.update({symbol: False for symbol in market_config.get('sectors', {}).values()})
+
+        for symbol, is_main_index in targets.items():
+            try:
+                stored += precompute_symbol(symbol, SEASONALITY_YEARS,
+                                            HISTORY_YEARS if is_main_index else (), store)
+            except Exception as e:
+                logger.warning(f"Could not precompute analytics for {symbol}: {e}")
+                failed.append(symbol)
+    return stored, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute daily analytics for the dashboard.")
+    parser.add_argument("--markets", nargs="+", choices=list(MARKETS), help="markets to precompute (default: all)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stored, failed = precompute(args.markets)
+    print(f"Stored {stored} results in {analytics_store.root} in {time.perf_counter() - started:.1f}s")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
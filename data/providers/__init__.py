@@ -0,0 +1,58 @@
+"""
+Market data providers.
+`get_provider()` returns the provider selected by MARKET_DATA_PROVIDER
+("yfinance" or "replay"); fetchers call it rather than importing a vendor
+library, and benchmarks can swap in their own with `set_provider()`.
+"""
+
+import threading
+
+from config.settings import MARKET_DATA_PROVIDER
+from data.providers.base import MarketDataProvider, NoDataError, combine_histories
+from utils.logger import logger
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name=MARKET_DATA_PROVIDER):
+    """
+    Builds a market data provider by name.
+
+    Args:
+        name: "yfinance" or "replay"
+
+    Returns:
+        MarketDataProvider
+    """
+    if name == "replay":
+        from data.providers.replay import ReplayProvider
+        return ReplayProvider()
+    if name != "yfinance":
+        logger.warning(f"Unknown market data provider {name!r}, using yfinance")
+    from data.providers.yahoo import YFinanceProvider
+    return YFinanceProvider()
+
+
+def get_provider():
+    """Returns the shared market data provider, creating it on first use."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider()
+                logger.info(f"Using {_provider.name} market data provider")
+    return _provider
+
+
+def set_provider(provider):
+    """
+    Replaces the shared market data provider.
+
+    Args:
+        provider: MarketDataProvider instance, or None to recreate the configured one
+    """
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,124 @@
+"""
+Market data provider interface.
+Fetchers ask a provider for history, batch history, quotes and fundamentals
+instead of calling a vendor library directly, so the data source can be
+swapped (e.g. for offline replay) without touching the fetchers.
+"""
+
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+
+class NoDataError(LookupError):
+    """Raised when a provider has no data for a symbol or range."""
+
+
+class MarketDataProvider(ABC):
+    """
+    Base class for market data providers.
+
+    History frames are daily OHLCV bars indexed by date, oldest first, with
+    the yfinance column names (Open, High, Low, Close, Volume, Dividends,
+    Stock Splits). Methods raise instead of returning empty results, so a
+    failed request is never mistaken for "no bars exist".
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol, period=None, start=None, end=None):
+        """
+        Returns daily bars for one symbol.
+
+        Args:
+            symbol: Ticker symbol (e.g., "^NSEI", "AAPL")
+            period: History window (e.g., "7d", "1y"); ignored if `start` is given
+            start: datetime of the earliest bar wanted
+            end: datetime the bars end before (exclusive; default: latest bar)
+
+        Returns:
+            pd.DataFrame: OHLCV bars
+
+        Raises:
+            NoDataError: If the symbol has no bars in the range
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def batch_history(self, symbols, period):
+        """
+        Returns daily bars for many symbols in one frame.
+
+        Args:
+            symbols: List of ticker symbols
+            period: History window (e.g., "5d")
+
+        Returns:
+            pd.DataFrame: (ticker, field) column MultiIndex over the union of
+            the symbols' dates; symbols without data may be missing
+
+        Raises:
+            NoDataError: If no symbol has any bars
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fundamentals(self, symbol):
+        """
+        Returns the quote summary for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            dict: yfinance Ticker.info style fields (shortName, sector,
+            industry, sharesOutstanding, marketCap, currentPrice, ...)
+
+        Raises:
+            NoDataError: If the provider has nothing for the symbol
+        """
+        raise NotImplementedError
+
+    def quotes(self, symbols):
+        """
+        Returns the latest price for each symbol.
+
+        Args:
+            symbols: List of ticker symbols
+
+        Returns:
+            dict: symbol -> {"price", "previous_close", "volume"}; symbols
+            without data are omitted
+        """
+        data = self.batch_history(symbols, "5d")
+        quotes = {}
+        for symbol in symbols:
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            bars = data[symbol].dropna(subset=["Close"])
+            if bars.empty:
+                continue
+            closes = bars["Close"]
+            quotes[symbol] = {
+                "price": float(closes.iloc[-1]),
+                "previous_close": float(closes.iloc[-2]) if len(closes) > 1 else float(closes.iloc[-1]),
+                "volume": float(bars["Volume"].iloc[-1]) if "Volume" in bars.columns else float("nan")
+            }
+        return quotes
+
+
+def combine_histories(histories):
+    """
+    Combines per-symbol bars into a yf.download(group_by='ticker') style frame.
+
+    Args:
+        histories: Mapping of symbol -> OHLCV DataFrame
+
+    Returns:
+        pd.DataFrame: (ticker, field) column MultiIndex
+    """
+    frames = {symbol: bars for symbol, bars in histories.items() if not bars.empty}
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1).sort_index()
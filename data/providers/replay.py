@@ -0,0 +1,200 @@
+"""
+Offline replay provider.
+Serves recorded daily OHLCV from local Parquet files (the same one-file-per-
+symbol layout as the history store) and recorded quote summaries from a JSON
+file, so the whole page pipeline can run without network access and return
+identical data on every run, e.g. for throughput and latency benchmarks.
+
+Record a set of symbols from the live provider with:
+    python -m data.providers.replay --symbols ^NSEI ^GSPC --years 5
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import pandas as pd
+
+from config.settings import REPLAY_DIR
+from data.providers.base import MarketDataProvider, NoDataError, combine_histories
+from utils.fileio import atomic_write
+from utils.logger import logger
+
+
+FUNDAMENTALS_FILE = "fundamentals.json"
+
+
+def _period_start(period, last_bar):
+    """
+    Returns the first bar date of a yfinance-style period ending at `last_bar`.
+
+    "Nd" counts trading days (bars) like yfinance does, so it is handled by
+    the caller; this covers the calendar periods.
+    """
+    if period in (None, "max"):
+        return None
+    if period == "ytd":
+        return last_bar.replace(month=1, day=1).normalize()
+    if period.endswith("mo"):
+        return last_bar - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("y"):
+        return last_bar - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("wk"):
+        return last_bar - pd.DateOffset(weeks=int(period[:-2]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _localize(value, index):
+    value = pd.Timestamp(value)
+    if index.tz is not None and value.tz is None:
+        return value.tz_localize(index.tz)
+    return value
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Market data replayed from files under `root`.
+
+    Periods are measured back from each symbol's last recorded bar (or from
+    `as_of`, if given), not from the wall clock, so results don't drift as
+    the recording ages.
+    """
+
+    name = "replay"
+
+    def __init__(self, root=None, as_of=None, latency=0.0):
+        """
+        Args:
+            root: Directory with <symbol>.parquet files and fundamentals.json
+                (default: REPLAY_DIR)
+            as_of: Optional datetime to replay from; later bars are hidden
+            latency: Seconds each request sleeps, to model provider round trips
+        """
+        self.root = root or REPLAY_DIR
+        self.as_of = pd.Timestamp(as_of) if as_of is not None else None
+        self.latency = latency
+        self._frames = {}
+        self._fundamentals = None
+        self._lock = threading.Lock()
+
+    def _path(self, symbol):
+        return os.path.join(self.root, quote(symbol, safe="") + ".parquet")
+
+    def _bars(self, symbol):
+        # Recordings are read once and kept; callers get slices, never the cached frame
+        with self._lock:
+            if symbol not in self._frames:
+                path = self._path(symbol)
+                bars = pd.read_parquet(path).sort_index() if os.path.exists(path) else pd.DataFrame()
+                if self.as_of is not None and not bars.empty:
+                    bars = bars[bars.index <= _localize(self.as_of, bars.index)]
+                self._frames[symbol] = bars
+            return self._frames[symbol]
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _slice(self, symbol, period=None, start=None, end=None):
+        bars = self._bars(symbol)
+        if bars.empty:
+            return bars
+        if start is not None:
+            bars = bars[bars.index >= _localize(start, bars.index)]
+            if end is not None:
+                bars = bars[bars.index < _localize(end, bars.index)]
+            return bars.copy()
+        if period and period.endswith("d"):
+            return bars.iloc[-int(period[:-1]):].copy()
+        first = _period_start(period, bars.index[-1])
+        return (bars[bars.index >= first] if first is not None else bars).copy()
+
+    def history(self, symbol, period=None, start=None, end=None):
+        self._wait()
+        bars = self._slice(symbol, period or "1mo", start, end)
+        if bars.empty:
+            raise NoDataError(f"no recorded bars for {symbol}")
+        return bars
+
+    def batch_history(self, symbols, period):
+        self._wait()
+        data = combine_histories({symbol: self._slice(symbol, period) for symbol in symbols})
+        if data.empty:
+            raise NoDataError("no recorded bars for any symbol")
+        return data
+
+    def fundamentals(self, symbol):
+        self._wait()
+        with self._lock:
+            if self._fundamentals is None:
+                path = os.path.join(self.root, FUNDAMENTALS_FILE)
+                try:
+                    with open(path) as f:
+                        self._fundamentals = json.load(f)
+                except (OSError, ValueError):
+                    self._fundamentals = {}
+        info = self._fundamentals.get(symbol)
+        if not info:
+            raise NoDataError(f"no recorded fundamentals for {symbol}")
+        return dict(info)
+
+
+def record(symbols, source, root=None, years=5, fundamentals=True):
+    """
+    Records history (and optionally quote summaries) from a live provider.
+
+    Existing recordings for other symbols are kept; each file is written
+    atomically.
+
+    Args:
+        symbols: List of ticker symbols
+        source: Provider to record from (e.g., YFinanceProvider())
+        root: Recording directory (default: REPLAY_DIR)
+        years: Years of daily history to record
+        fundamentals: Also record each symbol's quote summary
+
+    Returns:
+        list: Symbols that could not be recorded
+    """
+    root = root or REPLAY_DIR
+    os.makedirs(root, exist_ok=True)
+    start = datetime.now() - timedelta(days=years * 365)
+
+    info_path = os.path.join(root, FUNDAMENTALS_FILE)
+    try:
+        with open(info_path) as f:
+            infos = json.load(f)
+    except (OSError, ValueError):
+        infos = {}
+
+    failed = []
+    for symbol in symbols:
+        try:
+            bars = source.history(symbol, start=start)
+            atomic_write(os.path.join(root, quote(symbol, safe="") + ".parquet"), bars.to_parquet())
+            if fundamentals:
+                infos[symbol] = source.fundamentals(symbol)
+        except Exception as e:
+            logger.warning(f"Could not record {symbol}: {e}")
+            failed.append(symbol)
+
+    atomic_write(info_path, json.dumps(infos, default=str))
+    return failed
+
+
+if __name__ == "__main__":
+    from data.providers.yahoo import YFinanceProvider
+
+    parser = argparse.ArgumentParser(description="Record market data for offline replay.")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--root", default=REPLAY_DIR)
+    parser.add_argument("--no-fundamentals", action="store_true")
+    args = parser.parse_args()
+
+    failed = record(args.symbols, YFinanceProvider(), args.root, args.years, not args.no_fundamentals)
+    print(f"Recorded {len(args.symbols) - len(failed)}/{len(args.symbols)} symbols to {args.root}")
@@ -0,0 +1,82 @@
+"""
+Yahoo Finance provider.
+Every yfinance request in the app goes through here, so all of them share
+the per-endpoint circuit breakers, token buckets, global concurrency cap and
+retry with backoff in data/rate_limit.py, and one HTTP session, so
+cookies, the crumb and keep-alive connections are reused across requests.
+"""
+
+from urllib.parse import urlparse
+
+import yfinance as yf
+from curl_cffi import requests as curl_requests
+
+from data.providers.base import MarketDataProvider, NoDataError
+from data.rate_limit import YAHOO_CHART_HOST, YAHOO_SUMMARY_HOST, call_yahoo
+from utils.metrics import UPSTREAM_BYTES, metrics
+
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if value is not None else None
+
+
+def _metered(session_class):
+    """Subclass of an HTTP session class that counts response bytes per host in UPSTREAM_BYTES."""
+    class MeteredSession(session_class):
+        def request(self, *args, **kwargs):
+            response = super().request(*args, **kwargs)
+            endpoint = urlparse(str(response.url)).hostname or "unknown"
+            metrics.inc(UPSTREAM_BYTES, len(response.content or b""), endpoint=endpoint)
+            return response
+
+    return MeteredSession
+
+
+def new_session():
+    """
+    Creates an HTTP session for yfinance.
+
+    curl_cffi sessions keep one curl handle (and its connection cache) per
+    thread, so long-lived worker threads reuse their connections.
+    """
+    return _metered(curl_requests.Session)(impersonate="chrome")
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Market data from Yahoo Finance via the yfinance library."""
+
+    name = "yfinance"
+
+    def __init__(self, session=None):
+        # Passed to every call: yf.download otherwise swaps a brand new
+        # session into yfinance's shared client, dropping open connections
+        self.session = session or new_session()
+
+    def history(self, symbol, period=None, start=None, end=None):
+        # raise_errors so a failed download isn't mistaken for "no bars exist"
+        ticker = yf.Ticker(symbol, session=self.session)
+        if start is not None:
+            return call_yahoo(YAHOO_CHART_HOST, ticker.history,
+                              start=_date(start), end=_date(end), raise_errors=True)
+        return call_yahoo(YAHOO_CHART_HOST, ticker.history, period=period or "1mo", raise_errors=True)
+
+    def batch_history(self, symbols, period):
+        # yf.download reports failures as an empty frame, so that is raised as
+        # an error to be retried and counted by the circuit breaker
+        def download():
+            data = yf.download(symbols, period=period, group_by='ticker', progress=False, threads=True,
+                               timeout=30, session=self.session)
+            if data is None or data.empty:
+                raise NoDataError("empty batch download")
+            return data
+
+        return call_yahoo(YAHOO_CHART_HOST, download)
+
+    def fundamentals(self, symbol):
+        def fetch_info():
+            info = yf.Ticker(symbol, session=self.session).info
+            if not info:
+                raise NoDataError("empty quote summary")
+            return info
+
+        return call_yahoo(YAHOO_SUMMARY_HOST, fetch_info)
@@ -0,0 +1,303 @@
+"""
+Request throttling for data providers.
+Per-host token buckets, per-endpoint circuit breakers, a global cap on
+concurrent provider requests and retry with exponential backoff, shared by
+every fetcher so that a struggling provider sees fewer requests, not more.
+"""
+
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+from yfinance.exceptions import (
+    YFInvalidPeriodError, YFPricesMissingError, YFRateLimitError, YFTickerMissingError, YFTzMissingError
+)
+
+from config.settings import (
+    BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_RESET_TIMEOUT, BREAKER_RESET_TIMEOUT,
+    PROVIDER_MAX_CONCURRENCY, PROVIDER_RATE_LIMIT
+)
+from utils.logger import logger
+from utils.metrics import UPSTREAM_REQUESTS, UPSTREAM_SECONDS, metrics
+
+
+# yfinance endpoints: price history/batch downloads and quoteSummary (Ticker.info)
+YAHOO_CHART_HOST = "query1.finance.yahoo.com"
+YAHOO_SUMMARY_HOST = "query2.finance.yahoo.com"
+
+# Errors about one symbol's data, not the provider's health: not retried and
+# not counted against the circuit breaker
+YAHOO_DATA_ERRORS = (YFTickerMissingError, YFPricesMissingError, YFTzMissingError, YFInvalidPeriodError)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Allows bursts of up to `capacity` requests and refills at `rate` tokens
+    per second; acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Blocks until `tokens` tokens are available and takes them."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def host_limiter(host, rate=5, capacity=None):
+    """
+    Returns the shared token bucket for a host, creating it on first use.
+
+    Args:
+        host: Hostname or URL (e.g., "query2.finance.yahoo.com")
+        rate: Requests per second allowed to the host
+        capacity: Burst size (defaults to `rate`)
+
+    Returns:
+        TokenBucket: Bucket shared by every caller for that host
+    """
+    host = urlparse(host).hostname or host
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(rate, capacity)
+        return bucket
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+# An explicit HTTP 429 status or its reason phrase in an error message
+# ("429 Client Error", "HTTP Error 429", "status code 429", "Too Many Requests")
+_HTTP_429 = re.compile(r"\b429 client error\b|\bhttp(?: error)?:? 429\b|\bstatus(?: code)?:? 429\b|\btoo many requests\b")
+
+
+def is_rate_limited(error):
+    """True if an exception is a provider throttling response (yfinance rate limit or HTTP 429)."""
+    if isinstance(error, YFRateLimitError):
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return _HTTP_429.search(str(error).lower()) is not None
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    Closed: calls go through. After `failure_threshold` consecutive failures
+    (or any rate-limit response) it opens and every call fails fast with
+    CircuitOpenError. After the reset timeout one probe call is let through
+    (half-open); success closes the circuit, failure reopens it with the
+    timeout doubled (plus jitter), up to `max_reset_timeout`.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, max_reset_timeout=BREAKER_MAX_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._failures = 0
+        self._trips = 0
+        self._opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """"closed", "open" or "half-open"."""
+        with self._lock:
+            if self._trips == 0:
+                return "closed"
+            return "open" if time.monotonic() < self._opened_until or self._probing else "half-open"
+
+    def allow(self):
+        """
+        Claims permission for one call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already in flight)
+        """
+        with self._lock:
+            if self._trips == 0:
+                return
+            remaining = self._opened_until - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(f"{self.name} circuit open, retrying in {max(remaining, 0):.0f}s")
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self._trips:
+                logger.info(f"{self.name} circuit closed")
+            self._failures = 0
+            self._trips = 0
+            self._probing = False
+
+    def record_failure(self, rate_limited=False):
+        with self._lock:
+            self._failures += 1
+            if self._trips and not self._probing and time.monotonic() < self._opened_until:
+                return  # a call that started before the circuit opened
+            if not (self._probing or rate_limited or self._failures >= self.failure_threshold):
+                return
+            timeout = min(self.max_reset_timeout, self.reset_timeout * 2 ** self._trips)
+            timeout *= random.uniform(1.0, 1.25)
+            self._trips += 1
+            self._probing = False
+            self._opened_until = time.monotonic() + timeout
+        logger.warning(f"{self.name} circuit open for {timeout:.0f}s after {self._failures} failures"
+                       + (" (rate limited)" if rate_limited else ""))
+
+    def release(self):
+        """Ends a probe that finished without a verdict (e.g. a data error)."""
+        with self._lock:
+            self._probing = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(endpoint):
+    """
+    Returns the shared circuit breaker for an endpoint, creating it on first use.
+
+    Args:
+        endpoint: Hostname or URL (e.g., "query1.finance.yahoo.com")
+
+    Returns:
+        CircuitBreaker: Breaker shared by every caller for that endpoint
+    """
+    endpoint = urlparse(endpoint).hostname or endpoint
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+
+# Process-wide cap on provider requests in flight, across every endpoint
+provider_slots = threading.BoundedSemaphore(PROVIDER_MAX_CONCURRENCY)
+
+
+def retry_with_backoff(func, *args, attempts=3, base_delay=1.0, max_delay=30.0, limiter=None,
+                       breaker=None, slots=None, benign=(), **kwargs):
+    """
+    Calls `func`, retrying failures with exponential backoff and jitter.
+
+    Args:
+        func: Callable to invoke with *args and **kwargs
+        attempts: Total number of tries
+        base_delay: Delay in seconds before the first retry (doubles each time)
+        max_delay: Upper bound on a single delay
+        limiter: Optional TokenBucket acquired before every try
+        breaker: Optional CircuitBreaker checked before and updated after every try
+        slots: Optional semaphore held while `func` runs (not while backing off)
+        benign: Exception types that are raised immediately without a retry
+            and without counting against the breaker
+
+    Every try is counted in UPSTREAM_REQUESTS by outcome (ok, no_data,
+    rate_limited, error, circuit_open) and timed in UPSTREAM_SECONDS, under
+    the breaker's endpoint name.
+
+    Returns:
+        The return value of `func`
+
+    Raises:
+        CircuitOpenError: If the breaker is open
+        Exception: The last error if every attempt fails
+    """
+    endpoint = breaker.name if breaker is not None else getattr(func, '__name__', 'unknown')
+    for attempt in range(attempts):
+        if breaker is not None:
+            try:
+                breaker.allow()
+            except CircuitOpenError:
+                metrics.inc(UPSTREAM_REQUESTS, endpoint=endpoint, outcome="circuit_open")
+                raise
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with metrics.time(UPSTREAM_SECONDS, endpoint=endpoint):
+                if slots is not None:
+                    with slots:
+                        result = func(*args, **kwargs)
+                else:
+                    result = func(*args, **kwargs)
+        except benign:
+            metrics.inc(UPSTREAM_REQUESTS, endpoint=endpoint, outcome="no_data")
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            rate_limited = is_rate_limited(e)
+            metrics.inc(UPSTREAM_REQUESTS, endpoint=endpoint, outcome="rate_limited" if rate_limited else "error")
+            if breaker is not None:
+                breaker.record_failure(rate_limited=rate_limited)
+            if attempt == attempts - 1 or rate_limited:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.debug(f"{getattr(func, '__name__', func)} failed ({e}), retry {attempt + 1} in {delay:.1f}s")
+            time.sleep(delay)
+        else:
+            metrics.inc(UPSTREAM_REQUESTS, endpoint=endpoint, outcome="ok")
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+def call_yahoo(host, func, *args, attempts=3, **kwargs):
+    """
+    Calls a yfinance function through the shared throttling for a Yahoo endpoint.
+
+    Applies the endpoint's circuit breaker and token bucket, the global
+    concurrency cap and retry with backoff; per-symbol data errors are
+    raised as-is.
+
+    Args:
+        host: Yahoo endpoint (YAHOO_CHART_HOST or YAHOO_SUMMARY_HOST)
+        func: Callable making the request
+        attempts: Total number of tries
+
+    Returns:
+        The return value of `func`
+
+    Raises:
+        CircuitOpenError: If the endpoint's breaker is open
+    """
+    return retry_with_backoff(
+        func, *args,
+        attempts=attempts,
+        limiter=host_limiter(host, rate=PROVIDER_RATE_LIMIT),
+        breaker=circuit_breaker(host),
+        slots=provider_slots,
+        benign=YAHOO_DATA_ERRORS,
+        **kwargs
+    )
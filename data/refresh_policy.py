@@ -0,0 +1,124 @@
+"""
+Market-hours-aware refresh policy.
+Decides when a symbol's data is next worth fetching from the trading session
+it belongs to: every `interval` seconds while the market is open, once more
+shortly after the close to pick up settled prices, and not again until the
+next open. Symbols without a known session fall back to a plain interval.
+"""
+
+import datetime
+
+from config.constants import INDICES, REGION_SESSIONS, SYMBOL_SESSIONS
+from config.markets import MARKETS
+from config.settings import SETTLEMENT_DELAY
+from utils.market_time import MarketSchedule, UTC
+
+
+schedule = MarketSchedule()
+
+# Exchange suffixes of constituent symbols (Yahoo Finance)
+_SUFFIX_SESSIONS = {
+    ".NS": "India (NSE)",
+    ".BO": "India (NSE)",
+    ".L": "Europe (LSE)",
+    ".T": "Japan (Tokyo)",
+    ".HK": "Hong Kong (HKEX)",
+    ".SS": "China (SSE)",
+    ".KS": "Korea (KRX)"
+}
+
+
+def _known_symbols():
+    sessions = {}
+    for region, symbols in INDICES.items():
+        for symbol in symbols.values():
+            sessions[symbol] = REGION_SESSIONS[region]
+    for config in MARKETS.values():
+        for symbol in [config["main_index"]["symbol"], config["vix_symbol"],
+                       *config["alternative_indices"].values(), *config["sectors"].values()]:
+            sessions[symbol] = config["session"]
+    sessions.update(SYMBOL_SESSIONS)
+    return sessions
+
+
+_SYMBOL_SESSIONS = _known_symbols()
+
+
+def session_for_symbol(symbol):
+    """
+    Returns the MarketSchedule session a symbol trades on.
+
+    Args:
+        symbol: Ticker symbol (e.g., "^NSEI", "RELIANCE.NS", "XLK")
+
+    Returns:
+        str: Session name, or None if the symbol's market is unknown
+    """
+    if symbol in _SYMBOL_SESSIONS:
+        return _SYMBOL_SESSIONS[symbol]
+    for suffix, session in _SUFFIX_SESSIONS.items():
+        if symbol.endswith(suffix):
+            return session
+    return None
+
+
+def next_refresh_at(session, last_fetch, interval, now=None):
+    """
+    Returns when data last fetched at `last_fetch` should next be refreshed.
+
+    Args:
+        session: MarketSchedule session name (None for a plain interval)
+        last_fetch: Epoch seconds of the last successful fetch
+        interval: Seconds between refreshes while the market is open
+        now: Epoch seconds to evaluate at (default: current time)
+
+    Returns:
+        float: Epoch seconds of the next refresh (may be in the past if one
+        is already due)
+    """
+    if session is None:
+        return last_fetch + interval
+
+    now_dt = datetime.datetime.fromtimestamp(now, UTC) if now else None
+    is_open, since, until = schedule.get_session_state(session, now_dt)
+    since = since.timestamp() if since else None
+    until = until.timestamp() if until else None
+
+    if is_open:
+        if since is not None and last_fetch < since:
+            return since  # opened since the last fetch
+        due = last_fetch + interval
+        if until is not None and due > until:
+            due = until + SETTLEMENT_DELAY  # next fetch is the settlement refresh
+        return due
+
+    # Closed: one settlement refresh after the close, then wait for the open
+    if since is not None and last_fetch < since + SETTLEMENT_DELAY:
+        return since + SETTLEMENT_DELAY
+    return until if until is not None else last_fetch + interval
+
+
+def is_refresh_due(session, last_fetch, interval, now=None):
+    """Returns True if data fetched at `last_fetch` should be refreshed now."""
+    now = now or datetime.datetime.now(UTC).timestamp()
+    return now >= next_refresh_at(session, last_fetch, interval, now)
+
+
+def last_close(session, now=None):
+    """
+    Returns when a session last closed.
+
+    Args:
+        session: MarketSchedule session name
+        now: Epoch seconds to evaluate at (default: current time)
+
+    Returns:
+        float: Epoch seconds of the most recent close (or trading break),
+        None if the session has no closes (e.g. Crypto)
+    """
+    now_dt = datetime.datetime.fromtimestamp(now, UTC) if now else None
+    is_open, since, _ = schedule.get_session_state(session, now_dt)
+    if is_open and since is not None:
+        # Open since `since`: the state just before it began at the last close
+        is_open, since, _ = schedule.get_session_state(session, since - datetime.timedelta(seconds=1))
+    return since.timestamp() if since is not None and not is_open else None
@@ -0,0 +1,203 @@
+"""
+Background refresh scheduler for MarketPulse.
+Runs registered fetch jobs on their own cadence in a process-wide thread and
+keeps the latest result of each in a shared in-memory snapshot, so page
+reruns read data instead of fetching it and no session has to wait on (or
+throw away) another session's data. Jobs tied to a trading session follow
+data.refresh_policy: frequent while the market is open, one settlement
+refresh after the close, then nothing until the next open.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import streamlit as st
+
+from config.settings import MAX_STALENESS
+from data.refresh_policy import next_refresh_at
+from utils.logger import logger
+
+
+# Jobs nobody has read for this many intervals stop refreshing until read again
+IDLE_INTERVALS = 5
+
+
+@dataclass
+class Snapshot:
+    """Latest result of a scheduled job."""
+    value: Any = None
+    updated_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def age(self):
+        """Seconds since the value was fetched (None if never fetched)."""
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+
+class _Job:
+    def __init__(self, key, func, args, interval, session):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.interval = interval
+        self.session = session
+        self.snapshot = Snapshot()
+        self.next_run = 0.0
+        self.last_read = time.time()
+        self.running = False
+        self.done = threading.Condition()
+        self.runs = 0
+
+
+class RefreshScheduler:
+    """
+    Process-wide scheduler that refreshes registered jobs into snapshots.
+
+    A single dispatcher thread wakes up when a job is due (or when asked to
+    refresh) and hands due jobs to a small worker pool, so one slow provider
+    doesn't hold up the others. A failed run keeps the previous value and
+    records the error on the snapshot.
+    """
+
+    def __init__(self, max_workers=4):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def register(self, key, func, *args, interval, session=None):
+        """
+        Registers a job (no-op if `key` is already registered).
+
+        Args:
+            key: Unique job name (e.g., "quotes", "sectors:USA")
+            func: Callable producing the snapshot value
+            *args: Arguments for `func`
+            interval: Seconds between refreshes (while `session` is open)
+            session: MarketSchedule session the data trades on (None to
+                refresh every `interval` regardless of market hours)
+        """
+        with self._lock:
+            if key in self._jobs:
+                return
+            self._jobs[key] = _Job(key, func, args, interval, session)
+        self._wake.set()
+
+    def read(self, key, wait=None, max_stale=MAX_STALENESS):
+        """
+        Returns the current snapshot for a job without fetching.
+
+        A snapshot whose refresh is overdue is still returned immediately
+        while the job runs in the background (stale-while-revalidate), unless
+        it has been overdue for more than `max_stale` seconds.
+
+        Args:
+            key: Registered job name
+            wait: Seconds to wait for the job's next run if it hasn't
+                produced a value yet or its value is too stale (None returns
+                immediately)
+            max_stale: Seconds a refresh may be overdue before readers wait
+
+        Returns:
+            Snapshot: Latest value, fetch time and error for the job
+        """
+        job = self._jobs[key]
+        job.last_read = time.time()
+        started = job.runs
+
+        # A job that went idle is refreshed as soon as someone reads it again
+        if job.runs and job.next_run <= job.last_read and not job.running:
+            self._wake.set()
+
+        too_stale = job.runs == 0 or job.last_read - job.next_run > max_stale
+        if wait and too_stale:
+            deadline = time.time() + wait
+            with job.done:
+                while job.runs == started and time.time() < deadline:
+                    job.done.wait(deadline - time.time())
+        return job.snapshot
+
+    def refresh(self, keys=None, wait=None):
+        """
+        Schedules jobs to run now.
+
+        Args:
+            keys: Job names to refresh (None for all)
+            wait: Seconds to wait for those runs to finish (None returns immediately)
+        """
+        with self._lock:
+            jobs = [self._jobs[key] for key in (keys or list(self._jobs)) if key in self._jobs]
+        started = {job.key: job.runs for job in jobs}
+        for job in jobs:
+            job.next_run = 0.0
+        self._wake.set()
+
+        if wait:
+            deadline = time.time() + wait
+            for job in jobs:
+                with job.done:
+                    while job.runs == started[job.key] and time.time() < deadline:
+                        job.done.wait(deadline - time.time())
+
+    def snapshots(self):
+        """Returns {key: Snapshot} for every registered job."""
+        with self._lock:
+            return {key: job.snapshot for key, job in self._jobs.items()}
+
+    def stop(self):
+        """Stops the dispatcher thread and worker pool."""
+        self._stopped.set()
+        self._wake.set()
+        self._pool.shutdown(wait=False)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            now = time.time()
+            next_due = now + 60
+            with self._lock:
+                jobs = list(self._jobs.values())
+
+            for job in jobs:
+                if job.running:
+                    continue
+                idle = now - job.last_read > job.interval * IDLE_INTERVALS
+                if job.next_run <= now and not (idle and job.runs):
+                    job.running = True
+                    self._pool.submit(self._execute, job)
+                elif not idle:
+                    next_due = min(next_due, job.next_run)
+
+            self._wake.wait(max(0.0, next_due - time.time()))
+            self._wake.clear()
+
+    def _execute(self, job):
+        started = time.time()
+        next_run = started + job.interval
+        try:
+            value = job.func(*job.args)
+            job.snapshot = Snapshot(value=value, updated_at=time.time())
+            next_run = next_refresh_at(job.session, job.snapshot.updated_at, job.interval)
+            logger.debug(f"Refreshed {job.key} in {time.time() - started:.2f}s")
+        except Exception as e:
+            job.snapshot = Snapshot(value=job.snapshot.value, updated_at=job.snapshot.updated_at, error=str(e))
+            logger.warning(f"Scheduled refresh of {job.key} failed: {e}")
+        finally:
+            job.next_run = next_run
+            job.running = False
+            with job.done:
+                job.runs += 1
+                job.done.notify_all()
+            self._wake.set()
+
+
+@st.cache_resource(show_spinner=False)
+def get_refresh_scheduler():
+    """Returns the process-wide RefreshScheduler (one per Streamlit server)."""
+    return RefreshScheduler()
@@ -0,0 +1,209 @@
+"""
+Last-known-good snapshots for data fetchers.
+Every successful fetch is persisted to disk; when the provider errors, rate
+limits or returns nothing, the fetcher serves the last good value instead,
+marked stale with the time it was fetched. After a failure the provider is
+left alone for SNAPSHOT_RETRY_AFTER seconds, so an outage doesn't turn
+every rerun into another round of doomed requests.
+"""
+
+import functools
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+
+from config.settings import DATA_DIR, SNAPSHOT_RETRY_AFTER
+from data.cache import is_empty, pack_entry, unpack_entry
+from utils.fileio import atomic_write
+from utils.logger import logger
+from utils.metrics import SNAPSHOT_FALLBACKS, metrics
+
+
+def mark_stale(value, as_of):
+    """
+    Marks a snapshot value as stale, recording when it was fetched.
+
+    DataFrames get attrs["stale"] and attrs["as_of"]; quote dicts (with a
+    "symbol" key) get "stale" and "as_of" keys; mappings of such records
+    (e.g. sector performance) have each record marked.
+
+    Args:
+        value: Value loaded from a snapshot
+        as_of: Epoch seconds the value was fetched
+
+    Returns:
+        The marked value
+    """
+    if isinstance(value, pd.DataFrame):
+        value.attrs.update(stale=True, as_of=as_of)
+    elif isinstance(value, dict) and "symbol" in value:
+        value.update(stale=True, as_of=as_of)
+    elif isinstance(value, dict):
+        for record in value.values():
+            if isinstance(record, dict):
+                record.update(stale=True, as_of=as_of)
+    return value
+
+
+class SnapshotStore:
+    """
+    One file per (namespace, key) holding the last good value and its fetch time.
+
+    Values use the shared cache's encoding (Arrow IPC for DataFrames), and a
+    crash mid-save keeps the previous snapshot.
+    """
+
+    def __init__(self, root=None, retry_after=SNAPSHOT_RETRY_AFTER):
+        self.root = root or os.path.join(DATA_DIR, "snapshots")
+        self.retry_after = retry_after
+        self._failed_at = {}
+        self._lock = threading.Lock()
+
+    def _path(self, namespace, key):
+        return os.path.join(self.root, namespace, quote(str(key), safe="") + ".bin")
+
+    def save(self, namespace, key, value):
+        """Persists a good value (failures are logged, not raised)."""
+        try:
+            atomic_write(self._path(namespace, key), pack_entry(value, time.time()))
+        except Exception as e:
+            logger.warning(f"Could not save {namespace} snapshot for {key}: {e}")
+
+    def load(self, namespace, key):
+        """
+        Loads the last good value for a key.
+
+        Returns:
+            CacheEntry: value and fetch time, or None if there is no snapshot
+        """
+        path = self._path(namespace, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return unpack_entry(f.read())
+        except Exception as e:
+            logger.warning(f"Could not read {namespace} snapshot for {key}: {e}")
+            return None
+
+    def load_stale(self, namespace, key):
+        """Loads the last good value marked stale, or None if there is no snapshot."""
+        entry = self.load(namespace, key)
+        return mark_stale(entry.value, entry.stored_at) if entry is not None else None
+
+    def record_failure(self, call):
+        with self._lock:
+            self._failed_at[call] = time.time()
+
+    def record_success(self, call):
+        with self._lock:
+            self._failed_at.pop(call, None)
+
+    def cooling_down(self, call):
+        """True if `call` failed less than retry_after seconds ago."""
+        with self._lock:
+            return time.time() - self._failed_at.get(call, 0) < self.retry_after
+
+
+# Default store shared by the fetchers
+snapshot_store = SnapshotStore()
+
+
+def _joined_arguments(*args, **kwargs):
+    return "-".join(str(value) for value in (*args, *kwargs.values())) or "default"
+
+
+def last_known_good(namespace, key=_joined_arguments, per_symbol=False):
+    """
+    Falls back to the last good result of a fetcher when the provider fails.
+
+    A result counts as failed if the fetcher raises or returns None or an
+    empty DataFrame/dict. Good results are saved to `snapshot_store`;
+    failed calls return the saved value marked stale (see mark_stale), and
+    for SNAPSHOT_RETRY_AFTER seconds after a failure, calls with a snapshot
+    to serve skip the provider entirely.
+
+    Args:
+        namespace: Snapshot namespace (directory under DATA_DIR/snapshots)
+        key: Callable mapping the call arguments to the snapshot key
+            (default: the arguments joined with "-")
+        per_symbol: The fetcher takes a list of symbols first and returns
+            {symbol: record}; snapshots are kept per symbol and symbols
+            missing from a result are filled in from their own snapshots
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if per_symbol:
+                return _call_per_symbol(func, namespace, args, kwargs)
+
+            snapshot_key = key(*args, **kwargs)
+            call = (namespace, snapshot_key)
+            if snapshot_store.cooling_down(call):
+                stale = snapshot_store.load_stale(namespace, snapshot_key)
+                if stale is not None:
+                    metrics.inc(SNAPSHOT_FALLBACKS, namespace=namespace)
+                    return stale
+
+            try:
+                value = func(*args, **kwargs)
+                error = None
+            except Exception as e:
+                value, error = None, e
+
+            if not is_empty(value):
+                snapshot_store.record_success(call)
+                snapshot_store.save(namespace, snapshot_key, value)
+                return value
+
+            snapshot_store.record_failure(call)
+            stale = snapshot_store.load_stale(namespace, snapshot_key)
+            if stale is not None:
+                metrics.inc(SNAPSHOT_FALLBACKS, namespace=namespace)
+                logger.warning(f"Serving last known good {namespace} for {snapshot_key}: "
+                               f"{error or 'provider returned no data'}")
+                return stale
+            if error is not None:
+                raise error
+            return value
+        return wrapper
+    return decorator
+
+
+def _call_per_symbol(func, namespace, args, kwargs):
+    symbols = list(dict.fromkeys(args[0]))
+    call = (namespace, tuple(symbols))
+
+    results = {}
+    if not snapshot_store.cooling_down(call):
+        try:
+            results = func(symbols, *args[1:], **kwargs) or {}
+        except Exception as e:
+            logger.warning(f"{namespace} fetch failed, serving last known good: {e}")
+
+    for symbol in symbols:
+        if symbol in results:
+            snapshot_store.save(namespace, symbol, results[symbol])
+
+    missing = [symbol for symbol in symbols if symbol not in results]
+    if len(missing) == len(symbols):
+        snapshot_store.record_failure(call)
+    else:
+        snapshot_store.record_success(call)
+
+    served = 0
+    for symbol in missing:
+        stale = snapshot_store.load_stale(namespace, symbol)
+        if stale is not None:
+            results[symbol] = stale
+            served += 1
+    if served:
+        metrics.inc(SNAPSHOT_FALLBACKS, served, namespace=namespace)
+        logger.warning(f"Serving last known good {namespace} for {served}/{len(symbols)} symbols")
+    return results
@@ -0,0 +1,137 @@
+"""
+Index universe definitions.
+Constituent lists are read from local CSV files: a refreshed copy under
+DATA_DIR/universes if one exists, otherwise the snapshot bundled in
+config/universes. refresh_universe() pulls the current list from the
+index provider's published file.
+"""
+
+import io
+import os
+import time
+
+import pandas as pd
+import requests
+
+from config.settings import DATA_DIR, UNIVERSE_REFRESH_INTERVAL
+from utils.fileio import atomic_write
+from utils.logger import logger
+
+
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "universes")
+NSE_ARCHIVES = "https://archives.nseindia.com/content/indices/"
+
+# source: published constituent CSV; columns maps its headers onto ours;
+# suffix is appended to turn exchange symbols into Yahoo Finance symbols
+UNIVERSES = {
+    "NIFTY50": {
+        "name": "NIFTY 50",
+        "source": NSE_ARCHIVES + "ind_nifty50list.csv",
+        "columns": {"Symbol": "Symbol", "Company Name": "Name", "Industry": "Sector"},
+        "suffix": ".NS"
+    },
+    "NIFTY500": {
+        "name": "NIFTY 500",
+        "source": NSE_ARCHIVES + "ind_nifty500list.csv",
+        "columns": {"Symbol": "Symbol", "Company Name": "Name", "Industry": "Sector"},
+        "suffix": ".NS"
+    },
+    "SP500": {
+        "name": "S&P 500",
+        "source": "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv",
+        "columns": {"Symbol": "Symbol", "Security": "Name", "GICS Sector": "Sector",
+                    "GICS Sub-Industry": "Industry"},
+        "suffix": ""
+    }
+}
+
+UNIVERSE_COLUMNS = ["Symbol", "Name", "Sector", "Industry"]
+
+# Failed refreshes are not retried for an hour, so an unreachable provider
+# doesn't add a timeout to every load
+_RETRY_AFTER = 3600
+_failed_at = {}
+
+# Seconds to wait on the provider (NSE archives can hang non-browser clients)
+_DOWNLOAD_TIMEOUT = 15
+
+
+def _local_path(universe_id):
+    return os.path.join(DATA_DIR, "universes", f"{universe_id.lower()}.csv")
+
+
+def _normalize(frame):
+    for column in UNIVERSE_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = ""
+    frame = frame[UNIVERSE_COLUMNS].fillna("")
+    frame = frame[frame["Symbol"].astype(str).str.len() > 0]
+    return frame.drop_duplicates("Symbol").reset_index(drop=True)
+
+
+def refresh_universe(universe_id):
+    """
+    Downloads the current constituent list for a universe and saves it locally.
+
+    Args:
+        universe_id: Key of UNIVERSES (e.g., "SP500", "NIFTY500")
+
+    Returns:
+        pd.DataFrame: Constituents with columns [Symbol, Name, Sector, Industry]
+
+    Raises:
+        requests.RequestException: If the download fails or times out
+    """
+    config = UNIVERSES[universe_id]
+    response = requests.get(config["source"], headers={"User-Agent": "Mozilla/5.0"}, timeout=_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    raw = pd.read_csv(io.StringIO(response.text))
+    raw.columns = raw.columns.str.strip()
+    frame = raw[list(config["columns"])].rename(columns=config["columns"])
+
+    # Yahoo Finance uses '-' for share classes (BRK.B -> BRK-B)
+    frame["Symbol"] = frame["Symbol"].astype(str).str.strip().str.replace(".", "-", regex=False) + config["suffix"]
+    frame = _normalize(frame)
+
+    path = _local_path(universe_id)
+    atomic_write(path, frame.to_csv(index=False))
+
+    logger.info(f"Refreshed {config['name']} universe: {len(frame)} constituents")
+    return frame
+
+
+def load_universe(universe_id):
+    """
+    Loads the constituent list for a universe.
+
+    Uses the locally refreshed copy, re-downloading it once it is older than
+    UNIVERSE_REFRESH_INTERVAL; falls back to the bundled snapshot when the
+    provider can't be reached.
+
+    Args:
+        universe_id: Key of UNIVERSES (e.g., "SP500", "NIFTY500")
+
+    Returns:
+        pd.DataFrame: Constituents with columns [Symbol, Name, Sector, Industry]
+        (empty if no list is available)
+    """
+    if universe_id not in UNIVERSES:
+        raise KeyError(f"Unknown universe: {universe_id}")
+
+    path = _local_path(universe_id)
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < UNIVERSE_REFRESH_INTERVAL:
+        return _normalize(pd.read_csv(path))
+
+    if time.time() - _failed_at.get(universe_id, 0) >= _RETRY_AFTER:
+        try:
+            return refresh_universe(universe_id)
+        except Exception as e:
+            _failed_at[universe_id] = time.time()
+            logger.warning(f"Could not refresh {universe_id} universe: {e}")
+
+    for fallback in (path, os.path.join(BUNDLED_DIR, f"{universe_id.lower()}.csv")):
+        if os.path.exists(fallback):
+            return _normalize(pd.read_csv(fallback))
+
+    logger.error(f"No constituent list available for {universe_id}")
+    return pd.DataFrame(columns=UNIVERSE_COLUMNS)
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-import yfinance as yf
 from datetime import datetime, timedelta
 import time
 import os
@@ -26,18 +25,35 @@ st.set_page_config(
 
 
 # Import components and data fetchers
-from data.fetchers.market_data import fetch_market_data, get_market_status, fetch_nifty_50_data
-from data.fetchers.multi_market_data import fetch_index_constituents, fetch_market_index_history, get_market_vix_data
-from config.constants import INDICES, TIMEFRAMES
+from data.fetchers.market_data import fetch_market_data_batch, get_market_status, fetch_nifty_50_data
+from data.fetchers.multi_market_data import (
+    fetch_index_constituents, fetch_market_index_history, get_market_vix_data, fetch_sector_performance
+)
+from data.scheduler import get_refresh_scheduler
+from data.async_fetch import fetch_page_data
+from data.analytics_store import analytics_store
+from data.cache import cached, invalidate
+from data.refresh_policy import session_for_symbol
+from config.settings import (
+    QUOTES_REFRESH_INTERVAL, CONSTITUENTS_REFRESH_INTERVAL, SECTORS_REFRESH_INTERVAL, LIVE_PANELS_REFRESH_INTERVAL
+)
+from config.constants import INDICES, ALL_MARKETS, TIMEFRAMES
 from config.markets import MARKETS, get_market_config
 from components.market_card import render_market_card
 from components.heatmap import render_heatmap
 from components.risk_meter import render_risk_meter
 from utils.market_time import MarketSchedule
+from utils.seasonality import compute_seasonality, MONTH_ORDER, WEEKDAYS
+from utils.history_analytics import compute_history_analytics
 from utils.theme import load_premium_theme
 from utils.auto_refresh import setup_auto_refresh, render_refresh_controls, get_last_refresh_time
 from utils.error_handler import safe_data_fetch, handle_empty_data, ErrorBoundary
-from utils.ui import render_sidebar_header, render_sidebar_navigation
+from utils.ui import render_sidebar_header, render_sidebar_navigation, render_performance_metrics, lazy_tabs
+from utils.metrics import start_exporters
+from utils.profiler import profile_mode, profile_section, profile_mark, start_profile, stop_profile
+
+# Opt-in render profiling: MARKETPULSE_PROFILE enables it; ?profile=timing|cprofile|pyinstrument|off then picks the mode
+start_profile(profile_mode(st.query_params.get("profile")))
 
 # Load Premium White Theme
 try:
@@ -55,11 +71,8 @@ with st.sidebar:
     
     st.markdown("### ⚙️ Settings")
 
-    # Auto-refresh controls
-    should_refresh = render_refresh_controls()
-    if should_refresh:
-        st.cache_data.clear()
-        st.rerun()
+    # Auto-refresh controls (reruns the page; data is refreshed in the background)
+    render_refresh_controls()
 
     st.markdown("---")
 
@@ -68,8 +81,13 @@ with st.sidebar:
     if 'last_refresh' in st.session_state:
         st.caption(f"Last refresh: {get_last_refresh_time()}")
 
-    # Cache info
-    st.caption("💾 Data caching enabled")
+    # Background snapshot ages
+    for key, snapshot in get_refresh_scheduler().snapshots().items():
+        if snapshot.age is not None:
+            st.caption(f"💾 {key}: {int(snapshot.age)}s old" + (" ⚠️" if snapshot.error else ""))
+
+    # Filled in at the end of the run so it includes this run's fetches
+    performance_panel = st.container()
 
     st.markdown("---")
     
@@ -87,49 +105,109 @@ with st.sidebar:
     st.caption("Real-time market intelligence.")
     st.caption("Version 1.0")
 
-# Cached data fetching functions for performance
-@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
-@safe_data_fetch(fallback_value={}, error_message="Failed to fetch market data", show_error=False)
-def fetch_market_data_cached(symbol):
-    """Cached version of fetch_market_data with error handling."""
-    return fetch_market_data(symbol)
-
-@st.cache_data(ttl=300, show_spinner=False)
-@safe_data_fetch(fallback_value=pd.DataFrame(), error_message="Failed to fetch index constituents", show_error=False)
-def fetch_index_constituents_cached(market_id, limit=None):
-    """Cached version of fetch_index_constituents with error handling."""
-    return fetch_index_constituents(market_id, limit)
+# Quotes, constituents and sector data are refreshed by the background
+# scheduler; reruns only read its latest snapshot
+def read_scheduled(key, func, *args, interval, fallback, session=None, wait=60):
+    """
+    Registers a background refresh job and returns its latest value.
+
+    Only the first read of a job, or a read of a snapshot past
+    MAX_STALENESS, waits (up to `wait` seconds) for data; otherwise the
+    latest snapshot is served while it refreshes. Jobs with a `session`
+    refresh only while that market is open (plus one settlement refresh
+    after the close). DataFrames carry the fetch time in attrs["as_of"].
+    """
+    scheduler = get_refresh_scheduler()
+    scheduler.register(key, func, *args, interval=interval, session=session)
+    snapshot = scheduler.read(key, wait=wait)
+    if snapshot.value is None:
+        return fallback
+    if isinstance(snapshot.value, pd.DataFrame):
+        value = snapshot.value.copy(deep=False)
+        # Last-known-good fallbacks keep their own (older) fetch time
+        value.attrs.setdefault("as_of", snapshot.updated_at)
+        return value
+    return snapshot.value
+
+def read_overview_quotes():
+    """Overview quotes for every market card, one batch download per trading session."""
+    by_session = {}
+    for symbol in ALL_MARKETS.values():
+        by_session.setdefault(session_for_symbol(symbol), []).append(symbol)
+
+    # Register every session's job before reading so first downloads run in parallel
+    scheduler = get_refresh_scheduler()
+    keys = []
+    for session, symbols in by_session.items():
+        keys.append(f"quotes:{session or 'other'}")
+        scheduler.register(keys[-1], fetch_market_data_batch, symbols,
+                           interval=QUOTES_REFRESH_INTERVAL, session=session)
+
+    # Each quote carries its batch's fetch time so cards can show their age
+    quotes = {}
+    for key in keys:
+        snapshot = scheduler.read(key, wait=60)
+        for symbol, quote in (snapshot.value or {}).items():
+            quotes[symbol] = {"as_of": snapshot.updated_at, **quote}
+    return quotes
+
+def read_index_constituents(market_id, universe_id=None):
+    """Constituent table for a market's breadth and heatmap views."""
+    return read_scheduled(f"constituents:{universe_id or market_id}", fetch_index_constituents,
+                          market_id, None, universe_id,
+                          interval=CONSTITUENTS_REFRESH_INTERVAL, fallback=pd.DataFrame(),
+                          session=get_market_config(market_id)["session"])
+
+def read_sector_performance(market_id):
+    """Sector ETF/index performance for a market."""
+    return read_scheduled(f"sectors:{market_id}", fetch_sector_performance, market_id,
+                          interval=SECTORS_REFRESH_INTERVAL, fallback={},
+                          session=get_market_config(market_id)["session"])
+
+# History fetchers are cached per symbol in the "history" namespace of
+# data.cache, so a view can refresh one symbol without a global clear
 
-@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes (less volatile)
 @safe_data_fetch(fallback_value=pd.DataFrame(), error_message="Failed to fetch historical data", show_error=False)
 def fetch_market_index_history_cached(market_id, period_years=5):
     """Cached version of fetch_market_index_history with error handling."""
     return fetch_market_index_history(market_id, period_years)
 
-@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
 @safe_data_fetch(fallback_value=pd.DataFrame(), error_message="Failed to fetch symbol data", show_error=False)
 def fetch_symbol_history_cached(symbol, period_years=5):
     """Cached version of fetch_symbol_history for any symbol (index or sector)."""
     from data.fetchers.multi_market_data import fetch_symbol_history
     return fetch_symbol_history(symbol, period_years)
 
-@st.cache_data(ttl=600, show_spinner=False)
+# Analytics come from the precompute job's store (python -m data.precompute)
+# when it has run since the last close, and are computed live otherwise
+
+@cached("seasonality", ttl=600)
+def compute_seasonality_cached(symbol, period_years=10):
+    """Seasonality tables for a symbol, cached so drill-down views reuse one computation."""
+    precomputed = analytics_store.read("seasonality", symbol, period_years)
+    if precomputed is not None:
+        return precomputed
+    return compute_seasonality(fetch_symbol_history_cached(symbol, period_years))
+
+@cached("history_analytics", ttl=600)
+def compute_history_analytics_cached(market_id, period_years=5):
+    """Moving averages, A/D indicators and performance summary for a market's main index."""
+    symbol = get_market_config(market_id)['main_index']['symbol']
+    precomputed = analytics_store.read("history", symbol, period_years)
+    if precomputed is not None:
+        return precomputed
+    return compute_history_analytics(fetch_market_index_history_cached(market_id, period_years))
+
 @safe_data_fetch(fallback_value=pd.DataFrame(), error_message="Failed to fetch VIX data", show_error=False)
 def get_market_vix_data_cached(market_id, period_years=5):
     """Cached version of get_market_vix_data with error handling."""
     return get_market_vix_data(market_id, period_years)
 
-@st.cache_data(ttl=300, show_spinner=False)
-@safe_data_fetch(fallback_value={}, error_message="Failed to fetch sector performance", show_error=False)
-def fetch_sector_performance_cached(market_id):
-    """Cached version of fetch_sector_performance with error handling."""
-    from data.fetchers.multi_market_data import fetch_sector_performance
-    return fetch_sector_performance(market_id)
 
 # Page Title and Header (Ultra-Compact)
 logo_path = os.path.join(project_root, "assets", "greenchips_logo.jpeg")
 col_header, col_notify = st.columns([10, 1])
-with col_header:
+with col_header, profile_section("Header"):
     # Function to load image as base64
     def get_img_as_base64(file_path):
         import base64
@@ -157,50 +235,132 @@ with col_notify:
     if st.button("🕒", help="Market Timings (IST)"):
         st.session_state['show_timings'] = not st.session_state.get('show_timings', False)
 
-# Market Schedule Logic
-schedule = MarketSchedule()
-timings = schedule.get_market_timings()
+# Live panels (market timings, risk meter, quote cards) are fragments that
+# rerun on their own every LIVE_PANELS_REFRESH_INTERVAL seconds, redrawing
+# just themselves from the latest snapshots instead of rerunning the page
+
+@st.fragment(run_every=LIVE_PANELS_REFRESH_INTERVAL)
+def render_market_timings():
+    """Global market status and hours table."""
+    timing_data = pd.DataFrame(MarketSchedule().get_market_timings())
+
+    # Style the dataframe
+    def color_status(val):
+        color = 'red'
+        if val == 'Open': color = 'green'
+        elif val == 'Pre-Market': color = 'orange'
+        return f'color: {color}; font-weight: bold'
+
+    st.dataframe(
+        timing_data[['Market', 'Status', 'Open (IST)', 'Close (IST)', 'Local Time']].style.applymap(color_status, subset=['Status']),
+        hide_index=True,
+        use_container_width=True
+    )
+
+@st.fragment(run_every=LIVE_PANELS_REFRESH_INTERVAL)
+def render_market_status_strip():
+    """Open/closed status of the headline markets."""
+    status_html_parts = []
+    for item in MarketSchedule().get_market_timings():
+        if item['Market'] in ["India (NSE)", "USA (NYSE)", "Gold (CME)"]:
+            icon = "🟢" if item['Status'] == "Open" else "🔴"
+            if item['Status'] in ["Pre-Market", "Break"]: icon = "🟠"
+            status_html_parts.append(f"{icon} {item['Market']}: {item['Status']}")
+
+    status_html = " &nbsp;|&nbsp; ".join(status_html_parts)
+    st.markdown(f"<small>{status_html}</small>", unsafe_allow_html=True)
+
+@st.fragment(run_every=LIVE_PANELS_REFRESH_INTERVAL)
+def render_command_center():
+    """Risk-On/Risk-Off meter over the key markets' quotes."""
+    # Fetch every overview quote (command center + all tabs), one batch per trading session
+    with st.spinner("Fetching market quotes..."), profile_section("Overview Quotes"):
+        overview_quotes = read_overview_quotes()
+
+    # Fetch key markets for risk calculation
+    with st.spinner("Calculating..."):
+        risk_markets = {}
+        key_symbols = ['^GSPC', '^NSEI', '^VIX', 'BTC-USD', 'GC=F', 'DX-Y.NYB', '^FTSE', '^N225']
+
+        for symbol in key_symbols:
+            data = overview_quotes.get(symbol)
+            if data:
+                risk_markets[symbol] = data
+
+        # Render the Risk-On/Risk-Off meter
+        if risk_markets:
+            render_risk_meter(risk_markets)
+        else:
+            st.warning("Unable to calculate market regime.")
+
+# Helper to render markets in a compact grid (2 columns for cleaner layout)
+def render_compact_group(title, markets_dict, quotes):
+    """Render markets in a 2-column grid for compact display, using pre-fetched quotes"""
+    market_items = list(markets_dict.items())
+
+    # Create 2-column layout for markets
+    for i in range(0, len(market_items), 2):
+        cols = st.columns(2)
+
+        # First column
+        if i < len(market_items):
+            name, symbol = market_items[i]
+            with cols[0]:
+                data = quotes.get(symbol)
+                if data:
+                    render_market_card({**data, 'name': name})
+                else:
+                    st.error(f"{name}")
+
+        # Second column
+        if i + 1 < len(market_items):
+            name, symbol = market_items[i + 1]
+            with cols[1]:
+                data = quotes.get(symbol)
+                if data:
+                    render_market_card({**data, 'name': name})
+                else:
+                    st.error(f"{name}")
+
+@st.fragment(run_every=LIVE_PANELS_REFRESH_INTERVAL)
+def render_market_overview():
+    """Quote cards for the selected asset class tab."""
+    overview_quotes = read_overview_quotes()
+
+    # 7 tabs for different asset classes; only the selected tab renders its cards
+    overview_groups = {
+        "🇮🇳 India": ("India", "INDIA"),
+        "🇺🇸 US": ("US", "US"),
+        "🇪🇺 Europe": ("Europe", "EUROPE"),
+        "🌏 Asia-Pac": ("Asia-Pacific", "ASIA_PACIFIC"),
+        "🟡 Commod": ("Commodities", "COMMODITIES"),
+        "💱 Forex": ("Forex", "FOREX"),
+        "₿ Crypto": ("Crypto", "CRYPTO")
+    }
+    overview_tabs = lazy_tabs(list(overview_groups), key="overview_tab")
+
+    for tab, (title, group) in zip(overview_tabs, overview_groups.values()):
+        if tab.open:
+            with tab:
+                render_compact_group(title, INDICES[group], overview_quotes)
 
 # Show Timings Dialog/Expander if toggled
 if st.session_state.get('show_timings', False):
     with st.expander("🌍 Global Market Timings (IST)", expanded=True):
         st.markdown("### Market Status & Hours")
-        
-        # Create a clean table
-        timing_data = pd.DataFrame(timings)
-        
-        # Style the dataframe
-        def color_status(val):
-            color = 'red'
-            if val == 'Open': color = 'green'
-            elif val == 'Pre-Market': color = 'orange'
-            return f'color: {color}; font-weight: bold'
-
-        st.dataframe(
-            timing_data[['Market', 'Status', 'Open (IST)', 'Close (IST)', 'Local Time']].style.applymap(color_status, subset=['Status']),
-            hide_index=True,
-            use_container_width=True
-        )
+        render_market_timings()
 
 # Top Bar: Status & Refresh (Compact)
 col1, col2 = st.columns([4, 1])
 with col1:
     # Quick Status Strip
-    status_html_parts = []
-    for item in timings:
-        if item['Market'] in ["India (NSE)", "USA (NYSE)", "Gold (CME)"]:
-            icon = "🟢" if item['Status'] == "Open" else "🔴"
-            if item['Status'] in ["Pre-Market", "Break"]: icon = "🟠"
-            status_html_parts.append(f"{icon} {item['Market']}: {item['Status']}")
-
-    status_html = " &nbsp;|&nbsp; ".join(status_html_parts)
-    st.markdown(f"<small>{status_html}</small>", unsafe_allow_html=True)
+    render_market_status_strip()
 
 with col2:
     col_btn, col_time = st.columns([1, 2])
     with col_btn:
         if st.button("🔄", help="Refresh Data"):
-            st.cache_data.clear()
+            get_refresh_scheduler().refresh(wait=15)
             st.session_state.last_refresh = datetime.now()
             st.rerun()
     with col_time:
@@ -210,101 +370,14 @@ with col2:
 main_col1, main_col2 = st.columns([1, 2.5])  # 1:2.5 ratio (left narrower, right wider)
 
 # LEFT COLUMN: Market Command Center (Risk-On/Risk-Off Meter)
-with main_col1:
+with main_col1, profile_section("Command Center"):
     st.markdown("<p style='font-size: 0.85rem; font-weight: 700; margin: 0; color: #6c757d;'>📊 MARKET COMMAND CENTER</p>", unsafe_allow_html=True)
-
-    # Fetch key markets for risk calculation
-    with st.spinner("Calculating..."):
-        risk_markets = {}
-        key_symbols = ['^GSPC', '^NSEI', '^VIX', 'BTC-USD', 'GC=F', 'DX-Y.NYB', '^FTSE', '^N225']
-
-        for symbol in key_symbols:
-            try:
-                data = fetch_market_data_cached(symbol)
-                if data:
-                    risk_markets[symbol] = data
-            except Exception as e:
-                continue
-
-        # Render the Risk-On/Risk-Off meter
-        if risk_markets:
-            render_risk_meter(risk_markets)
-        else:
-            st.warning("Unable to calculate market regime.")
+    render_command_center()
 
 # RIGHT COLUMN: Market Overview (Tabbed - Ultra-Compact)
-with main_col2:
+with main_col2, profile_section("Market Overview"):
     st.markdown("<p style='font-size: 0.85rem; font-weight: 700; margin: 0; color: #6c757d;'>📈 MARKET OVERVIEW</p>", unsafe_allow_html=True)
-
-    # Helper to render markets in a compact grid (2 columns for cleaner layout)
-    def render_compact_group(title, markets_dict):
-        """Render markets in a 2-column grid for compact display"""
-        market_items = list(markets_dict.items())
-
-        # Create 2-column layout for markets
-        for i in range(0, len(market_items), 2):
-            cols = st.columns(2)
-
-            # First column
-            if i < len(market_items):
-                name, symbol = market_items[i]
-                with cols[0]:
-                    data = fetch_market_data_cached(symbol)
-                    if data:
-                        data['name'] = name
-                        render_market_card(data)
-                    else:
-                        st.error(f"{name}")
-
-            # Second column
-            if i + 1 < len(market_items):
-                name, symbol = market_items[i + 1]
-                with cols[1]:
-                    data = fetch_market_data_cached(symbol)
-                    if data:
-                        data['name'] = name
-                        render_market_card(data)
-                    else:
-                        st.error(f"{name}")
-
-    # Create 7 tabs for different asset classes
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-        "🇮🇳 India",
-        "🇺🇸 US",
-        "🇪🇺 Europe",
-        "🌏 Asia-Pac",
-        "🟡 Commod",
-        "💱 Forex",
-        "₿ Crypto"
-    ])
-
-    # Tab 1: India Markets
-    with tab1:
-        render_compact_group("India", INDICES["INDIA"])
-
-    # Tab 2: US Markets
-    with tab2:
-        render_compact_group("US", INDICES["US"])
-
-    # Tab 3: European Markets
-    with tab3:
-        render_compact_group("Europe", INDICES["EUROPE"])
-
-    # Tab 4: Asia-Pacific Markets
-    with tab4:
-        render_compact_group("Asia-Pacific", INDICES["ASIA_PACIFIC"])
-
-    # Tab 5: Commodities
-    with tab5:
-        render_compact_group("Commodities", INDICES["COMMODITIES"])
-
-    # Tab 6: Forex
-    with tab6:
-        render_compact_group("Forex", INDICES["FOREX"])
-
-    # Tab 7: Crypto
-    with tab7:
-        render_compact_group("Crypto", INDICES["CRYPTO"])
+    render_market_overview()
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -314,7 +387,7 @@ st.markdown("### 🌍 Select Market for Deep Analysis")
 
 col_selector, col_info = st.columns([3, 7])
 
-with col_selector:
+with col_selector, profile_section("Market Selector"):
     selected_market = st.selectbox(
         "Choose market to analyze",
         options=list(MARKETS.keys()),
@@ -324,28 +397,41 @@ with col_selector:
     # Get market configuration
     market_config = get_market_config(selected_market)
 
+    # Constituent universe for breadth and heatmap
+    universes = market_config.get('universes', {})
+    if len(universes) > 1:
+        universe_name = st.selectbox(
+            "Constituents",
+            options=list(universes.keys()),
+            key=f"universe_selector_{selected_market}"
+        )
+    else:
+        universe_name = next(iter(universes), market_config['main_index']['name'])
+
 with col_info:
     st.info(f"📊 You're now analyzing **{market_config['main_index']['name']}** with {market_config['main_index']['constituents_count']} constituents. Currency: {market_config['currency']}")
 
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Fetch index data for selected market
 index_name = market_config['main_index']['name']
-with st.spinner(f"Fetching {index_name} data..."):
-    index_data = fetch_index_constituents_cached(selected_market, limit=100 if selected_market == "USA" else None)
-
-# Validate data
-if not handle_empty_data(index_data, data_name=f"{index_name} data", show_warning=False):
-    st.warning(f"⚠️ {index_name} data is currently unavailable. Please try refreshing.")
 
 # Dynamic Analysis Section Title
 st.markdown(f"#### 📈 {index_name} Analysis")
 
-tab1, tab2, tab3 = st.tabs(["📅 Seasonality", "📊 Market Breadth", "📈 Historical Analysis"])
+# Only the selected analysis tab fetches and computes
+tab1, tab2, tab3 = lazy_tabs(["📅 Seasonality", "📊 Market Breadth", "📈 Historical Analysis"], key="analysis_tab")
 
 # Tab 2: Market Breadth
-with tab2:
-    with ErrorBoundary("Market Breadth"):
+if tab2.open:
+    with tab2, ErrorBoundary("Market Breadth"):
+        # Constituent data for breadth and heatmap
+        with st.spinner(f"Fetching {universe_name} data..."), profile_section("Constituents"):
+            index_data = read_index_constituents(selected_market, universe_id=universes.get(universe_name))
+
+        if not handle_empty_data(index_data, data_name=f"{universe_name} data", show_warning=False):
+            st.warning(f"⚠️ {universe_name} data is currently unavailable. Please try refreshing.")
+
+        profile_mark("Breadth Indicators")
         st.markdown("##### Market Breadth Indicators")
 
         if not index_data.empty:
@@ -479,6 +565,7 @@ with tab2:
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Heatmap Section
+        profile_mark("Heatmap")
         st.markdown("##### 🔥 Market Heatmap")
 
         if not index_data.empty:
@@ -490,14 +577,16 @@ with tab2:
                 st.error(f"⚠️ Market data is incomplete. Missing: {', '.join(missing_cols)}")
                 st.info("💡 This usually indicates a data fetch issue. Try refreshing the page.")
             else:
-                render_heatmap(index_data, currency=market_config['currency'], index_name=index_name)
+                render_heatmap(index_data, currency=market_config['currency'], index_name=universe_name,
+                               as_of=index_data.attrs.get('as_of'), stale=index_data.attrs.get('stale', False))
         else:
-            st.error(f"❌ Failed to load {index_name} data for heatmap")
+            st.error(f"❌ Failed to load {universe_name} data for heatmap")
             st.info("💡 Possible reasons:\n- Market is currently closed\n- Data provider (Yahoo Finance) is temporarily unavailable\n- Network connectivity issue\n\n**Try:** Refresh the page or check back when the market is open.")
 
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Top Movers (Real Data)
+        profile_mark("Top Movers")
         st.markdown("##### 🚀 Top Movers")
         col_g, col_l = st.columns(2)
 
@@ -527,13 +616,14 @@ with tab2:
             st.info("No data available for Top Movers")
 
         # Sector Analysis Section
+        profile_mark("Sector Rotation")
         st.markdown("---")
         st.markdown("##### 🏭 Sector Rotation & Performance")
         st.caption("Identify leading and lagging sectors for rotation strategies")
 
         # Fetch sector performance data with caching and error handling
         with st.spinner("Fetching sector data..."):
-            sector_data = fetch_sector_performance_cached(selected_market)
+            sector_data = read_sector_performance(selected_market)
 
         if sector_data:
             # Create DataFrame for easier manipulation
@@ -743,8 +833,8 @@ with tab2:
             st.warning("No sector data available for the selected market")
 
 # Tab 3: Historical Analysis
-with tab3:
-    with ErrorBoundary("Historical Analysis"):
+if tab3.open:
+    with tab3, ErrorBoundary("Historical Analysis"):
         st.markdown("##### NIFTY 50 Historical Performance")
 
         # Year selector
@@ -766,14 +856,25 @@ with tab3:
         start_date = end_date - timedelta(days=years * 365)
 
         with st.spinner("Fetching historical data..."):
+            # Index and VIX histories load concurrently; the charts below read them from the cache.
+            # Precomputed analytics already carry the index bars, so only VIX is loaded then
+            profile_mark("History Fetch")
+            index_symbol = market_config['main_index']['symbol']
+            histories = [market_config['vix_symbol']]
+            if analytics_store.read("history", index_symbol, years) is None:
+                histories.insert(0, index_symbol)
+            prefetched = fetch_page_data(histories=histories, period_years=years)
+            if prefetched.errors:
+                st.caption(f"⚠️ Could not load {', '.join(symbol or kind for kind, symbol in prefetched.errors)}; charts may be incomplete")
+
+            profile_mark("Charts")
             try:
-                # Fetch historical data for selected market with ErrorBoundary
-                hist_data = fetch_market_index_history_cached(selected_market, period_years=years)
+                # Bars with moving averages and A/D indicators, plus the performance summary
+                history_analytics = compute_history_analytics_cached(selected_market, period_years=years)
 
-                if not hist_data.empty:
-                    # Calculate moving averages
-                    hist_data['MA20'] = hist_data['Close'].rolling(window=20).mean()
-                    hist_data['MA50'] = hist_data['Close'].rolling(window=50).mean()
+                if history_analytics is not None:
+                    hist_data = history_analytics.bars
+                    performance = history_analytics.summary
 
                     # Create candlestick chart with moving averages
                     fig = go.Figure()
@@ -823,23 +924,6 @@ with tab3:
 
                     st.plotly_chart(fig, use_container_width=True)
 
-                    # Calculate daily A/D values
-                    hist_data['Daily_Change'] = hist_data['Close'] - hist_data['Open']
-                    hist_data['Is_Advancing'] = (hist_data['Daily_Change'] > 0).astype(int)
-                    hist_data['Is_Declining'] = (hist_data['Daily_Change'] < 0).astype(int)
-
-                    # Calculate cumulative A/D Line (Volume-weighted)
-                    hist_data['AD_Value'] = hist_data['Volume'] * np.where(
-                        hist_data['Daily_Change'] > 0, 1,
-                        np.where(hist_data['Daily_Change'] < 0, -1, 0)
-                    )
-                    hist_data['AD_Line'] = hist_data['AD_Value'].cumsum()
-
-                    # Calculate rolling A/D Ratio (20-day window)
-                    hist_data['Advancing_20D'] = hist_data['Is_Advancing'].rolling(window=20).sum()
-                    hist_data['Declining_20D'] = hist_data['Is_Declining'].rolling(window=20).sum()
-                    hist_data['AD_Ratio_20D'] = hist_data['Advancing_20D'] / hist_data['Declining_20D'].replace(0, 1)
-
                     # Normalize A/D Line for better visualization
                     ad_normalized = (hist_data['AD_Line'] - hist_data['AD_Line'].min()) / (hist_data['AD_Line'].max() - hist_data['AD_Line'].min()) * 100
 
@@ -954,14 +1038,13 @@ with tab3:
                     st.markdown("<br>", unsafe_allow_html=True)
                     st.markdown("###### Performance Metrics")
 
-                    start_price = hist_data['Close'].iloc[0]
-                    end_price = hist_data['Close'].iloc[-1]
-                    change = end_price - start_price
-                    change_pct = (change / start_price) * 100
+                    end_price = performance['end_price']
+                    change = performance['change']
+                    change_pct = performance['change_pct']
 
-                    high = hist_data['High'].max()
-                    low = hist_data['Low'].min()
-                    avg_volume = hist_data['Volume'].mean()
+                    high = performance['high']
+                    low = performance['low']
+                    avg_volume = performance['avg_volume']
 
                     col1, col2, col3, col4 = st.columns(4)
 
@@ -997,22 +1080,23 @@ with tab3:
                     st.markdown("<br>", unsafe_allow_html=True)
                     col1, col2, col3 = st.columns(3)
 
-                    total_advancing = hist_data['Is_Advancing'].sum()
-                    total_declining = hist_data['Is_Declining'].sum()
-                    current_ad_ratio = hist_data['AD_Ratio_20D'].iloc[-1] if not pd.isna(hist_data['AD_Ratio_20D'].iloc[-1]) else 0
+                    total_advancing = performance['advancing_days']
+                    total_declining = performance['declining_days']
+                    current_ad_ratio = performance['ad_ratio_20d']
+                    counted_days = max(total_advancing + total_declining, 1)
 
                     with col1:
                         st.metric(
                             "Total Advancing Days",
                             f"{total_advancing}",
-                            delta=f"{total_advancing/(total_advancing+total_declining)*100:.1f}% of days"
+                            delta=f"{total_advancing/counted_days*100:.1f}% of days"
                         )
 
                     with col2:
                         st.metric(
                             "Total Declining Days",
                             f"{total_declining}",
-                            delta=f"{total_declining/(total_advancing+total_declining)*100:.1f}% of days"
+                            delta=f"{total_declining/counted_days*100:.1f}% of days"
                         )
 
                     with col3:
@@ -1030,8 +1114,8 @@ with tab3:
                 st.error(f"Error fetching historical data: {e}")
 
 # Tab 1: Seasonality Analysis
-with tab1:
-    with ErrorBoundary("Seasonality Analysis"):
+if tab1.open:
+    with tab1, ErrorBoundary("Seasonality Analysis"):
         st.markdown("##### 📅 Seasonal Patterns & Trading Edge")
         st.caption("Discover which months historically favor bulls or bears")
 
@@ -1095,44 +1179,21 @@ with tab1:
         # Update session state on button click
         if analyze_clicked:
             st.session_state.season_analyzed = True
-            st.cache_data.clear()  # Clear cache to fetch fresh data
+            # Refresh only the selected symbol's history and seasonality
+            invalidate("history", selected_symbol)
+            invalidate("seasonality", selected_symbol)
 
         # Only run analysis if button was clicked or first load
         if st.session_state.get('season_analyzed', False):
             # Fetch historical data for seasonality
             with st.spinner(f"Calculating seasonal patterns for {selected_display_name}..."):
                 try:
-                    # Use cached fetch for selected symbol (index or sector)
-                    season_data = fetch_symbol_history_cached(selected_symbol, period_years=season_years)
-
-                    if not season_data.empty:
-                        # Calculate monthly returns
-                        season_data['Year'] = season_data.index.year
-                        season_data['Month'] = season_data.index.month
-                        season_data['Month_Name'] = season_data.index.strftime('%b')
-    
-                        # Group by year and month to get monthly returns
-                        monthly_returns = []
-                        for year in season_data['Year'].unique():
-                            for month in range(1, 13):
-                                month_data = season_data[(season_data['Year'] == year) & (season_data['Month'] == month)]
-                                if len(month_data) > 0:
-                                    month_return = ((month_data['Close'].iloc[-1] - month_data['Close'].iloc[0]) / month_data['Close'].iloc[0]) * 100
-                                    monthly_returns.append({
-                                        'Year': year,
-                                        'Month': month,
-                                        'Month_Name': month_data['Month_Name'].iloc[0],
-                                        'Return': month_return
-                                    })
-    
-                        df_monthly = pd.DataFrame(monthly_returns)
-    
-                        # Create pivot table for heatmap
-                        pivot_data = df_monthly.pivot(index='Year', columns='Month_Name', values='Return')
-    
-                        # Reorder columns to calendar order
-                        month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                        pivot_data = pivot_data.reindex(columns=[m for m in month_order if m in pivot_data.columns])
+                    # Cached seasonality tables for selected symbol (index or sector)
+                    seasonality = compute_seasonality_cached(selected_symbol, period_years=season_years)
+
+                    if seasonality is not None:
+                        month_order = MONTH_ORDER
+                        pivot_data = seasonality.monthly_pivot
     
                         # Create layout: Heatmap (70%) and Stats (30%)
                         col_heat, col_stats = st.columns([7, 3])
@@ -1180,25 +1241,7 @@ with tab1:
                             # Month Statistics Table
                             st.markdown("**Month Stats**")
     
-                            month_stats = []
-                            for month_name in month_order:
-                                if month_name in df_monthly['Month_Name'].values:
-                                    month_returns = df_monthly[df_monthly['Month_Name'] == month_name]['Return']
-                                    pos_count = (month_returns > 0).sum()
-                                    neg_count = (month_returns < 0).sum()
-                                    total_count = len(month_returns)
-                                    win_rate = (pos_count / total_count * 100) if total_count > 0 else 0
-                                    avg_return = month_returns.mean()
-    
-                                    month_stats.append({
-                                        'Month': month_name,
-                                        'Pos': pos_count,
-                                        'Neg': neg_count,
-                                        'Win%': win_rate,
-                                        'Avg%': avg_return
-                                    })
-    
-                            df_stats = pd.DataFrame(month_stats)
+                            df_stats = seasonality.month_stats
     
                             # Style the stats table
                             def color_win_rate(val):
@@ -1279,12 +1322,7 @@ with tab1:
                         st.markdown("<br>", unsafe_allow_html=True)
                         st.markdown("##### 📈 Quarterly Performance")
     
-                        df_monthly['Quarter'] = df_monthly['Month'].apply(lambda x: f'Q{(x-1)//3 + 1}')
-                        quarterly_stats = df_monthly.groupby('Quarter').agg({
-                            'Return': ['mean', lambda x: (x > 0).sum() / len(x) * 100]
-                        }).round(2)
-                        quarterly_stats.columns = ['Avg Return %', 'Win Rate %']
-                        quarterly_stats = quarterly_stats.reindex(['Q1', 'Q2', 'Q3', 'Q4'])
+                        quarterly_stats = seasonality.quarterly_stats
     
                         col1, col2, col3, col4 = st.columns(4)
                         quarters = [col1, col2, col3, col4]
@@ -1326,42 +1364,12 @@ with tab1:
     
                             st.markdown(f"**Weekly Performance Analysis - {selected_month}**")
     
-                            # Calculate week-of-month for each date
-                            season_data_copy = season_data.copy()
-                            season_data_copy['Date'] = season_data_copy.index
-                            season_data_copy['Year'] = season_data_copy['Date'].dt.year
-                            season_data_copy['Month'] = season_data_copy['Date'].dt.month
-                            season_data_copy['Month_Name'] = season_data_copy['Date'].dt.strftime('%b')
-                            season_data_copy['Day'] = season_data_copy['Date'].dt.day
+                            month_num = month_order.index(selected_month) + 1
     
-                            # Calculate week of month (1-5)
-                            season_data_copy['Week_of_Month'] = ((season_data_copy['Day'] - 1) // 7) + 1
-                            season_data_copy['Week_of_Month'] = season_data_copy['Week_of_Month'].clip(1, 5)
+                            if seasonality.has_month(month_num):
+                                pivot_weekly = seasonality.weekly_pivot(month_num)
     
-                            # Filter for selected month
-                            month_num = month_order.index(selected_month) + 1
-                            month_data = season_data_copy[season_data_copy['Month'] == month_num].copy()
-    
-                            if len(month_data) > 0:
-                                # Calculate weekly returns
-                                weekly_returns = []
-                                for year in month_data['Year'].unique():
-                                    for week in range(1, 6):
-                                        week_data = month_data[(month_data['Year'] == year) & (month_data['Week_of_Month'] == week)]
-                                        if len(week_data) > 1:
-                                            week_return = ((week_data['Close'].iloc[-1] - week_data['Close'].iloc[0]) / week_data['Close'].iloc[0]) * 100
-                                            weekly_returns.append({
-                                                'Year': year,
-                                                'Week': f'Week {week}',
-                                                'Return': week_return
-                                            })
-    
-                                df_weekly = pd.DataFrame(weekly_returns)
-    
-                                if not df_weekly.empty:
-                                    # Create pivot for heatmap
-                                    pivot_weekly = df_weekly.pivot(index='Year', columns='Week', values='Return')
-                                    pivot_weekly = pivot_weekly.reindex(columns=[f'Week {i}' for i in range(1, 6)])
+                                if not pivot_weekly.empty:
     
                                     # Layout: Heatmap (70%) and Stats (30%)
                                     col_heat_week, col_stats_week = st.columns([7, 3])
@@ -1405,25 +1413,7 @@ with tab1:
                                         # Week statistics
                                         st.markdown("**Week Stats**")
     
-                                        week_stats = []
-                                        for week in [f'Week {i}' for i in range(1, 6)]:
-                                            if week in df_weekly['Week'].values:
-                                                week_returns = df_weekly[df_weekly['Week'] == week]['Return']
-                                                pos = (week_returns > 0).sum()
-                                                neg = (week_returns < 0).sum()
-                                                total = len(week_returns)
-                                                win_rate = (pos / total * 100) if total > 0 else 0
-                                                avg_return = week_returns.mean()
-    
-                                                week_stats.append({
-                                                    'Week': week,
-                                                    'Pos': pos,
-                                                    'Neg': neg,
-                                                    'Win%': win_rate,
-                                                    'Avg%': avg_return
-                                                })
-    
-                                        df_week_stats = pd.DataFrame(week_stats)
+                                        df_week_stats = seasonality.week_stats(month_num)
     
                                         styled_week_stats = df_week_stats.style.format({
                                             'Win%': '{:.0f}%',
@@ -1468,36 +1458,12 @@ with tab1:
     
                             st.markdown(f"**Daily Performance Analysis - {selected_month}**")
     
-                            # Calculate daily returns for selected month
                             month_num = month_order.index(selected_month) + 1
-                            season_data_daily = season_data.copy()
-                            season_data_daily['Year'] = season_data_daily.index.year
-                            season_data_daily['Month'] = season_data_daily.index.month
-                            season_data_daily['Day'] = season_data_daily.index.day
-    
-                            month_daily_data = season_data_daily[season_data_daily['Month'] == month_num].copy()
-    
-                            if len(month_daily_data) > 0:
-                                # Calculate daily returns
-                                month_daily_data['Daily_Return'] = month_daily_data['Close'].pct_change() * 100
-    
-                                daily_returns = []
-                                for day in range(1, 32):
-                                    day_data = month_daily_data[month_daily_data['Day'] == day]
-                                    if len(day_data) > 0:
-                                        for _, row in day_data.iterrows():
-                                            if not pd.isna(row['Daily_Return']):
-                                                daily_returns.append({
-                                                    'Year': row['Year'],
-                                                    'Day': day,
-                                                    'Return': row['Daily_Return']
-                                                })
-    
-                                df_daily = pd.DataFrame(daily_returns)
-    
-                                if not df_daily.empty:
-                                    # Create pivot for heatmap
-                                    pivot_daily = df_daily.pivot_table(index='Year', columns='Day', values='Return', aggfunc='mean')
+    
+                            if seasonality.has_month(month_num):
+                                pivot_daily = seasonality.daily_pivot(month_num)
+    
+                                if not pivot_daily.empty:
     
                                     # Layout
                                     col_heat_day, col_stats_day = st.columns([7, 3])
@@ -1540,12 +1506,8 @@ with tab1:
                                         # Day statistics summary
                                         st.markdown("**Day Stats (Top 10)**")
     
-                                        day_stats = df_daily.groupby('Day').agg({
-                                            'Return': ['mean', lambda x: (x > 0).sum() / len(x) * 100, 'count']
-                                        }).round(2)
-                                        day_stats.columns = ['Avg%', 'Win%', 'Count']
-                                        day_stats = day_stats[day_stats['Count'] >= 3]  # Filter days with at least 3 data points
-                                        day_stats = day_stats.sort_values('Avg%', ascending=False).head(10)
+                                        # Days with at least 3 data points, best 10 by average return
+                                        day_stats = seasonality.day_stats(month_num, min_count=3, top=10)
     
                                         st.dataframe(
                                             day_stats.style.format({'Avg%': '{:+.1f}%', 'Win%': '{:.0f}%'}),
@@ -1561,24 +1523,10 @@ with tab1:
                         elif drill_view == "📆 Day-of-Week (Mon-Fri)":
                             st.markdown("**Day-of-Week Performance Analysis**")
     
-                            # Calculate day of week returns
-                            season_data_dow = season_data.copy()
-                            season_data_dow['DayOfWeek'] = season_data_dow.index.day_name()
-                            season_data_dow['Daily_Return'] = season_data_dow['Close'].pct_change() * 100
-    
-                            # Filter out weekends (if any)
-                            weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-                            season_data_dow = season_data_dow[season_data_dow['DayOfWeek'].isin(weekdays)]
-    
-                            if not season_data_dow.empty:
-                                # Calculate statistics by day of week
-                                dow_stats = season_data_dow.groupby('DayOfWeek').agg({
-                                    'Daily_Return': ['mean', lambda x: (x > 0).sum() / len(x) * 100, 'count']
-                                }).round(2)
-                                dow_stats.columns = ['Avg Return %', 'Win Rate %', 'Count']
+                            weekdays = WEEKDAYS
+                            dow_stats = seasonality.dow_stats
     
-                                # Reorder by weekday
-                                dow_stats = dow_stats.reindex(weekdays)
+                            if dow_stats['Count'].notna().any():
     
                                 # Display metrics
                                 st.markdown("##### Performance by Day of Week")
@@ -1683,3 +1631,21 @@ with tab1:
                 except Exception as e:
                     st.error(f"Error calculating seasonality: {e}")
 
+# Hot-path metrics (utils/metrics.py), also exported as Prometheus text / JSON
+start_exporters()
+with performance_panel:
+    render_performance_metrics()
+
+# Render profile of this rerun (only when profiling is on)
+render_profile = stop_profile()
+if render_profile is not None:
+    with st.expander("🐞 Render profile", expanded=False):
+        st.caption(f"Rerun: {render_profile.root.wall * 1e3:.0f} ms wall, "
+                   f"{render_profile.root.cpu * 1e3:.0f} ms CPU · report: {render_profile.report_path}.*")
+        st.dataframe(
+            pd.DataFrame(render_profile.rows()).style.format({
+                'Wall ms': '{:.1f}', 'CPU ms': '{:.1f}', 'Wait ms': '{:.1f}', '% of rerun': '{:.1f}%'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
@@ -4,8 +4,7 @@ Provides configurable auto-refresh functionality with user controls.
 """
 
 import streamlit as st
-from datetime import datetime
-import time
+from datetime import datetime, timedelta
 
 
 def setup_auto_refresh(default_interval=300):
@@ -34,7 +33,10 @@ def setup_auto_refresh(default_interval=300):
 def render_refresh_controls():
     """
     Render auto-refresh controls in the UI.
-    Returns True if refresh should happen.
+
+    When enabled, a fragment scheduled with run_every reruns the page once
+    per interval. Data itself is kept fresh by the background scheduler, so
+    the rerun only re-reads snapshots; nothing sleeps or clears caches.
     """
     col1, col2, col3 = st.sidebar.columns([1, 2, 1])
 
@@ -48,44 +50,45 @@ def render_refresh_controls():
         )
         st.session_state.auto_refresh_enabled = auto_refresh
 
+    if not auto_refresh:
+        return
+
     with col2:
-        if auto_refresh:
-            # Refresh interval selector
-            interval_options = {
-                "1 min": 60,
-                "2 min": 120,
-                "5 min": 300,
-                "10 min": 600,
-                "15 min": 900
-            }
-
-            selected = st.selectbox(
-                "Interval",
-                options=list(interval_options.keys()),
-                index=2,  # Default to 5 min
-                label_visibility="collapsed",
-                key="refresh_interval_select"
-            )
-
-            st.session_state.refresh_interval = interval_options[selected]
+        # Refresh interval selector
+        interval_options = {
+            "1 min": 60,
+            "2 min": 120,
+            "5 min": 300,
+            "10 min": 600,
+            "15 min": 900
+        }
+
+        selected = st.selectbox(
+            "Interval",
+            options=list(interval_options.keys()),
+            index=2,  # Default to 5 min
+            label_visibility="collapsed",
+            key="refresh_interval_select"
+        )
+
+        st.session_state.refresh_interval = interval_options[selected]
 
     with col3:
-        if auto_refresh:
-            # Show countdown
-            elapsed = (datetime.now() - st.session_state.last_refresh).total_seconds()
-            remaining = max(0, st.session_state.refresh_interval - elapsed)
+        _render_refresh_timer(st.session_state.refresh_interval)
 
-            if remaining == 0:
-                st.session_state.last_refresh = datetime.now()
-                return True  # Trigger refresh
 
-            st.caption(f"{int(remaining)}s")
+def _render_refresh_timer(interval):
+    @st.fragment(run_every=interval)
+    def refresh_timer():
+        elapsed = (datetime.now() - st.session_state.last_refresh).total_seconds()
+        if elapsed >= interval:
+            st.session_state.last_refresh = datetime.now()
+            st.rerun(scope="app")
 
-            # Auto-rerun after interval
-            time.sleep(min(remaining, 1))
-            st.rerun()
+        next_refresh = st.session_state.last_refresh + timedelta(seconds=interval)
+        st.caption(next_refresh.strftime("%H:%M"))
 
-    return False
+    refresh_timer()
 
 
 def get_last_refresh_time():
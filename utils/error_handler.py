@@ -8,6 +8,8 @@ import functools
 import logging
 from typing import Callable, Any, Optional
 
+from utils.profiler import profile_section
+
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -133,11 +135,14 @@ class ErrorBoundary:
     def __init__(self, component_name: str, fallback_ui: Optional[Callable] = None):
         self.component_name = component_name
         self.fallback_ui = fallback_ui
+        self._section = profile_section(component_name)
 
     def __enter__(self):
+        self._section.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._section.__exit__(exc_type, exc_val, exc_tb)
         if exc_type is not None:
             logger.error(f"Error in {self.component_name}: {exc_val}", exc_info=True)
 
@@ -0,0 +1,36 @@
+"""
+File helpers for MarketPulse's on-disk stores.
+"""
+
+import os
+import threading
+
+
+def atomic_write(path, data):
+    """
+    Replaces a file's contents so readers see the old file or the new one, never a partial write.
+
+    The data goes to a temp file next to `path` that is swapped in with
+    os.replace; if anything fails, the temp file is removed and the error
+    re-raised, leaving any previous file in place. Missing parent
+    directories are created.
+
+    Args:
+        path: File to write
+        data: bytes, or str (written as UTF-8)
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -70,3 +70,31 @@ def format_number(value):
     if value is None:
         return "0.00"
     return f"{value:,.2f}"
+
+
+def format_age(seconds):
+    """
+    Formats a data age as a short relative time.
+
+    Args:
+        seconds: Age in seconds (can be None)
+
+    Returns:
+        str: Relative time (e.g., "just now", "45s ago", "12m ago", "3h ago", "2d ago")
+
+    Examples:
+        >>> format_age(5)
+        'just now'
+        >>> format_age(720)
+        '12m ago'
+        >>> format_age(None)
+        'unknown'
+    """
+    if seconds is None:
+        return "unknown"
+    if seconds < 10:
+        return "just now"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit} ago"
+    return f"{int(seconds)}s ago"
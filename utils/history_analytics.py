@@ -0,0 +1,64 @@
+"""
+Historical performance analytics for MarketPulse.
+Derives everything the Historical Analysis view shows from daily bars in
+one pass: moving averages, the A/D line and 20-day A/D ratio, and the
+period performance summary.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from utils.metrics import timed
+from utils.technical_indicators import calculate_ad_line
+
+
+@dataclass
+class HistoryAnalytics:
+    """
+    Precomputed historical analytics for one symbol and period.
+
+    `bars` is the daily history with MA20/MA50 and the calculate_ad_line
+    columns added; `summary` holds the period performance figures.
+    """
+    bars: pd.DataFrame
+    summary: dict  # start/end price, change, change_pct, high, low, avg_volume,
+                   # advancing_days, declining_days, ad_ratio_20d
+
+
+@timed()
+def compute_history_analytics(history):
+    """
+    Compute moving averages, A/D indicators and the performance summary.
+
+    Args:
+        history: DataFrame with a DatetimeIndex and OHLCV columns
+
+    Returns:
+        HistoryAnalytics: Precomputed analytics (None if history is empty)
+    """
+    if history is None or history.empty or 'Close' not in history.columns:
+        return None
+
+    bars = calculate_ad_line(history.assign(
+        MA20=history['Close'].rolling(window=20).mean(),
+        MA50=history['Close'].rolling(window=50).mean()
+    ))
+
+    start_price = bars['Close'].iloc[0]
+    end_price = bars['Close'].iloc[-1]
+    ad_ratio = bars['AD_Ratio_20D'].iloc[-1]
+
+    summary = {
+        'start_price': float(start_price),
+        'end_price': float(end_price),
+        'change': float(end_price - start_price),
+        'change_pct': float((end_price - start_price) / start_price * 100),
+        'high': float(bars['High'].max()),
+        'low': float(bars['Low'].min()),
+        'avg_volume': float(bars['Volume'].mean()),
+        'advancing_days': int(bars['Is_Advancing'].sum()),
+        'declining_days': int(bars['Is_Declining'].sum()),
+        'ad_ratio_20d': float(ad_ratio) if not pd.isna(ad_ratio) else 0.0
+    }
+    return HistoryAnalytics(bars=bars, summary=summary)
@@ -9,6 +9,9 @@ UTC = pytz.utc
 NY_TZ = pytz.timezone('America/New_York')
 LONDON_TZ = pytz.timezone('Europe/London')
 TOKYO_TZ = pytz.timezone('Asia/Tokyo')
+HONG_KONG_TZ = pytz.timezone('Asia/Hong_Kong')
+SHANGHAI_TZ = pytz.timezone('Asia/Shanghai')
+SEOUL_TZ = pytz.timezone('Asia/Seoul')
 
 @dataclass
 class MarketSession:
@@ -28,6 +31,9 @@ class MarketSchedule:
             "USA (NYSE)": MarketSession("USA (NYSE)", NY_TZ, datetime.time(9, 30), datetime.time(16, 0), [0, 1, 2, 3, 4]),
             "Europe (LSE)": MarketSession("Europe (LSE)", LONDON_TZ, datetime.time(8, 0), datetime.time(16, 30), [0, 1, 2, 3, 4]),
             "Japan (Tokyo)": MarketSession("Japan (Tokyo)", TOKYO_TZ, datetime.time(9, 0), datetime.time(15, 0), [0, 1, 2, 3, 4], True, datetime.time(11, 30), datetime.time(12, 30)),
+            "Hong Kong (HKEX)": MarketSession("Hong Kong (HKEX)", HONG_KONG_TZ, datetime.time(9, 30), datetime.time(16, 0), [0, 1, 2, 3, 4], True, datetime.time(12, 0), datetime.time(13, 0)),
+            "China (SSE)": MarketSession("China (SSE)", SHANGHAI_TZ, datetime.time(9, 30), datetime.time(15, 0), [0, 1, 2, 3, 4], True, datetime.time(11, 30), datetime.time(13, 0)),
+            "Korea (KRX)": MarketSession("Korea (KRX)", SEOUL_TZ, datetime.time(9, 0), datetime.time(15, 30), [0, 1, 2, 3, 4]),
             # Gold (CME) - Simplified to ~23 hours, Sun-Fri. 
             # Note: Handling overnight sessions (cross-day) requires careful logic.
             # CME Globex: Sun 6pm ET to Fri 5pm ET. Daily break 5pm-6pm ET.
@@ -88,6 +94,53 @@ class MarketSchedule:
 
         return False, "Closed"
 
+    def _session_boundaries(self, market: MarketSession, day: datetime.date):
+        """Open, close and break times on a local calendar day, as aware datetimes."""
+        times = [market.open_time, market.close_time]
+        if market.has_break:
+            times += [market.break_start, market.break_end]
+        return [market.timezone.localize(datetime.datetime.combine(day, t)) for t in times]
+
+    def _is_open_at(self, market: MarketSession, when: datetime.datetime):
+        return self._is_market_open(market, when.astimezone(market.timezone))[0]
+
+    def get_session_state(self, name: str, now: Optional[datetime.datetime] = None):
+        """
+        Returns whether a market is open and when its current state began and ends.
+
+        Transitions are found by checking _is_market_open just before and
+        after each open/close/break time in the surrounding week, so special
+        cases (CME's overnight session, lunch breaks, weekends) follow the
+        same rules as the status display.
+
+        Args:
+            name: Market key in self.markets (e.g., "India (NSE)")
+            now: Aware datetime to evaluate at (default: current time)
+
+        Returns:
+            tuple: (is_open, since, until) where since/until are UTC datetimes of
+            the last and next open/close transition (None if there is none,
+            e.g. Crypto)
+        """
+        market = self.markets[name]
+        now = now or datetime.datetime.now(UTC)
+        today = now.astimezone(market.timezone).date()
+        step = datetime.timedelta(seconds=1)
+
+        transitions = [
+            boundary
+            for offset in range(-8, 9)
+            for boundary in self._session_boundaries(market, today + datetime.timedelta(days=offset))
+            if self._is_open_at(market, boundary - step) != self._is_open_at(market, boundary + step)
+        ]
+        since = max((b for b in transitions if b <= now), default=None)
+        until = min((b for b in transitions if b > now), default=None)
+        return (
+            self._is_open_at(market, now),
+            since.astimezone(UTC) if since else None,
+            until.astimezone(UTC) if until else None
+        )
+
     def get_market_timings(self):
         """
         Returns status and IST timings for all markets.
@@ -0,0 +1,317 @@
+"""
+In-process metrics for MarketPulse.
+Counters and latency histograms for the data and analytics hot paths (call
+latency, cache hits, upstream requests, errors and bytes downloaded),
+rendered as Prometheus text or JSON. Optional exporters serve them over HTTP
+and dump them to a JSON file periodically.
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import DATA_DIR, METRICS_DUMP_INTERVAL, METRICS_PORT
+from utils.fileio import atomic_write
+from utils.logger import logger
+
+
+CALL_SECONDS = "marketpulse_call_seconds"
+CALL_ERRORS = "marketpulse_call_errors_total"
+CACHE_REQUESTS = "marketpulse_cache_requests_total"
+SNAPSHOT_FALLBACKS = "marketpulse_snapshot_fallbacks_total"
+UPSTREAM_REQUESTS = "marketpulse_upstream_requests_total"
+UPSTREAM_SECONDS = "marketpulse_upstream_seconds"
+UPSTREAM_BYTES = "marketpulse_upstream_bytes_total"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimates a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g., 0.95)
+
+        Returns:
+            float: Estimated value (None if nothing was observed)
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower  # +Inf bucket: the largest finite bound is all we know
+                return lower + (self.buckets[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = [*label_key, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters and histograms."""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def inc(self, name, value=1, **labels):
+        """Adds `value` to the counter `name` with the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Records `value` in the histogram `name` with the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """Observes the duration of the block in the histogram `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counters(self, name):
+        """Returns {labels dict as tuple: value} for a counter."""
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def histograms(self, name):
+        """Returns {labels tuple: (count, sum, p50, p95)} for a histogram."""
+        with self._lock:
+            return {key: (h.count, h.sum, h.quantile(0.5), h.quantile(0.95))
+                    for key, h in self._histograms.get(name, {}).items()}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def to_prometheus(self):
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        """Returns every metric as JSON-serializable data."""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "taken_at": time.time(),
+                "counters": {name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                             for name, series in self._counters.items()},
+                "histograms": {name: [{"labels": dict(key), "count": h.count, "sum": h.sum,
+                                       "p50": h.quantile(0.5), "p95": h.quantile(0.95)}
+                                      for key, h in series.items()]
+                               for name, series in self._histograms.items()}
+            }
+
+    def summary(self):
+        """
+        Summarizes the hot paths for display.
+
+        Returns:
+            dict: {
+                'calls': [{'func', 'calls', 'errors', 'total_s', 'avg_ms', 'p95_ms'}, ...]
+                         sorted by total time,
+                'cache': {namespace: {'hit', 'stale', 'miss'}},
+                'upstream': {endpoint: {'requests', 'errors', 'bytes', 'avg_ms'}},
+                'fallbacks': number of last-known-good snapshots served
+            }
+        """
+        errors = {dict(key).get("func"): value for key, value in self.counters(CALL_ERRORS).items()}
+        calls = []
+        for key, (count, total, _, p95) in self.histograms(CALL_SECONDS).items():
+            func = dict(key).get("func")
+            calls.append({
+                "func": func,
+                "calls": count,
+                "errors": errors.get(func, 0),
+                "total_s": total,
+                "avg_ms": total / count * 1e3 if count else 0.0,
+                "p95_ms": p95 * 1e3 if p95 is not None else None
+            })
+        calls.sort(key=lambda call: call["total_s"], reverse=True)
+
+        cache = {}
+        for key, value in self.counters(CACHE_REQUESTS).items():
+            labels = dict(key)
+            cache.setdefault(labels["namespace"], {"hit": 0, "stale": 0, "miss": 0})[labels["result"]] += value
+
+        upstream = {}
+        for key, value in self.counters(UPSTREAM_REQUESTS).items():
+            labels = dict(key)
+            stats = upstream.setdefault(labels["endpoint"], {"requests": 0, "errors": 0, "bytes": 0, "avg_ms": None})
+            stats["requests"] += value
+            if labels["outcome"] != "ok":
+                stats["errors"] += value
+        for key, value in self.counters(UPSTREAM_BYTES).items():
+            endpoint = dict(key)["endpoint"]
+            upstream.setdefault(endpoint, {"requests": 0, "errors": 0, "bytes": 0, "avg_ms": None})["bytes"] += value
+        for key, (count, total, _, _) in self.histograms(UPSTREAM_SECONDS).items():
+            endpoint = dict(key)["endpoint"]
+            if endpoint in upstream and count:
+                upstream[endpoint]["avg_ms"] = total / count * 1e3
+
+        return {
+            "calls": calls,
+            "cache": cache,
+            "upstream": upstream,
+            "fallbacks": sum(self.counters(SNAPSHOT_FALLBACKS).values())
+        }
+
+
+# Process-wide registry shared by every instrumented module
+metrics = MetricsRegistry()
+
+
+def timed(name=None):
+    """
+    Records each call's latency (and failures) under CALL_SECONDS / CALL_ERRORS.
+
+    Args:
+        name: Label for the function (default: its __name__)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                metrics.inc(CALL_ERRORS, func=label)
+                raise
+            finally:
+                metrics.observe(CALL_SECONDS, time.perf_counter() - start, func=label)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") == "/metrics":
+            body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path.rstrip("/") == "/metrics.json":
+            body, content_type = json.dumps(metrics.to_dict()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # scrapes would otherwise flood stderr
+
+
+def dump_json(path=None):
+    """Writes the current metrics to a JSON file atomically (default: DATA_DIR/metrics.json)."""
+    atomic_write(path or os.path.join(DATA_DIR, "metrics.json"), json.dumps(metrics.to_dict()))
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters(port=METRICS_PORT, dump_interval=METRICS_DUMP_INTERVAL, dump_path=None):
+    """
+    Starts the metrics exporters once per process.
+
+    Args:
+        port: Serve /metrics (Prometheus text) and /metrics.json on this
+            port (0 disables)
+        dump_interval: Seconds between JSON dumps to `dump_path` (0 disables)
+        dump_path: JSON dump file (default: DATA_DIR/metrics.json)
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    if port:
+        try:
+            server = ThreadingHTTPServer(("", port), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info(f"Serving metrics on :{port}/metrics")
+        except OSError as e:
+            logger.warning(f"Could not serve metrics on port {port}: {e}")
+
+    if dump_interval:
+        def dump_loop():
+            while True:
+                time.sleep(dump_interval)
+                try:
+                    dump_json(dump_path)
+                except Exception as e:
+                    logger.warning(f"Could not dump metrics: {e}")
+
+        threading.Thread(target=dump_loop, name="metrics-dump", daemon=True).start()
@@ -0,0 +1,307 @@
+"""
+Opt-in render profiler for Streamlit pages.
+Times each page section (every ErrorBoundary, plus sections marked with
+profile_section / profile_mark) in wall-clock and script-thread CPU time,
+optionally captures the whole rerun with cProfile or pyinstrument, and
+writes a per-rerun report (JSON timings, folded stacks for flame graph
+viewers such as speedscope, and the profiler output) to disk.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from config.settings import DATA_DIR, PROFILE_KEEP, PROFILE_RENDER
+from utils.logger import logger
+
+
+PROFILE_MODES = ("timing", "cprofile", "pyinstrument")
+
+# Profiles are per script run, and Streamlit runs each session's script on its own thread
+_local = threading.local()
+
+# Every started profile until it is stopped, so runs cut short can be finished later
+_running = set()
+_running_lock = threading.Lock()
+
+
+@dataclass
+class SectionTiming:
+    """Timing of one page section; `path` is the chain of enclosing section names."""
+    path: tuple
+    wall: float = 0.0
+    cpu: float = 0.0
+    children: list = field(default_factory=list)
+
+    @property
+    def name(self):
+        return self.path[-1]
+
+    @property
+    def self_wall(self):
+        return max(self.wall - sum(child.wall for child in self.children), 0.0)
+
+
+class RenderProfile:
+    """
+    Section timings of one page rerun.
+
+    Args:
+        capture: None for timers only, "cprofile" or "pyinstrument" to also
+            profile the whole rerun
+    """
+
+    def __init__(self, capture=None):
+        self.capture = capture
+        self.root = SectionTiming(path=())
+        self._stack = []  # [(SectionTiming, wall start, cpu start, is_mark)]
+        self._profiler = None
+        self.started_at = time.time()
+        self.report_path = None
+        self.thread = threading.current_thread()
+
+    def _open(self, name, mark=False):
+        parent = self._stack[-1][0] if self._stack else self.root
+        timing = SectionTiming(path=(*parent.path, name))
+        parent.children.append(timing)
+        self._stack.append((timing, time.perf_counter(), time.thread_time(), mark))
+
+    def _close(self):
+        # Marks end with their enclosing section
+        while self._stack and self._stack[-1][3]:
+            self._pop()
+        if self._stack:
+            self._pop()
+
+    def _pop(self):
+        timing, wall_start, cpu_start, _ = self._stack.pop()
+        timing.wall += time.perf_counter() - wall_start
+        timing.cpu += time.thread_time() - cpu_start
+
+    def mark(self, name):
+        """Ends the current mark (if any) and starts a new one in the enclosing section."""
+        if self._stack and self._stack[-1][3]:
+            self._pop()
+        self._open(name, mark=True)
+
+    def start(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        if self.capture == "cprofile":
+            try:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+            except ValueError as e:
+                # Python 3.12+ allows one active profiler per process (e.g. another session's)
+                logger.warning(f"Could not start cProfile, profiling with timers only: {e}")
+                self._profiler = None
+                self.capture = None
+        elif self.capture == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+                self._profiler.start()
+            except ImportError:
+                logger.warning("pyinstrument is not installed, profiling with timers only")
+                self.capture = None
+
+    def stop(self):
+        while self._stack:
+            self._pop()
+        if self._profiler is not None:
+            if self.capture == "cprofile":
+                self._profiler.disable()
+            else:
+                self._profiler.stop()
+        self.root.wall = time.perf_counter() - self._wall_start
+        self.root.cpu = time.thread_time() - self._cpu_start
+
+    def sections(self):
+        """All section timings, depth first."""
+        def walk(timing):
+            for child in timing.children:
+                yield child
+                yield from walk(child)
+        return list(walk(self.root))
+
+    def rows(self):
+        """
+        Timing table rows for display.
+
+        Returns:
+            list: dicts with Section (indented by depth), Wall ms, CPU ms,
+            Wait ms (wall time not spent on the script thread's CPU, e.g.
+            blocked on fetches) and % of the rerun
+        """
+        total = self.root.wall or 1.0
+        return [{
+            "Section": "\u2003" * (len(timing.path) - 1) + timing.name,  # em spaces survive table rendering
+            "Wall ms": timing.wall * 1e3,
+            "CPU ms": timing.cpu * 1e3,
+            "Wait ms": max(timing.wall - timing.cpu, 0.0) * 1e3,
+            "% of rerun": timing.wall / total * 100
+        } for timing in self.sections()]
+
+    def folded(self):
+        """Self wall time per section stack in microseconds, in the collapsed-stack format."""
+        lines = [f"rerun {int(self.root.self_wall * 1e6)}"]
+        for timing in self.sections():
+            lines.append(f"{';'.join(('rerun', *timing.path))} {int(timing.self_wall * 1e6)}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, root=None, keep=PROFILE_KEEP):
+        """
+        Writes this rerun's report files and prunes old ones.
+
+        Args:
+            root: Report directory (default: DATA_DIR/profiles)
+            keep: Number of reruns to keep reports for
+
+        Returns:
+            str: Path prefix of the written files
+        """
+        root = root or os.path.join(DATA_DIR, "profiles")
+        os.makedirs(root, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started_at).strftime("%Y%m%d-%H%M%S-%f")
+        prefix = os.path.join(root, f"render-{stamp}")
+
+        with open(prefix + ".json", "w") as f:
+            json.dump({"started_at": self.started_at, "wall": self.root.wall, "cpu": self.root.cpu,
+                       "sections": [{"path": list(t.path), "wall": t.wall, "cpu": t.cpu}
+                                    for t in self.sections()]}, f, indent=1)
+        with open(prefix + ".folded", "w") as f:
+            f.write(self.folded())
+
+        if self.capture == "cprofile" and self._profiler is not None:
+            self._profiler.dump_stats(prefix + ".prof")
+            text = io.StringIO()
+            pstats.Stats(self._profiler, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(prefix + ".txt", "w") as f:
+                f.write(text.getvalue())
+        elif self.capture == "pyinstrument" and self._profiler is not None:
+            with open(prefix + ".html", "w") as f:
+                f.write(self._profiler.output_html())
+
+        reports = sorted({name.split(".")[0] for name in os.listdir(root) if name.startswith("render-")})
+        for stale in reports[:-keep] if keep else []:
+            for name in os.listdir(root):
+                if name.split(".")[0] == stale:
+                    os.remove(os.path.join(root, name))
+
+        self.report_path = prefix
+        return prefix
+
+
+def profile_mode(requested=None):
+    """
+    Resolves the profiling mode from PROFILE_RENDER and an optional request.
+
+    Profiling is off unless PROFILE_RENDER enables it, so visitors can't
+    turn it on through the URL; when it is on, a request (e.g. a query
+    parameter) may pick a different mode or turn it off for that run.
+
+    Args:
+        requested: "timing", "cprofile", "pyinstrument", or a truthy flag
+            ("1", "true") for timing; None uses PROFILE_RENDER's mode
+
+    Returns:
+        str: One of PROFILE_MODES, or None if profiling is off
+    """
+    if _resolve(PROFILE_RENDER) is None:
+        return None
+    return _resolve(requested if requested is not None else PROFILE_RENDER)
+
+
+def _resolve(value):
+    value = (value or "").strip().lower()
+    if value in PROFILE_MODES:
+        return value
+    if value in ("1", "true", "yes", "on"):
+        return "timing"
+    return None
+
+
+def _finish(profile):
+    with _running_lock:
+        if profile not in _running:
+            return
+        _running.discard(profile)
+    profile.stop()
+    try:
+        profile.write_report()
+    except Exception as e:
+        logger.warning(f"Could not write render profile: {e}")
+
+
+def start_profile(mode):
+    """
+    Starts profiling this thread's script run.
+
+    Runs cut short by st.rerun() or st.stop() never reach stop_profile(), so
+    any profile left running by this thread (or by a thread that has since
+    exited) is stopped and reported first; a capturing profiler left enabled
+    would otherwise keep profiling, and on Python 3.12+ block the next one.
+
+    Args:
+        mode: One of PROFILE_MODES, or None to run unprofiled
+
+    Returns:
+        RenderProfile: The started profile (None if mode is None)
+    """
+    current = threading.current_thread()
+    with _running_lock:
+        leftovers = [p for p in _running if p.thread is current or not p.thread.is_alive()]
+    for leftover in leftovers:
+        _finish(leftover)
+
+    _local.profile = None
+    if mode is None:
+        return None
+    profile = RenderProfile(capture=mode if mode != "timing" else None)
+    with _running_lock:
+        _running.add(profile)
+    _local.profile = profile
+    profile.start()
+    return profile
+
+
+def stop_profile():
+    """Stops profiling this thread's script run and writes its report; returns the RenderProfile."""
+    profile = getattr(_local, "profile", None)
+    _local.profile = None
+    if profile is None:
+        return None
+    _finish(profile)
+    return profile
+
+
+class profile_section:
+    """Times the enclosed block as a page section when profiling is on (no-op otherwise)."""
+
+    def __init__(self, name):
+        self.name = name
+        self._profile = None
+
+    def __enter__(self):
+        self._profile = getattr(_local, "profile", None)
+        if self._profile is not None:
+            self._profile._open(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._profile is not None:
+            self._profile._close()
+        return False
+
+
+def profile_mark(name):
+    """Starts a flat sub-section that runs until the next mark or the end of the enclosing section."""
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.mark(name)
@@ -0,0 +1,171 @@
+"""
+Seasonality analytics for MarketPulse.
+Computes monthly, weekly, day-of-month and day-of-week return statistics
+from daily bars with one groupby pass per granularity.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from utils.metrics import timed
+
+
+MONTH_ORDER = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+WEEK_LABELS = [f'Week {i}' for i in range(1, 6)]
+
+
+def _win_rate(returns, keys):
+    """Percentage of positive returns per group."""
+    return (returns > 0).groupby(keys).mean() * 100
+
+
+@dataclass
+class SeasonalityResult:
+    """
+    Precomputed seasonality tables for one symbol.
+
+    The long-form tables hold every granularity for every month, so the
+    drill-down views only filter and pivot instead of recomputing from bars.
+    """
+    monthly_returns: pd.DataFrame   # Year, Month, Month_Name, Return
+    monthly_pivot: pd.DataFrame     # Year x Month_Name returns (calendar order)
+    month_stats: pd.DataFrame       # Month, Pos, Neg, Win%, Avg%
+    quarterly_stats: pd.DataFrame   # Q1-Q4 x Avg Return %, Win Rate %
+    weekly_returns: pd.DataFrame    # Year, Month, Week, Return
+    daily_returns: pd.DataFrame     # Year, Month, Day, Return
+    dow_stats: pd.DataFrame         # Monday-Friday x Avg Return %, Win Rate %, Count
+
+    def has_month(self, month):
+        """Returns True if there are any bars for the calendar month (1-12)."""
+        return bool((self.monthly_returns['Month'] == month).any())
+
+    def weekly_pivot(self, month):
+        """Year x Week 1-5 return matrix for a calendar month (1-12)."""
+        weekly = self.weekly_returns[self.weekly_returns['Month'] == month]
+        if weekly.empty:
+            return pd.DataFrame()
+        pivot = weekly.pivot(index='Year', columns='Week', values='Return')
+        return pivot.reindex(columns=WEEK_LABELS)
+
+    def week_stats(self, month):
+        """Week, Pos, Neg, Win%, Avg% for each week of a calendar month (1-12)."""
+        weekly = self.weekly_returns[self.weekly_returns['Month'] == month]
+        if weekly.empty:
+            return pd.DataFrame(columns=['Week', 'Pos', 'Neg', 'Win%', 'Avg%'])
+        grouped = weekly.groupby('Week')['Return']
+        stats = pd.DataFrame({
+            'Pos': (weekly['Return'] > 0).groupby(weekly['Week']).sum(),
+            'Neg': (weekly['Return'] < 0).groupby(weekly['Week']).sum(),
+            'Win%': _win_rate(weekly['Return'], weekly['Week']),
+            'Avg%': grouped.mean(),
+        })
+        stats = stats.reindex([w for w in WEEK_LABELS if w in stats.index])
+        return stats.rename_axis('Week').reset_index()
+
+    def daily_pivot(self, month):
+        """Year x Day-of-month return matrix for a calendar month (1-12)."""
+        daily = self.daily_returns[self.daily_returns['Month'] == month]
+        if daily.empty:
+            return pd.DataFrame()
+        return daily.pivot_table(index='Year', columns='Day', values='Return', aggfunc='mean')
+
+    def day_stats(self, month, min_count=3, top=10):
+        """Top days of a calendar month by average return, with win rate and count."""
+        daily = self.daily_returns[self.daily_returns['Month'] == month]
+        if daily.empty:
+            return pd.DataFrame(columns=['Avg%', 'Win%', 'Count'])
+        stats = pd.DataFrame({
+            'Avg%': daily.groupby('Day')['Return'].mean(),
+            'Win%': _win_rate(daily['Return'], daily['Day']),
+            'Count': daily.groupby('Day')['Return'].count(),
+        }).round(2)
+        stats = stats[stats['Count'] >= min_count]
+        return stats.sort_values('Avg%', ascending=False).head(top)
+
+
+@timed()
+def compute_seasonality(history):
+    """
+    Compute all seasonality tables for a daily price history.
+
+    Monthly and weekly returns measure the move from the first to the last
+    close inside the period; daily and day-of-week returns are close-to-close
+    changes over the full series.
+
+    Args:
+        history: DataFrame with a DatetimeIndex and 'Close' column
+
+    Returns:
+        SeasonalityResult: Precomputed tables (None if history is empty)
+    """
+    if history is None or history.empty or 'Close' not in history.columns:
+        return None
+
+    close = history['Close'].dropna()
+    index = close.index
+    years = pd.Series(index.year, index=index)
+    months = pd.Series(index.month, index=index)
+
+    # Monthly: first/last close per (Year, Month)
+    monthly = close.groupby([years, months]).agg(['first', 'last'])
+    monthly.index.names = ['Year', 'Month']
+    monthly_returns = ((monthly['last'] - monthly['first']) / monthly['first'] * 100).rename('Return').reset_index()
+    monthly_returns.insert(2, 'Month_Name', monthly_returns['Month'].map(lambda m: MONTH_ORDER[m - 1]))
+
+    monthly_pivot = monthly_returns.pivot(index='Year', columns='Month_Name', values='Return')
+    monthly_pivot = monthly_pivot.reindex(columns=[m for m in MONTH_ORDER if m in monthly_pivot.columns])
+
+    month_returns = monthly_returns['Return']
+    month_keys = monthly_returns['Month']
+    month_stats = pd.DataFrame({
+        'Pos': (month_returns > 0).groupby(month_keys).sum(),
+        'Neg': (month_returns < 0).groupby(month_keys).sum(),
+        'Win%': _win_rate(month_returns, month_keys),
+        'Avg%': month_returns.groupby(month_keys).mean(),
+    }).sort_index()
+    month_stats.insert(0, 'Month', [MONTH_ORDER[m - 1] for m in month_stats.index])
+    month_stats = month_stats.reset_index(drop=True)
+
+    quarter_keys = month_keys.map(lambda m: f'Q{(m - 1) // 3 + 1}')
+    quarterly_stats = pd.DataFrame({
+        'Avg Return %': month_returns.groupby(quarter_keys).mean(),
+        'Win Rate %': _win_rate(month_returns, quarter_keys),
+    }).round(2).reindex(['Q1', 'Q2', 'Q3', 'Q4'])
+
+    # Weekly: week-of-month buckets (days 1-7 = Week 1, ..., 29-31 = Week 5)
+    weeks = pd.Series((index.day - 1) // 7 + 1, index=index).clip(1, 5)
+    weekly = close.groupby([years, months, weeks]).agg(['first', 'last', 'count'])
+    weekly.index.names = ['Year', 'Month', 'Week']
+    weekly = weekly[weekly['count'] > 1]
+    weekly_returns = ((weekly['last'] - weekly['first']) / weekly['first'] * 100).rename('Return').reset_index()
+    weekly_returns['Week'] = 'Week ' + weekly_returns['Week'].astype(str)
+
+    # Daily and day-of-week: close-to-close returns
+    daily_change = close.pct_change() * 100
+    daily_returns = pd.DataFrame({
+        'Year': index.year,
+        'Month': index.month,
+        'Day': index.day,
+        'Return': daily_change.values,
+    }).dropna(subset=['Return']).reset_index(drop=True)
+
+    day_names = pd.Series(index.day_name(), index=index)
+    weekday_change = daily_change[day_names.isin(WEEKDAYS)]
+    weekday_keys = day_names[weekday_change.index]
+    dow_stats = pd.DataFrame({
+        'Avg Return %': weekday_change.groupby(weekday_keys).mean(),
+        'Win Rate %': _win_rate(weekday_change, weekday_keys),
+        'Count': weekday_change.groupby(weekday_keys).count(),
+    }).round(2).reindex(WEEKDAYS)
+
+    return SeasonalityResult(
+        monthly_returns=monthly_returns,
+        monthly_pivot=monthly_pivot,
+        month_stats=month_stats,
+        quarterly_stats=quarterly_stats,
+        weekly_returns=weekly_returns,
+        daily_returns=daily_returns,
+        dow_stats=dow_stats,
+    )
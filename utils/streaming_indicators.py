@@ -0,0 +1,348 @@
+"""
+Streaming technical indicators for MarketPulse.
+Keeps rolling indicator state per symbol so a new (or revised) bar updates
+RSI, MACD, SMAs, Bollinger Bands and volatility in O(1) instead of
+recomputing from the full history. Results match the batch functions in
+utils.technical_indicators for the same bar sequence.
+"""
+
+import copy
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+from utils.technical_indicators import (
+    RSI_WINDOW, MACD_FAST, MACD_SLOW, MACD_SIGNAL, SMA_WINDOWS, BOLLINGER_WINDOW, BOLLINGER_DEV,
+    compute_indicator_bundle, score_signals, classify_sentiment
+)
+
+
+class _RollingWindow:
+    """Fixed-size window with running sum and sum of squares."""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._pushes = 0
+
+    def push(self, value):
+        if len(self.values) == self.size:
+            evicted = self.values[0]
+            self.total -= evicted
+            self.total_sq -= evicted * evicted
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+        # Re-sum once per full window to stop floating-point drift building up
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    def copy(self):
+        clone = _RollingWindow.__new__(_RollingWindow)
+        clone.__dict__.update(self.__dict__)
+        clone.values = self.values.copy()
+        return clone
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def mean(self):
+        return self.total / len(self.values)
+
+    def std(self):
+        """Population standard deviation (ddof=0), as used by Bollinger Bands."""
+        mean = self.mean()
+        return math.sqrt(max(self.total_sq / len(self.values) - mean * mean, 0.0))
+
+
+class IndicatorState:
+    """
+    Incremental indicator state for a single symbol's close series.
+
+    EMA-style indicators (Wilder RSI averages, MACD fast/slow/signal) keep
+    their last value; windowed indicators keep running sums; volatility uses
+    Welford's algorithm over close-to-close returns. The state before the
+    latest bar is retained so an intraday revision of that bar can be
+    applied without replaying history.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_close = None
+
+        # Wilder RSI averages (alpha = 1/window)
+        self.avg_gain = None
+        self.avg_loss = None
+
+        # MACD EMAs (alpha = 2/(span+1)); signal starts at the first valid MACD value
+        self.ema_fast = None
+        self.ema_slow = None
+        self.macd_signal = None
+        self.macd_count = 0
+
+        self.windows = {size: _RollingWindow(size) for size in set(SMA_WINDOWS) | {BOLLINGER_WINDOW}}
+        self.recent = deque(maxlen=5)
+
+        # Welford accumulators for returns
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+
+        self._previous = None
+
+    @classmethod
+    def from_closes(cls, closes, timestamps=None):
+        """
+        Build state for a close series.
+
+        Everything but the last bar is seeded from one compute_indicator_bundle
+        pass; the last bar is then applied incrementally so the state before
+        it is kept for intraday revisions.
+
+        Args:
+            closes: Sequence of close prices (oldest first)
+            timestamps: Optional matching sequence of bar timestamps
+
+        Returns:
+            IndicatorState: State positioned after the last close
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        if timestamps is None:
+            timestamps = range(len(closes))
+
+        state = cls()
+        if len(closes) > 1:
+            state._seed(compute_indicator_bundle(closes[:-1]), timestamps[0], timestamps[len(closes) - 2])
+        if len(closes):
+            state._apply(float(closes[-1]), timestamps[len(closes) - 1])
+        return state
+
+    def _seed(self, bundle, first_timestamp, last_timestamp):
+        seed = bundle['state']
+        self.count = bundle['bar_count']
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+        self.last_close = float(bundle['current_price'])
+        self.avg_gain = float(seed['avg_gain'])
+        self.avg_loss = float(seed['avg_loss'])
+        self.ema_fast = float(seed['ema_fast'])
+        self.ema_slow = float(seed['ema_slow'])
+        self.macd_signal = None if seed['macd_signal'] is None else float(seed['macd_signal'])
+        self.macd_count = seed['macd_count']
+        self.return_count = seed['return_count']
+        self.return_mean = float(seed['return_mean'])
+        self.return_m2 = float(seed['return_m2'])
+        for window in self.windows.values():
+            for close in seed['closes'][-window.size:]:
+                window.push(float(close))
+        self.recent.extend(float(close) for close in seed['closes'][-self.recent.maxlen:])
+
+    def update(self, close, timestamp=None):
+        """
+        Apply a bar. A bar with the same timestamp as the last one replaces it.
+
+        Args:
+            close: Close price of the bar
+            timestamp: Bar timestamp (None always appends a new bar)
+        """
+        if timestamp is not None and timestamp == self.last_timestamp and self._previous is not None:
+            self._restore(self._previous)
+        self._apply(float(close), timestamp)
+
+    def _restore(self, snapshot):
+        self.__dict__.update(snapshot.__dict__)
+
+    def _checkpoint(self):
+        previous = copy.copy(self)
+        previous.windows = {size: window.copy() for size, window in self.windows.items()}
+        previous.recent = self.recent.copy()
+        previous._previous = None
+        return previous
+
+    def _apply(self, close, timestamp):
+        self._previous = self._checkpoint()
+
+        if self.count == 0:
+            self.first_timestamp = timestamp
+            # ta seeds the RSI averages with the zero gain/loss of the first bar
+            self.avg_gain = 0.0
+            self.avg_loss = 0.0
+            self.ema_fast = close
+            self.ema_slow = close
+        else:
+            diff = close - self.last_close
+            alpha = 1 / RSI_WINDOW
+            self.avg_gain = (1 - alpha) * self.avg_gain + alpha * max(diff, 0.0)
+            self.avg_loss = (1 - alpha) * self.avg_loss + alpha * max(-diff, 0.0)
+
+            alpha_fast = 2 / (MACD_FAST + 1)
+            alpha_slow = 2 / (MACD_SLOW + 1)
+            self.ema_fast = (1 - alpha_fast) * self.ema_fast + alpha_fast * close
+            self.ema_slow = (1 - alpha_slow) * self.ema_slow + alpha_slow * close
+
+            if self.last_close != 0:
+                ret = close / self.last_close - 1
+                self.return_count += 1
+                delta = ret - self.return_mean
+                self.return_mean += delta / self.return_count
+                self.return_m2 += delta * (ret - self.return_mean)
+
+        self.count += 1
+
+        # MACD line is only defined once the slow EMA has a full window
+        if self.count >= MACD_SLOW:
+            macd = self.ema_fast - self.ema_slow
+            if self.macd_count == 0:
+                self.macd_signal = macd
+            else:
+                alpha_signal = 2 / (MACD_SIGNAL + 1)
+                self.macd_signal = (1 - alpha_signal) * self.macd_signal + alpha_signal * macd
+            self.macd_count += 1
+
+        for window in self.windows.values():
+            window.push(close)
+        self.recent.append(close)
+
+        self.last_close = close
+        self.last_timestamp = timestamp
+
+    def rsi(self):
+        """RSI (0-100); 50.0 until a full window is available, like calculate_rsi."""
+        if self.count < RSI_WINDOW:
+            return 50.0
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+    def macd(self):
+        """{'macd', 'signal', 'histogram'}; NaN until enough bars, like calculate_macd."""
+        macd = self.ema_fast - self.ema_slow if self.count >= MACD_SLOW else np.nan
+        signal = self.macd_signal if self.macd_count >= MACD_SIGNAL else np.nan
+        return {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+
+    def moving_averages(self):
+        """{'sma_20', 'sma_50', 'sma_200'}; the last close stands in for short histories."""
+        return {
+            f'sma_{size}': self.windows[size].mean() if self.windows[size].full else self.last_close
+            for size in SMA_WINDOWS
+        }
+
+    def bollinger_bands(self):
+        """{'upper', 'middle', 'lower'}; NaN until a full window is available."""
+        window = self.windows[BOLLINGER_WINDOW]
+        if not window.full:
+            return {'upper': np.nan, 'middle': np.nan, 'lower': np.nan}
+        middle = window.mean()
+        band = BOLLINGER_DEV * window.std()
+        return {'upper': middle + band, 'middle': middle, 'lower': middle - band}
+
+    def volatility(self):
+        """Annualized volatility in percent, like calculate_volatility."""
+        if self.return_count == 0:
+            return 0.0
+        if self.return_count == 1:
+            return np.nan
+        return math.sqrt(self.return_m2 / (self.return_count - 1)) * np.sqrt(252) * 100
+
+    def sentiment(self, current_price=None):
+        """Sentiment signal dict, like get_sentiment_signal."""
+        current_price = self.last_close if current_price is None else current_price
+        signals = {}
+        score = 0
+        try:
+            signals['rsi'] = self.rsi()
+            signals['macd'] = self.macd()
+            signals['moving_averages'] = self.moving_averages()
+            price_5d_ago = self.recent[0] if len(self.recent) == 5 else None
+            score = score_signals(
+                current_price,
+                signals['rsi'],
+                signals['macd']['histogram'],
+                signals['moving_averages'],
+                self.count,
+                price_5d_ago
+            )
+        except Exception:
+            score = 0
+        return classify_sentiment(score, signals)
+
+    def indicators(self, current_price=None):
+        """All indicators in the same shape as calculate_all_indicators."""
+        return {
+            'rsi': self.rsi(),
+            'macd': self.macd(),
+            'moving_averages': self.moving_averages(),
+            'bollinger_bands': self.bollinger_bands(),
+            'volatility': self.volatility(),
+            'sentiment': self.sentiment(current_price)
+        }
+
+
+class IndicatorEngine:
+    """
+    Process-wide registry of IndicatorState objects keyed by symbol.
+
+    sync() keeps each symbol's state equal to the batch indicators over the
+    history it is given: bars after the last seen timestamp (and a revised
+    last bar) are applied incrementally, and the state is only rebuilt when
+    the history no longer extends the one it was built from.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def sync(self, symbol, history):
+        """
+        Bring a symbol's state up to date with its history and return it.
+
+        Args:
+            symbol: Ticker symbol
+            history: DataFrame with 'Close' column and a timestamp index
+
+        Returns:
+            IndicatorState: State positioned at the last bar of history
+        """
+        closes = history['Close'].to_numpy(dtype=float)
+        timestamps = history.index
+
+        with self._lock:
+            state = self._states.get(symbol)
+            position = None
+            if state is not None and len(timestamps) and state.first_timestamp == timestamps[0]:
+                position = timestamps.searchsorted(state.last_timestamp)
+                if position >= len(timestamps) or timestamps[position] != state.last_timestamp \
+                        or state.count != position + 1:
+                    position = None
+
+            if position is None:
+                state = IndicatorState.from_closes(closes, timestamps)
+                self._states[symbol] = state
+            else:
+                for timestamp, close in zip(timestamps[position:], closes[position:]):
+                    state.update(close, timestamp)
+
+            return state
+
+    def get(self, symbol):
+        """Returns the current state for a symbol, or None if it hasn't been synced."""
+        with self._lock:
+            return self._states.get(symbol)
+
+    def reset(self, symbol=None):
+        """Drops state for one symbol, or for all symbols."""
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop(symbol, None)
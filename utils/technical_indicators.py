@@ -1,11 +1,29 @@
 """
 Technical indicators and sentiment analysis for MarketPulse.
-Uses TA-Lib for professional-grade technical analysis.
+Uses TA-Lib for professional-grade technical analysis, plus a single-pass
+NumPy bundle that computes every indicator from one contiguous close array
+and a matrix variant that scores many symbols in one vectorized call.
 """
 
 import pandas as pd
 import numpy as np
 import ta
+from scipy.signal import lfilter
+
+from utils.metrics import timed
+
+
+RSI_WINDOW = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+SMA_WINDOWS = (20, 50, 200)
+BOLLINGER_WINDOW = 20
+BOLLINGER_DEV = 2
+
+# Bars the matrix EMAs look back over. The slowest decay (Wilder RSI, 13/14)
+# weights anything older by less than 1e-38, far below float64 precision.
+EMA_HORIZON = 1200
 
 
 def calculate_rsi(df, period=14):
@@ -110,83 +128,318 @@ def calculate_volatility(df):
         return 0.0
 
 
-def get_sentiment_signal(df, current_price):
+def _ema(values, alpha):
     """
-    Determine market sentiment based on multiple technical indicators.
+    Exponential moving average with pandas ewm(adjust=False) semantics.
+
+    Runs the recursion y[t] = (1 - alpha) * y[t-1] + alpha * x[t], seeded
+    with y[0] = x[0], as a single C-level IIR filter pass.
+    """
+    if len(values) == 0:
+        return values
+    decay = 1.0 - alpha
+    smoothed, _ = lfilter([alpha], [1.0, -decay], values, zi=[decay * values[0]])
+    return smoothed
+
+
+@timed()
+def compute_indicator_bundle(data):
+    """
+    Calculate every indicator for a frame in one pass over its closes.
+
+    Produces the same values as calculate_rsi, calculate_macd,
+    calculate_moving_averages, calculate_bollinger_bands and
+    calculate_volatility, but reads the Close column once into a contiguous
+    float64 array and derives everything from it, instead of building a
+    separate `ta` indicator per call. NaN closes are dropped first.
 
     Args:
-        df: DataFrame with OHLCV data
-        current_price: Current market price
+        data: DataFrame with 'Close' column, or a 1-D array of closes
 
     Returns:
         dict: {
-            'sentiment': 'bullish'|'bearish'|'neutral',
-            'arrow': '🔼'|'🔽'|'➡️',
-            'score': int (-100 to 100),
-            'signals': dict of individual signal contributions
+            'rsi', 'macd', 'moving_averages', 'bollinger_bands', 'volatility',
+            'current_price', 'price_5d_ago', 'bar_count',
+            'state': final recursion values for seeding streaming indicators
         }
     """
-    signals = {}
+    values = data['Close'].to_numpy(dtype=np.float64) if isinstance(data, pd.DataFrame) else data
+    close = np.ascontiguousarray(values, dtype=np.float64)
+    close = close[~np.isnan(close)]
+    n = len(close)
+    if n == 0:
+        raise ValueError("No close prices to compute indicators from")
+
+    # RSI: Wilder averages of gains/losses, first bar contributes zero
+    diff = np.diff(close, prepend=close[0])
+    avg_gain = _ema(np.maximum(diff, 0.0), 1 / RSI_WINDOW)[-1]
+    avg_loss = _ema(np.maximum(-diff, 0.0), 1 / RSI_WINDOW)[-1]
+    if n < RSI_WINDOW:
+        rsi = 50.0
+    elif avg_loss == 0:
+        rsi = 100.0
+    else:
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # MACD: the line exists once the slow EMA has a full window, the
+    # signal once it has MACD_SIGNAL line values
+    ema_fast = _ema(close, 2 / (MACD_FAST + 1))
+    ema_slow = _ema(close, 2 / (MACD_SLOW + 1))
+    macd_line = ema_fast[MACD_SLOW - 1:] - ema_slow[MACD_SLOW - 1:]
+    signal_line = _ema(macd_line, 2 / (MACD_SIGNAL + 1))
+    macd = macd_line[-1] if len(macd_line) else np.nan
+    signal = signal_line[-1] if len(signal_line) >= MACD_SIGNAL else np.nan
+
+    moving_averages = {
+        f'sma_{size}': close[-size:].mean() if n >= size else close[-1]
+        for size in SMA_WINDOWS
+    }
+
+    if n >= BOLLINGER_WINDOW:
+        window = close[-BOLLINGER_WINDOW:]
+        middle = window.mean()
+        band = BOLLINGER_DEV * window.std()
+        bollinger_bands = {'upper': middle + band, 'middle': middle, 'lower': middle - band}
+    else:
+        bollinger_bands = {'upper': np.nan, 'middle': np.nan, 'lower': np.nan}
+
+    returns = close[1:] / close[:-1] - 1
+    if len(returns) == 0:
+        volatility = 0.0
+    elif len(returns) == 1:
+        volatility = np.nan
+    else:
+        volatility = returns.std(ddof=1) * np.sqrt(252) * 100
+
+    return {
+        'rsi': rsi,
+        'macd': {'macd': macd, 'signal': signal, 'histogram': macd - signal},
+        'moving_averages': moving_averages,
+        'bollinger_bands': bollinger_bands,
+        'volatility': volatility,
+        'current_price': close[-1],
+        'price_5d_ago': close[-5] if n >= 5 else None,
+        'bar_count': n,
+        'state': {
+            'avg_gain': avg_gain,
+            'avg_loss': avg_loss,
+            'ema_fast': ema_fast[-1],
+            'ema_slow': ema_slow[-1],
+            'macd_signal': signal_line[-1] if len(signal_line) else None,
+            'macd_count': len(macd_line),
+            'return_count': len(returns),
+            'return_mean': returns.mean() if len(returns) else 0.0,
+            'return_m2': ((returns - returns.mean()) ** 2).sum() if len(returns) else 0.0,
+            'closes': close[-max(SMA_WINDOWS):],
+        }
+    }
+
+
+def _ema_matrix(values, alpha, start):
+    """
+    Column-wise EMA over a (bars x symbols) matrix whose columns start at different rows.
+
+    Column j follows pandas ewm(adjust=False) from row start[j] onward and is
+    NaN before it. The recursion runs as one lfilter pass over all columns: rows
+    before the start are zeroed and the first valid input is scaled by
+    1/alpha so the filter output there equals x[start].
+    """
+    rows, cols = values.shape
+    before = np.arange(rows)[:, None] < start[None, :]
+    inputs = np.where(before, 0.0, values)
+    valid = start < rows
+    inputs[start[valid], np.flatnonzero(valid)] /= alpha
+    # Filter each symbol as a contiguous row; along axis 0 lfilter walks strided memory
+    smoothed = lfilter([alpha], [1.0, -(1.0 - alpha)], np.ascontiguousarray(inputs.T), axis=1).T
+    smoothed[before] = np.nan
+    return smoothed
+
+
+@timed()
+def calculate_indicators_matrix(prices):
+    """
+    Calculate indicators and sentiment for every column of a price matrix at once.
+
+    Each column gets the same values as compute_indicator_bundle and
+    get_sentiment_signal would give for that symbol's closes on their own:
+    NaN closes (before a listing date, or on another market's holidays) are
+    dropped per column by packing each column's valid closes to the bottom
+    of the matrix, so columns of different lengths share one vectorized pass.
+
+    Args:
+        prices: DataFrame of closes (dates x symbols), or a 2-D array of the same shape
+
+    Returns:
+        pd.DataFrame: One row per symbol with columns price, bar_count, rsi,
+        macd, macd_signal, macd_histogram, sma_20, sma_50, sma_200, bb_upper,
+        bb_middle, bb_lower, volatility, score and sentiment. Symbols without
+        any closes get NaN values and no sentiment.
+    """
+    symbols = prices.columns if isinstance(prices, pd.DataFrame) else None
+    close = np.asarray(prices, dtype=np.float64)
+    if close.ndim != 2:
+        raise ValueError("Price matrix must be 2-D (dates x symbols)")
+    rows, cols = close.shape
+
+    # Pack valid closes to the bottom of each column, keeping their order
+    missing = np.isnan(close)
+    if missing.any():
+        order = np.argsort(~missing, axis=0, kind='stable')
+        close = np.take_along_axis(close, order, axis=0)
+    counts = rows - missing.sum(axis=0)
+    start = rows - counts
+    has_data = counts > 0
+    last = np.full(cols, np.nan)
+    last[has_data] = close[-1, has_data]
+
+    # The recursive indicators only need the last EMA_HORIZON bars
+    recent = close[-EMA_HORIZON:]
+    recent_start = np.maximum(start - (rows - len(recent)), 0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # RSI: Wilder averages of gains/losses, first bar contributes zero
+        diff = np.diff(recent, axis=0, prepend=np.nan)
+        diff[recent_start[has_data], np.flatnonzero(has_data)] = 0.0
+        avg_gain = _ema_matrix(np.maximum(diff, 0.0), 1 / RSI_WINDOW, recent_start)[-1]
+        avg_loss = _ema_matrix(np.maximum(-diff, 0.0), 1 / RSI_WINDOW, recent_start)[-1]
+        rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+        rsi = np.where(counts < RSI_WINDOW, 50.0, rsi)
+
+        # MACD: line from the slow EMA's full window, signal after MACD_SIGNAL line values
+        macd_line = (_ema_matrix(recent, 2 / (MACD_FAST + 1), recent_start)
+                     - _ema_matrix(recent, 2 / (MACD_SLOW + 1), recent_start))
+        macd_start = np.where(start < rows - len(recent), 0, recent_start + MACD_SLOW - 1)
+        signal_line = _ema_matrix(np.nan_to_num(macd_line), 2 / (MACD_SIGNAL + 1), macd_start)
+        macd = np.where(counts >= MACD_SLOW, macd_line[-1], np.nan)
+        signal = np.where(counts >= MACD_SLOW + MACD_SIGNAL - 1, signal_line[-1], np.nan)
+
+        moving_averages = {
+            f'sma_{size}': np.where(counts >= size, close[-size:].mean(axis=0), last)
+            for size in SMA_WINDOWS
+        }
+
+        window = close[-BOLLINGER_WINDOW:]
+        full_window = counts >= BOLLINGER_WINDOW
+        middle = np.where(full_window, window.mean(axis=0), np.nan)
+        band = np.where(full_window, BOLLINGER_DEV * window.std(axis=0), np.nan)
+
+        returns = close[1:] / close[:-1] - 1
+        return_count = np.maximum(counts - 1, 0)
+        volatility = np.full(cols, np.nan)
+        many = return_count > 1
+        if many.any():
+            volatility[many] = np.nanstd(returns[:, many], axis=0, ddof=1) * np.sqrt(252) * 100
+        volatility[return_count == 0] = 0.0
+
+        # Sentiment score, mirroring score_signals column by column
+        histogram = macd - signal
+        score = np.select([rsi < 30, rsi > 70, rsi < 40, rsi > 60], [30, -30, 15, -15], 0)
+        score += np.where(histogram > 0, 20, -20)
+        score += np.where(last > moving_averages['sma_20'], 15, -15)
+        score += np.where(counts >= 50,
+                          np.where(moving_averages['sma_20'] > moving_averages['sma_50'], 15, -15), 0)
+        price_5d_ago = close[-5] if rows >= 5 else np.full(cols, np.nan)
+        pct_change_5d = (last - price_5d_ago) / price_5d_ago * 100
+        trend = np.select([pct_change_5d > 2, pct_change_5d < -2, pct_change_5d > 0], [20, -20, 10], -10)
+        score += np.where(counts >= 5, trend, 0)
+
+    sentiment = np.select([score > 20, score < -20], ['bullish', 'bearish'], 'neutral').astype(object)
+    sentiment[~has_data] = None
+
+    return pd.DataFrame({
+        'price': last,
+        'bar_count': counts,
+        'rsi': np.where(has_data, rsi, np.nan),
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_histogram': histogram,
+        **{name: values for name, values in moving_averages.items()},
+        'bb_upper': middle + band,
+        'bb_middle': middle,
+        'bb_lower': middle - band,
+        'volatility': volatility,
+        'score': np.where(has_data, score, np.nan),
+        'sentiment': sentiment
+    }, index=symbols)
+
+
+def score_signals(current_price, rsi, macd_histogram, moving_averages, bar_count, price_5d_ago=None):
+    """
+    Combine individual indicator readings into a sentiment score.
+
+    Args:
+        current_price: Current market price
+        rsi: RSI value (0-100)
+        macd_histogram: MACD histogram value
+        moving_averages: dict with 'sma_20' and 'sma_50'
+        bar_count: Number of bars the indicators were computed from
+        price_5d_ago: Close 5 bars back (None if fewer than 5 bars)
+
+    Returns:
+        int: Score from -100 (bearish) to 100 (bullish)
+    """
     score = 0
 
-    try:
-        # RSI Signal (-30 to +30)
-        rsi = calculate_rsi(df)
-        signals['rsi'] = rsi
-        if rsi < 30:
-            score += 30  # Oversold = Bullish
-        elif rsi > 70:
-            score -= 30  # Overbought = Bearish
-        elif rsi < 40:
+    # RSI Signal (-30 to +30)
+    if rsi < 30:
+        score += 30  # Oversold = Bullish
+    elif rsi > 70:
+        score -= 30  # Overbought = Bearish
+    elif rsi < 40:
+        score += 15
+    elif rsi > 60:
+        score -= 15
+
+    # MACD Signal (-20 to +20)
+    if macd_histogram > 0:
+        score += 20  # Positive momentum
+    else:
+        score -= 20  # Negative momentum
+
+    # Moving Average Signal (-30 to +30)
+    # Price vs MA20
+    if current_price > moving_averages['sma_20']:
+        score += 15
+    else:
+        score -= 15
+
+    # MA20 vs MA50 (Golden/Death Cross)
+    if bar_count >= 50:
+        if moving_averages['sma_20'] > moving_averages['sma_50']:
             score += 15
-        elif rsi > 60:
+        else:
             score -= 15
 
-        # MACD Signal (-20 to +20)
-        macd_data = calculate_macd(df)
-        signals['macd'] = macd_data
-        if macd_data['histogram'] > 0:
-            score += 20  # Positive momentum
+    # Trend Signal (-20 to +20)
+    # Compare current price to price 5 days ago
+    if price_5d_ago is not None:
+        pct_change_5d = ((current_price - price_5d_ago) / price_5d_ago) * 100
+
+        if pct_change_5d > 2:
+            score += 20
+        elif pct_change_5d < -2:
+            score -= 20
+        elif pct_change_5d > 0:
+            score += 10
         else:
-            score -= 20  # Negative momentum
+            score -= 10
 
-        # Moving Average Signal (-30 to +30)
-        ma_data = calculate_moving_averages(df)
-        signals['moving_averages'] = ma_data
+    return score
 
-        # Price vs MA20
-        if current_price > ma_data['sma_20']:
-            score += 15
-        else:
-            score -= 15
 
-        # MA20 vs MA50 (Golden/Death Cross)
-        if len(df) >= 50:
-            if ma_data['sma_20'] > ma_data['sma_50']:
-                score += 15
-            else:
-                score -= 15
-
-        # Trend Signal (-20 to +20)
-        # Compare current price to price 5 days ago
-        if len(df) >= 5:
-            price_5d_ago = df['Close'].iloc[-5]
-            pct_change_5d = ((current_price - price_5d_ago) / price_5d_ago) * 100
-
-            if pct_change_5d > 2:
-                score += 20
-            elif pct_change_5d < -2:
-                score -= 20
-            elif pct_change_5d > 0:
-                score += 10
-            else:
-                score -= 10
+def classify_sentiment(score, signals=None):
+    """
+    Map a sentiment score to the signal dict returned by get_sentiment_signal.
 
-    except Exception as e:
-        # If calculation fails, return neutral
-        score = 0
+    Args:
+        score: Sentiment score (-100 to 100)
+        signals: dict of individual signal contributions
+
+    Returns:
+        dict: {'sentiment', 'arrow', 'score', 'signals', 'rsi'}
+    """
+    signals = signals or {}
 
-    # Determine sentiment
     if score > 20:
         sentiment = 'bullish'
         arrow = '🔼'
@@ -206,6 +459,50 @@ def get_sentiment_signal(df, current_price):
     }
 
 
+@timed()
+def get_sentiment_signal(df, current_price, bundle=None):
+    """
+    Determine market sentiment based on multiple technical indicators.
+
+    Args:
+        df: DataFrame with OHLCV data
+        current_price: Current market price
+        bundle: Precomputed compute_indicator_bundle(df) result (optional)
+
+    Returns:
+        dict: {
+            'sentiment': 'bullish'|'bearish'|'neutral',
+            'arrow': '🔼'|'🔽'|'➡️',
+            'score': int (-100 to 100),
+            'signals': dict of individual signal contributions
+        }
+    """
+    signals = {}
+    score = 0
+
+    try:
+        if bundle is None:
+            bundle = compute_indicator_bundle(df)
+        signals['rsi'] = bundle['rsi']
+        signals['macd'] = bundle['macd']
+        signals['moving_averages'] = bundle['moving_averages']
+
+        score = score_signals(
+            current_price,
+            signals['rsi'],
+            signals['macd']['histogram'],
+            signals['moving_averages'],
+            bundle['bar_count'],
+            bundle['price_5d_ago']
+        )
+    except Exception as e:
+        # If calculation fails, return neutral
+        score = 0
+
+    return classify_sentiment(score, signals)
+
+
+@timed()
 def calculate_all_indicators(df):
     """
     Calculate all technical indicators for a given DataFrame.
@@ -217,12 +514,49 @@ def calculate_all_indicators(df):
         dict: Dictionary containing all calculated indicators
     """
     current_price = df['Close'].iloc[-1]
+    bundle = compute_indicator_bundle(df)
 
     return {
-        'rsi': calculate_rsi(df),
-        'macd': calculate_macd(df),
-        'moving_averages': calculate_moving_averages(df),
-        'bollinger_bands': calculate_bollinger_bands(df),
-        'volatility': calculate_volatility(df),
-        'sentiment': get_sentiment_signal(df, current_price)
+        'rsi': bundle['rsi'],
+        'macd': bundle['macd'],
+        'moving_averages': bundle['moving_averages'],
+        'bollinger_bands': bundle['bollinger_bands'],
+        'volatility': bundle['volatility'],
+        'sentiment': get_sentiment_signal(df, current_price, bundle=bundle)
     }
+
+
+@timed()
+def calculate_ad_line(df, window=20):
+    """
+    Calculate the volume-weighted advance/decline line of a daily history.
+
+    A bar advances if it closes above its open and declines if it closes
+    below; the A/D line is the running sum of volume signed by direction.
+
+    Args:
+        df: DataFrame with 'Open', 'Close' and 'Volume' columns
+        window: Bars in the rolling advancing/declining counts
+
+    Returns:
+        pd.DataFrame: Copy of `df` with Daily_Change, Is_Advancing,
+        Is_Declining, AD_Value, AD_Line, Advancing_20D, Declining_20D and
+        AD_Ratio_20D columns (the rolling columns use `window` bars)
+    """
+    daily_change = df['Close'] - df['Open']
+    advancing = (daily_change > 0).astype(int)
+    declining = (daily_change < 0).astype(int)
+    ad_value = df['Volume'] * (advancing - declining)
+    advancing_window = advancing.rolling(window=window).sum()
+    declining_window = declining.rolling(window=window).sum()
+
+    return df.assign(
+        Daily_Change=daily_change,
+        Is_Advancing=advancing,
+        Is_Declining=declining,
+        AD_Value=ad_value,
+        AD_Line=ad_value.cumsum(),
+        Advancing_20D=advancing_window,
+        Declining_20D=declining_window,
+        AD_Ratio_20D=advancing_window / declining_window.replace(0, 1)
+    )
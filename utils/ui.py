@@ -1,5 +1,6 @@
 import streamlit as st
 import os
+import inspect
 
 def render_sidebar_header():
     """Renders the sidebar header with logo and title."""
@@ -44,3 +45,72 @@ def render_sidebar_navigation():
     st.sidebar.page_link("pages/01_market_pulse.py", label="📊 Market Pulse", icon="🌐")
     
     st.sidebar.markdown("---")
+
+class _SelectorPanel:
+    """Panel of the lazy_tabs selector fallback, mirroring a stateful tab's `.open`."""
+
+    def __init__(self, open):
+        self.open = open
+        self._container = st.container() if open else st.empty()
+
+    def __enter__(self):
+        return self._container.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._container.__exit__(exc_type, exc_val, exc_tb)
+
+def lazy_tabs(labels, key):
+    """
+    Tabs whose hidden panels can skip their work.
+
+    Only the selected panel's `.open` is True, so wrapping a panel's body in
+    `if tab.open:` keeps hidden panels from fetching or computing anything.
+    Uses stateful st.tabs (switching tabs reruns the page) where Streamlit
+    supports it, and a horizontal selector with one panel otherwise.
+
+    Args:
+        labels: Tab labels
+        key: Widget key; the selected label is kept in st.session_state[key]
+
+    Returns:
+        list: One panel per label, usable as a container
+    """
+    if "on_change" in inspect.signature(st.tabs).parameters:
+        return st.tabs(labels, key=key, on_change="rerun")
+
+    selected = st.radio(key, labels, key=key, horizontal=True, label_visibility="collapsed")
+    return [_SelectorPanel(label == selected) for label in labels]
+
+def render_performance_metrics():
+    """Renders the hot-path metrics summary (latency, cache, upstream) in the current container."""
+    import pandas as pd
+    from utils.metrics import metrics
+
+    summary = metrics.summary()
+
+    cache_totals = {result: sum(counts[result] for counts in summary['cache'].values())
+                    for result in ('hit', 'stale', 'miss')}
+    lookups = sum(cache_totals.values())
+    if lookups:
+        served = (cache_totals['hit'] + cache_totals['stale']) / lookups
+        st.caption(f"🗄️ Cache: {served:.0%} served from cache "
+                   f"({cache_totals['hit']} fresh, {cache_totals['stale']} stale, {cache_totals['miss']} misses)")
+
+    for endpoint, stats in sorted(summary['upstream'].items()):
+        line = f"🌐 {endpoint}: {stats['bytes'] / 2**20:.1f} MB"
+        if stats['requests']:
+            line += f", {stats['requests']} requests, {stats['errors'] / stats['requests']:.0%} errors"
+        if stats['avg_ms'] is not None:
+            line += f", {stats['avg_ms']:.0f} ms avg"
+        st.caption(line)
+
+    if summary['fallbacks']:
+        st.caption(f"⚠️ {summary['fallbacks']} last-known-good fallbacks served")
+
+    if summary['calls']:
+        with st.expander("⏱ Call latency"):
+            calls = pd.DataFrame(summary['calls'][:15])
+            calls = calls.rename(columns={'func': 'Function', 'calls': 'Calls', 'avg_ms': 'Avg ms',
+                                          'p95_ms': 'p95 ms', 'total_s': 'Total s', 'errors': 'Errors'})
+            st.dataframe(calls[['Function', 'Calls', 'Avg ms', 'p95 ms', 'Total s', 'Errors']].round(2),
+                         hide_index=True, use_container_width=True)